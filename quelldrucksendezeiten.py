@@ -4,1119 +4,97 @@
 # + LOGO Upload in Streamlit + Logo im Print oben (Base64 eingebettet)
 # -----------------------------------------------------------------------------
 
-import json
-import re
 import datetime
-import base64
+import hashlib
+import io
+import tempfile
+import time
 from pathlib import Path
-from typing import List
-import pandas as pd
-import streamlit as st
-
-# Grundkonfiguration
-PLAN_TYP = "Standard"
-BEREICH = "Alle Sortimente Fleischwerk"
-DAYS_DE = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag"]
-
-# Mapping für Excel-Kürzel
-DAY_SHORT_TO_DE = {
-    "Mo": "Montag", "Di": "Dienstag", "Die": "Dienstag",
-    "Mi": "Mittwoch", "Mit": "Mittwoch", "Mitt": "Mittwoch",
-    "Do": "Donnerstag", "Don": "Donnerstag", "Donn": "Donnerstag",
-    "Fr": "Freitag", "Sa": "Samstag", "Sam": "Samstag",
-}
-
-# Reihenfolge der Sortimente innerhalb eines Tages (Prio)
-SORT_PRIO = {"21": 0, "1011": 1, "22": 2, "41": 3, "65": 4, "0": 5, "91": 6}
-
-TOUR_COLS = {
-    "Montag": "Mo",
-    "Dienstag": "Die",
-    "Mittwoch": "Mitt",
-    "Donnerstag": "Don",
-    "Freitag": "Fr",
-    "Samstag": "Sam",
-}
-
-
-def norm(x) -> str:
-    if x is None:
-        return ""
-    if isinstance(x, float) and pd.isna(x):
-        return ""
-    s = str(x).replace("\u00a0", " ").strip()
-    s = re.sub(r"\s+", " ", s)
-    if re.fullmatch(r"\d+\.0", s):
-        s = s[:-2]
-    return s
-
-
-def normalize_time(s) -> str:
-    if isinstance(s, (datetime.time, pd.Timestamp)):
-        return s.strftime("%H:%M") + " Uhr"
-    s = norm(s)
-    if not s:
-        return ""
-    if re.fullmatch(r"\d{1,2}:\d{2}", s):
-        return s + " Uhr"
-    if re.fullmatch(r"\d{1,2}", s):
-        return s.zfill(2) + ":00 Uhr"
-    return s
-
-
-def safe_time(val) -> str:
-    """
-    verhindert Fälle wie "Montag Montag" (Tag landet fälschlich in Zeit)
-    """
-    raw = norm(val)
-    if re.fullmatch(r"(Montag|Dienstag|Mittwoch|Donnerstag|Freitag|Samstag)", raw):
-        return ""
-    return normalize_time(val)
-
-
-def canon_group_id(label: str) -> str:
-    """
-    Mapped Sortimentsbezeichnungen robust auf interne IDs.
-    WICHTIG: Spezifischere Regeln MÜSSEN vor allgemeineren kommen!
-    """
-    s = norm(label).lower()
-
-    # harte Treffer (Zahlen)
-    m = re.search(r"\b(1011|21|41|65|0|91|22)\b", s)
-    if m:
-        return m.group(1)
-
-    # Bio-Geflügel (41)
-    if "bio" in s and "geflügel" in s:
-        return "41"
-
-    # Wiesenhof/Geflügel (1011)
-    if "wiesenhof" in s:
-        return "1011"
-    if "geflügel" in s:
-        return "1011"
-
-    # Frischfleisch (65)
-    if "frischfleisch" in s or "veredlung" in s or "schwein" in s or "pök" in s:
-        return "65"
 
-    # Fleisch/Wurst (21)
-    if "fleisch" in s or "wurst" in s or "heidemark" in s:
-        return "21"
-
-    # Avo-Gewürze (0)
-    if "avo" in s or "gewürz" in s:
-        return "0"
-
-    # Werbemittel (91)
-    if "werbe" in s or "werbemittel" in s:
-        return "91"
-
-    # Pfeiffer etc. (22)
-    if "pfeiffer" in s or "gmyrek" in s or "siebert" in s or "bard" in s or "mago" in s:
-        return "22"
-
-    return "?"
-
-
-def detect_bspalten(columns: List[str]):
-    """
-    Erkennung für Spalten wie:
-    "Mo Z Wiesenhof B_Di" / "Mo L Bio B_Mi" / "Mo Wiesenhof B_Di" etc.
-    UND auch Spalten OHNE "B": "Mit Z 41 Mo" (nur Tag ZL Gruppe Tag)
-    """
-    rx_b = re.compile(
-        r"^(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)\s+"
-        r"(?:(Z|L)\s+)?(.+?)\s+B[_ ]\s*(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)$",
-        re.IGNORECASE
-    )
-    rx_no_b = re.compile(
-        r"^(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)\s+"
-        r"(Z|L)\s+(.+?)\s+(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)$",
-        re.IGNORECASE
-    )
-
-    mapping = {}
-
-    # Phase 1: ohne B
-    for c in columns:
-        if re.search(r"\sB[_ ]\s*", c, re.IGNORECASE):
-            continue
-
-        m = rx_no_b.match(c.strip())
-        if m:
-            day_de = DAY_SHORT_TO_DE.get(m.group(1))
-            zl = m.group(2).upper()
-            group_text = m.group(3).strip()
-            bestell_de_from_name = DAY_SHORT_TO_DE.get(m.group(4))
-
-            if day_de and bestell_de_from_name:
-                key = (day_de, group_text, bestell_de_from_name)
-                mapping.setdefault(key, {})
-                if zl == "Z":
-                    mapping[key]["zeit"] = c
-                elif zl == "L":
-                    mapping[key]["l"] = c
-
-    # Phase 2: mit B
-    for c in columns:
-        m = rx_b.match(c.strip())
-        if m:
-            day_de = DAY_SHORT_TO_DE.get(m.group(1))
-            zl = (m.group(2) or "").upper()
-            group_text = m.group(3).strip()
-            bestell_de_from_name = DAY_SHORT_TO_DE.get(m.group(4))
+import streamlit as st
 
-            if day_de and bestell_de_from_name:
-                key = (day_de, group_text, bestell_de_from_name)
-                mapping.setdefault(key, {})
-                if zl == "Z":
-                    if "zeit" not in mapping[key]:
-                        mapping[key]["zeit"] = c
-                elif zl == "L":
-                    if "l" not in mapping[key]:
-                        mapping[key]["l"] = c
+from sendeplan_core import (
+    SHEETS,
+    build_customer_zip,
+    build_html_file,
+    collect_outputs,
+    column_stats_table,
+    load_logo_data_uri,
+    logo_file_to_data_uri,
+    process_source,
+)
+from sendeplan_jobs import DONE, QUEUED, JobQueue
+
+
+@st.cache_resource
+def job_queue() -> JobQueue:
+    """Eine Warteschlange (und ein Prozess-Pool) für alle Sitzungen dieses Servers."""
+    return JobQueue()
+
+
+def wait_for_jobs(jobs, poll: float = 0.3):
+    """Fortschritt der eigenen Jobs anzeigen, bis alle fertig sind."""
+    if all(job.finished for job in jobs):
+        return
+    box = st.empty()
+    while not all(job.finished for job in jobs):
+        with box.container():
+            stats = job_queue().stats()
+            st.caption(f"Warteschlange: {stats['running']} in Arbeit, {stats['queued']} wartend")
+            for job in jobs:
+                if job.state == QUEUED:
+                    text = f"{job.label}: wartet auf freien Platz..."
                 else:
-                    mapping[key]["sort"] = c
-                    mapping[key]["group_text"] = group_text
-
-    return mapping
-
+                    text = f"{job.label}: {job.done}/{job.total} Blätter"
+                st.progress(job.fraction, text=text)
+        time.sleep(poll)
+    box.empty()
 
-def detect_triplets(columns: List[str]):
-    rx = re.compile(
-        r"^(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)\s+(.+?)\s+"
-        r"(Zeit|Zeitende|Bestellzeitende|Uhrzeit|Sort|Sortiment|Tag|Bestelltag)$",
-        re.IGNORECASE
-    )
-    found = {}
-    for c in columns:
-        m = rx.match(c.strip())
-        if not m:
-            continue
 
-        day_de = DAY_SHORT_TO_DE.get(m.group(1))
-        if not day_de:
-            continue
-
-        group_text = m.group(2).strip()
-
-        end_key = m.group(3).lower()
-        if end_key in ("sort", "sortiment"):
-            key = "Sort"
-        elif end_key in ("tag", "bestelltag"):
-            key = "Tag"
-        else:
-            key = "Zeit"
-
-        found.setdefault(day_de, {}).setdefault(group_text, {})[key] = c
-
-    return found
-
-
-def detect_ds_triplets(columns: List[str]):
-    rx = re.compile(
-        r"^DS\s+(.+?)\s+zu\s+(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)\s+(Zeit|Sort|Tag)$",
-        re.IGNORECASE
-    )
-    tmp = {}
-    for c in columns:
-        m = rx.match(c.strip())
-        if not m:
-            continue
-
-        day_de = DAY_SHORT_TO_DE.get(m.group(2))
-        if day_de:
-            key = f"DS {m.group(1)} zu {m.group(2)}"
-            tmp.setdefault(day_de, {}).setdefault(key, {})[m.group(3).capitalize()] = c
-    return tmp
-
-
-def load_logo_data_uri() -> str:
+def area_outputs(uploads, areas) -> list:
     """
-    Lädt Logo von Festplatte (Fallback), z.B. neben dem Script oder /mnt/data.
+    Ergebnis je Datei wie process_source, aber nur für die gewählten Bereiche.
+    Je Datei ein Job für alle noch fehlenden Bereiche; fertige Bereiche merkt sich
+    die Sitzung, später dazu gewählte Bereiche werden nachgeladen, der Rest wiederverwendet.
     """
-    candidates = []
-    try:
-        here = Path(__file__).resolve().parent
-        candidates.append(here / "Logo_NORDfrische Center (NFC).png")
-    except Exception:
-        pass
-    candidates.append(Path.cwd() / "Logo_NORDfrische Center (NFC).png")
-    candidates.append(Path("/mnt/data/Logo_NORDfrische Center (NFC).png"))
-
-    for p in candidates:
-        try:
-            if p.exists() and p.is_file():
-                b = p.read_bytes()
-                return "data:image/png;base64," + base64.b64encode(b).decode("ascii")
-        except Exception:
+    memo = st.session_state.setdefault("area_memo", {})
+    digests = [hashlib.sha256(u.getvalue()).hexdigest() for u in uploads]
+    for key in [k for k in memo if k[0] not in digests]:  # entfernte Uploads vergessen
+        del memo[key]
+
+    jobs = []
+    for up, digest in zip(uploads, digests):
+        missing = [k for k in SHEETS if k in areas and (digest, k) not in memo]
+        if missing:
+            label = up.name if len(missing) == len(SHEETS) else f"{up.name} – {', '.join(SHEETS[k] for k in missing)}"
+            job = job_queue().submit(label, up.getvalue(), {k: SHEETS[k] for k in missing})
+            jobs.append((digest, missing, job))
+    wait_for_jobs([job for _, _, job in jobs])
+    for digest, missing, job in jobs:
+        if job.state != DONE:
+            st.error(job.error)
             continue
-    return ""
-
-
-def logo_file_to_data_uri(uploaded_file) -> str:
-    """
-    Wandelt ein hochgeladenes Streamlit-File (PNG/JPG/SVG) in eine Data-URI um.
-    """
-    if not uploaded_file:
-        return ""
-    mime = uploaded_file.type or "image/png"
-    b = uploaded_file.getvalue()
-    return f"data:{mime};base64," + base64.b64encode(b).decode("ascii")
-
-
-# --- HTML TEMPLATE (A4 MIT SCROLLBALKEN - PRINT OPTIMIERT - 4 BEREICHE) ---
-HTML_TEMPLATE = """<!doctype html>
-<html lang="de">
-<head>
-<meta charset="utf-8">
-<style>
-  @page { 
-    size: A4 portrait; 
-    margin: 12mm 10mm;
-  }
-
-  *{ box-sizing:border-box; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; }
-  body{ margin:0; background:#1e1e1e; color:#e8eaed; }
-
-  @media screen {
-    .app{ display:grid; grid-template-columns: 350px 1fr; height:100vh; padding:15px; gap:15px; }
-    .sidebar, .main{ background: #2d2d2d; border:1px solid #3c3c3c; border-radius:12px; box-shadow: 0 2px 8px rgba(0,0,0,0.3); }
-    .list{ height: calc(100vh - 380px); overflow-y:auto; border-top:1px solid #3c3c3c; margin-top:10px; }
-    .item{ padding:10px; border-bottom:1px solid #3c3c3c; cursor:pointer; font-size:13px; color:#b8b8b8; transition: background 0.2s; }
-    .wrap{ height: 100%; overflow-y: auto; padding: 20px; display: flex; flex-direction: column; align-items: center; }
-
-    .paper{
-      width: 210mm;
-      max-width: 210mm;
-      height: 297mm;
-      background:#fff;
-      color:#000;
-      box-shadow: 0 0 20px rgba(0,0,0,.5);
-      position: relative;
-      overflow: hidden;
-      margin-bottom: 20px;
-    }
-
-    .paper-content{
-      width: 100%;
-      height: 100%;
-      padding: 12mm 10mm;
-      overflow-y: auto;
-      overflow-x: hidden;
-    }
-
-    .paper-content::-webkit-scrollbar { width: 10px; }
-    .paper-content::-webkit-scrollbar-track { background: #f1f1f1; }
-    .paper-content::-webkit-scrollbar-thumb { background: #888; border-radius: 5px; }
-    .paper-content::-webkit-scrollbar-thumb:hover { background: #555; }
-    
-    .list::-webkit-scrollbar { width: 8px; }
-    .list::-webkit-scrollbar-track { background: #252525; }
-    .list::-webkit-scrollbar-thumb { background: #4a4a4a; border-radius: 4px; }
-    .list::-webkit-scrollbar-thumb:hover { background: #1a73e8; }
-  }
-
-  @media print {
-    body{ background:#fff !important; margin: 0; padding: 0; }
-    .sidebar{ display:none !important; }
-    .app{ display:block; padding:0; margin: 0; }
-    .wrap{ overflow: visible; padding: 0; margin: 0; }
-
-    .paper{
-      box-shadow: none;
-      margin: 0;
-      padding: 0;
-      width: 100%;
-      max-width: 100%;
-      height: auto;
-      overflow: visible;
-      page-break-after: always;
-      background: #fff;
-      -webkit-print-color-adjust: exact;
-      print-color-adjust: exact;
-      color-adjust: exact;
-    }
-
-    .paper-content{
-      overflow: visible;
-      height: auto;
-      padding: 0;
-      margin: 0;
-    }
-
-    .paper-content, .paper-content * {
-      color: #000 !important;
-      -webkit-print-color-adjust: exact !important;
-      print-color-adjust: exact !important;
-      color-adjust: exact !important;
-    }
-
-    table, th, td { border-color: transparent !important; }
-    
-    .paper-content * { font-size: 7.5pt !important; line-height: 1.05 !important; }
-    
-    .header-section { 
-      display: flex !important; 
-      justify-content: space-between !important; 
-      margin-bottom: 1.2mm !important; 
-      padding-bottom: 0.8mm !important;
-      border-bottom: 2px solid #e0e0e0 !important;
-    }
-    .logo { height: 14mm !important; margin-bottom: 0.4mm !important; }
-    .logo-subtitle { font-size: 0.82em !important; font-weight: 600 !important; }
-    .customer-box { 
-      background: #f8f9fa !important; 
-      border: 2px solid #1e73e8 !important; 
-      padding: 1.2mm 2mm !important; 
-      font-size: 0.88em !important; 
-      line-height: 1.35 !important; 
-    }
-    .customer-box strong { font-weight: 700 !important; color: #1e3a5f !important; }
-    .address-box { 
-      background: #ffffff !important; 
-      border: 2px solid #dadce0 !important; 
-      padding: 1.2mm 2mm !important; 
-      font-size: 0.88em !important; 
-      line-height: 1.25 !important; 
-    }
-    
-    .main-title { color: #1e3a5f !important; font-size: 1.6em !important; margin: 0 0 0.4mm 0 !important; }
-    .plan-type { color: #f39c12 !important; font-size: 1.15em !important; margin: 0.25mm 0 !important; }
-    .customer-subtitle { font-size: 0.92em !important; font-weight: 700 !important; margin-top: 0.4mm !important; }
-    
-    .title-section { margin-bottom: 1.2mm !important; }
-    
-    .tour-table th { 
-      background: #1e3a5f !important; 
-      color: white !important; 
-      padding: 0.9mm 0.3mm !important; 
-      font-size: 0.68em !important; 
-    }
-    .tour-table td { 
-      border-right: 1px solid #dadce0 !important; 
-      padding: 0.9mm 0.3mm !important; 
-      font-size: 0.78em !important; 
-    }
-    
-    .tour-section { margin-bottom: 1.2mm !important; }
-    
-    .days-grid { 
-      gap: 0.8mm !important; 
-      margin-top: 0.6mm !important; 
-      display: flex !important;
-      flex-direction: column !important;
-    }
-    
-    .day-card { 
-      box-shadow: 0 0.5px 1px rgba(0,0,0,0.1) !important;
-      page-break-inside: avoid !important;
-      border: 1px solid #e0e0e0 !important;
-      width: 100% !important;
-    }
-    
-    .day-card-header { 
-      padding: 1mm 1.5mm !important; 
-      font-size: 1.05em !important;
-      font-weight: 700 !important;
-    }
-    
-    .day-card.active .day-card-header { 
-      background: #1e73e8 !important; 
-      color: white !important;
-    }
-    
-    .day-card.inactive .day-card-header { 
-      background: #9aa0a6 !important; 
-      color: white !important;
-    }
-    
-    .day-card-body { 
-      padding: 0.8mm 1.2mm !important; 
-      display: flex !important;
-      flex-wrap: wrap !important;
-      gap: 1.2mm !important;
-    }
-    
-    .sortiment-item {
-      flex: 0 0 calc(50% - 0.6mm) !important;
-      padding: 0.5mm 0.7mm !important;
-      border: 1px solid #f0f0f0 !important;
-      background: #fafafa !important;
-    }
-    
-    .sortiment-name {
-      font-size: 0.72em !important;
-      font-weight: 700 !important;
-      color: #d0192b !important;
-      margin-bottom: 0.2mm !important;
-      line-height: 1.0 !important;
-    }
-    
-    .sortiment-detail {
-      font-size: 0.75em !important;
-      font-weight: 600 !important;
-      margin-top: 0.15mm !important;
-      line-height: 1.05 !important;
-    }
-    
-    .no-delivery {
-      margin: 1mm 0 !important;
-      font-size: 0.85em !important;
-    }
-  }
-
-  .paper-content *{ font-size: 7.5pt; line-height: 1.05; }
-
-  /* === HEADER SECTION === */
-  .header-section {
-    display: flex;
-    justify-content: space-between;
-    align-items: flex-start;
-    margin-bottom: 1.2mm;
-    padding-bottom: 0.8mm;
-    border-bottom: 2px solid #e0e0e0;
-  }
-
-  .header-left {
-    display: flex;
-    flex-direction: column;
-    align-items: flex-start;
-  }
-
-  .logo {
-    height: 14mm;
-    margin-bottom: 0.4mm;
-  }
-
-  .logo-subtitle {
-    font-size: 0.82em;
-    color: #5f6368;
-    font-weight: 600;
-  }
-
-  .header-right {
-    text-align: right;
-  }
-
-  .customer-box {
-    background: #f8f9fa;
-    border: 2px solid #1e73e8;
-    border-radius: 3px;
-    padding: 1.2mm 2mm;
-    font-size: 0.88em;
-    line-height: 1.35;
-  }
-
-  .customer-box strong {
-    font-weight: 700;
-    color: #1e3a5f;
-  }
-
-  /* === TITLE SECTION === */
-  .title-section {
-    text-align: center;
-    margin-bottom: 1.2mm;
-  }
-
-  .main-title {
-    font-size: 1.6em;
-    font-weight: 900;
-    color: #1e3a5f;
-    margin: 0 0 0.4mm 0;
-  }
+        source, all_data, plans, errors = job.result
+        for area_key in missing:  # je Bereich merken; Fehler beim Öffnen ("*") gelten für alle
+            memo[(digest, area_key)] = (
+                source,
+                {k: v for k, v in all_data.items() if k == area_key},
+                {k: v for k, v in plans.items() if k == area_key},
+                {k: v for k, v in errors.items() if k in (area_key, "*")},
+            )
+
+    outputs = []
+    for up, digest in zip(uploads, digests):
+        all_data, plans, errors = {}, {}, {}
+        for area_key in SHEETS:  # Reihenfolge wie beim Gesamtlauf
+            if area_key in areas and (digest, area_key) in memo:
+                _, area_data, area_plans, area_errors = memo[(digest, area_key)]
+                all_data.update(area_data)
+                plans.update(area_plans)
+                errors.update(area_errors)
+        outputs.append((up.name, all_data, plans, errors))
+    return outputs
 
-  .plan-type {
-    font-size: 1.15em;
-    color: #f39c12;
-    font-weight: 800;
-    margin: 0.25mm 0;
-  }
-
-  .customer-subtitle {
-    font-size: 0.92em;
-    color: #2c3e50;
-    font-weight: 700;
-    margin-top: 0.4mm;
-  }
-
-  /* === ADDRESS BOX === */
-  .address-box {
-    background: #ffffff;
-    border: 2px solid #dadce0;
-    border-radius: 3px;
-    padding: 1.2mm 2mm;
-    margin-bottom: 1.2mm;
-    font-size: 0.88em;
-    line-height: 1.25;
-    color: #2c3e50;
-  }
-
-  /* === TOUR SECTION === */
-  .tour-section {
-    margin-bottom: 1.2mm;
-  }
-
-  .tour-table {
-    width: 100%;
-    border-collapse: collapse;
-    background: #f8f9fa;
-    border-radius: 3px;
-    overflow: hidden;
-  }
-
-  .tour-table th {
-    background: #1e3a5f;
-    color: white;
-    padding: 0.9mm 0.3mm;
-    font-size: 0.68em;
-    font-weight: 700;
-    text-align: center;
-    border-right: 1px solid rgba(255,255,255,0.2);
-  }
-
-  .tour-table th:last-child {
-    border-right: none;
-  }
-
-  .tour-table td {
-    padding: 0.9mm 0.3mm;
-    text-align: center;
-    font-weight: 700;
-    font-size: 0.78em;
-    border-right: 1px solid #dadce0;
-    color: #2c3e50;
-  }
-
-  .tour-table td:last-child {
-    border-right: none;
-  }
-
-  /* === DAYS GRID === */
-  .days-grid {
-    display: flex;
-    flex-direction: column;
-    gap: 0.8mm;
-    margin-top: 0.6mm;
-  }
-
-  .day-card {
-    background: white;
-    border-radius: 3px;
-    overflow: hidden;
-    box-shadow: 0 0.5px 1px rgba(0,0,0,0.1);
-    page-break-inside: avoid;
-    border: 1px solid #e0e0e0;
-    width: 100%;
-  }
-
-  .day-card-header {
-    padding: 1mm 1.5mm;
-    font-weight: 700;
-    font-size: 1.05em;
-    color: white;
-    display: flex;
-    align-items: center;
-  }
-
-  .day-card.active .day-card-header {
-    background: #1e73e8;
-  }
-
-  .day-card.inactive .day-card-header {
-    background: #9aa0a6;
-  }
-
-  .day-card-body {
-    padding: 0.8mm 1.2mm;
-    background: white;
-    display: flex;
-    flex-wrap: wrap;
-    gap: 1.2mm;
-  }
-
-  .sortiment-item {
-    flex: 0 0 calc(50% - 0.6mm);
-    padding: 0.5mm 0.7mm;
-    border: 1px solid #f0f0f0;
-    border-radius: 2px;
-    background: #fafafa;
-  }
-
-  .sortiment-item:last-child {
-    border: 1px solid #f0f0f0;
-  }
-
-  .sortiment-name {
-    font-size: 0.72em;
-    font-weight: 700;
-    color: #d0192b;
-    margin-bottom: 0.2mm;
-    line-height: 1.0;
-  }
-
-  .sortiment-detail {
-    font-size: 0.75em;
-    color: #5f6368;
-    line-height: 1.05;
-    margin-top: 0.15mm;
-    font-weight: 600;
-  }
-
-  .sortiment-detail .label {
-    font-weight: 600;
-    color: #5f6368;
-  }
-
-  .sortiment-list {
-    list-style: none;
-    padding: 0;
-    margin: 0 0 1.5mm 0;
-  }
-
-  .sortiment-list li {
-    padding: 1mm 0;
-    padding-left: 3.5mm;
-    position: relative;
-    font-size: 0.9em;
-    line-height: 1.25;
-    color: #2c3e50;
-  }
-
-  .sortiment-list li:before {
-    content: "•";
-    position: absolute;
-    left: 0;
-    color: #1e73e8;
-    font-weight: bold;
-  }
-
-  .card-info {
-    padding: 1mm 0;
-    font-size: 0.85em;
-    color: #2c3e50;
-  }
-
-  .info-label {
-    font-weight: 600;
-    color: #5f6368;
-  }
-
-  .info-value {
-    font-weight: 700;
-    color: #2c3e50;
-  }
-
-  .no-delivery {
-    text-align: center;
-    color: #9aa0a6;
-    font-style: italic;
-    margin: 1mm 0;
-    font-size: 0.85em;
-  }
-
-  .area-buttons {
-    display: grid;
-    grid-template-columns: 1fr 1fr;
-    gap: 8px;
-    padding: 15px;
-    border-bottom: 1px solid #3c3c3c;
-  }
-
-  .area-btn {
-    padding: 12px;
-    border: 2px solid #4a4a4a;
-    background: #3a3a3a;
-    color: #b8b8b8;
-    cursor: pointer;
-    border-radius: 8px;
-    font-weight: 600;
-    transition: all 0.2s;
-    text-align: center;
-  }
-
-  .area-btn:hover {
-    background: #444444;
-    border-color: #1a73e8;
-    color: #8ab4f8;
-  }
-
-  .area-btn.active {
-    background: #1a73e8;
-    border-color: #1a73e8;
-    color: #ffffff;
-  }
-
-  .item:hover {
-    background: #383838;
-  }
-
-  @media print {
-    tr { page-break-inside: avoid; }
-  }
-</style>
-</head>
-<body>
-<div class="app">
-  <div class="sidebar">
-    <div style="padding:15px; font-weight:bold; font-size:18px; color:#e8eaed; border-bottom:2px solid #3c3c3c; background:#353535;">📊 Sendeplan Generator</div>
-
-    <div class="area-buttons">
-      <div class="area-btn active" id="btn-direkt" onclick="switchArea('direkt')">Direkt</div>
-      <div class="area-btn" id="btn-mk" onclick="switchArea('mk')">MK</div>
-      <div class="area-btn" id="btn-nms" onclick="switchArea('nms')">HuPa NMS</div>
-      <div class="area-btn" id="btn-malchow" onclick="switchArea('malchow')">HuPa Malchow</div>
-    </div>
-
-    <div style="padding:15px; display:flex; flex-direction:column; gap:10px;">
-      <input id="knr" placeholder="Kunden-Nr..." oninput="showOne()" style="width:100%; padding:10px; border-radius:6px; border:2px solid #4a4a4a; font-size:14px; color:#e8eaed; background:#3a3a3a;">
-      <button onclick="showOne()" style="padding:10px; background:#1a73e8; color:white; border:none; cursor:pointer; border-radius:6px; font-weight:600; transition: background 0.2s;" onmouseover="this.style.background='#1557b0'" onmouseout="this.style.background='#1a73e8'">Anzeigen</button>
-      <button onclick="window.print()" style="padding:10px; background:#0f9d58; color:white; border:none; cursor:pointer; border-radius:6px; font-weight:600; transition: background 0.2s;" onmouseover="this.style.background='#0d7d47'" onmouseout="this.style.background='#0f9d58'">Drucken</button>
-      <button onclick="printAll()" style="padding:10px; background:#ea4335; color:white; border:none; cursor:pointer; font-weight:bold; border-radius:6px; transition: background 0.2s;" onmouseover="this.style.background='#c5221f'" onmouseout="this.style.background='#ea4335'">Alle drucken</button>
-    </div>
-    <div class="list" id="list"></div>
-  </div>
-
-  <div class="main">
-    <div class="wrap" id="out"><div style="color:#9aa0a6; padding:20px; font-weight:600; text-align:center;">📋 Bitte Bereich und Kunden wählen...</div></div>
-  </div>
-</div>
-
-<script>
-const ALL_DATA = __DATA_JSON__;
-const LOGO_SRC = "__LOGO_DATAURI__";
-let currentArea = 'direkt';
-let DATA = ALL_DATA['direkt'] || {};
-let ORDER = Object.keys(DATA).sort((a,b)=> (Number(a)||0)-(Number(b)||0));
-const DAYS = ["Montag","Dienstag","Mittwoch","Donnerstag","Freitag","Samstag"];
-
-// Debug: Zeige Daten-Status in Console
-console.log("=== INIT DEBUG ===");
-console.log("ALL_DATA type:", typeof ALL_DATA);
-console.log("ALL_DATA keys:", Object.keys(ALL_DATA || {}));
-console.log("Direkt keys count:", Object.keys(DATA).length);
-console.log("ORDER length:", ORDER.length);
-console.log("First 5 customer numbers:", ORDER.slice(0, 5));
-
-// Zeige Hinweis wenn keine Daten
-if (!ALL_DATA || Object.keys(ALL_DATA).length === 0) {
-  console.error("FEHLER: ALL_DATA ist leer!");
-  document.getElementById("out").innerHTML = `
-    <div style="color:#ea4335; padding:40px; text-align:center; font-size:16px;">
-      <h2>⚠️ Keine Daten gefunden!</h2>
-      <p>Diese HTML-Datei enthält keine Kundendaten.</p>
-      <p><strong>Bitte führen Sie folgende Schritte aus:</strong></p>
-      <ol style="text-align:left; display:inline-block; margin-top:20px;">
-        <li>Starten Sie Streamlit: <code>streamlit run quelldrucksendezeiten.py</code></li>
-        <li>Laden Sie Ihre Excel-Datei hoch</li>
-        <li>Warten Sie, bis die Verarbeitung abgeschlossen ist</li>
-        <li>Klicken Sie auf "Download Sendeplan (A4)"</li>
-        <li>Öffnen Sie die heruntergeladene HTML-Datei</li>
-      </ol>
-    </div>
-  `;
-} else if (Object.keys(DATA).length === 0) {
-  console.error("FEHLER: DATA für Bereich 'direkt' ist leer!");
-  document.getElementById("out").innerHTML = `
-    <div style="color:#f39c12; padding:40px; text-align:center; font-size:16px;">
-      <h2>⚠️ Keine Kunden im Bereich "Direkt"</h2>
-      <p>Verfügbare Bereiche: ${Object.keys(ALL_DATA).join(", ")}</p>
-      <p>Wählen Sie einen anderen Bereich.</p>
-    </div>
-  `;
-} else {
-  console.log("✓ Daten erfolgreich geladen!");
-}
-
-function esc(s){ return String(s||"").replace(/&/g,"&amp;").replace(/</g,"&lt;"); }
-
-function render(c){
-  // Erstelle Karten nur für Tage MIT Lieferungen
-  let dayCards = "";
-  DAYS.forEach(d => {
-    const items = (c.bestell || []).filter(it => it.liefertag === d);
-    
-    // Nur Tage MIT Lieferungen anzeigen
-    if (items.length > 0) {
-      // Jedes Sortiment mit seiner eigenen Zeit anzeigen
-      const itemsHtml = items.map(it => {
-        const sortiment = esc(it.sortiment || "");
-        const bestelltag = esc(it.bestelltag || "");
-        const bestellschluss = esc(it.bestellschluss || "");
-        
-        return `
-          <div class="sortiment-item">
-            <div class="sortiment-name">${sortiment}</div>
-            ${bestelltag ? `<div class="sortiment-detail"><span class="label">Bestelltag:</span> ${bestelltag}</div>` : ''}
-            ${bestellschluss ? `<div class="sortiment-detail"><span class="label">Bestellschluss:</span> ${bestellschluss}</div>` : ''}
-          </div>
-        `;
-      }).join("");
-      
-      dayCards += `
-        <div class="day-card active">
-          <div class="day-card-header">${d}</div>
-          <div class="day-card-body">
-            ${itemsHtml}
-          </div>
-        </div>`;
-    }
-    // Tage OHNE Lieferung werden komplett weggelassen
-  });
-
-  // Tour-Informationen aufbereiten
-  const tourItems = DAYS.map(d => {
-    const tourNr = c.tours[d] || "—";
-    return `<td>${esc(tourNr)}</td>`;
-  }).join("");
-  
-  const tourHeaders = DAYS.map(d => `<th>${d.substring(0,2)}</th>`).join("");
-
-  // Logo
-  const logoHtml = LOGO_SRC ? `<img class="logo" src="${LOGO_SRC}" alt="Logo">` : "";
-  
-  // Aktuelles Datum
-  const heute = new Date();
-  const standDatum = heute.toLocaleDateString('de-DE', { day: '2-digit', month: '2-digit', year: 'numeric' });
-
-  return `<div class="paper">
-    <div class="paper-content">
-      <div class="header-section">
-        <div class="header-left">
-          ${logoHtml}
-          <div class="logo-subtitle">Das Fleischwerk von EDEKA Nord</div>
-        </div>
-        <div class="header-right">
-          <div class="customer-box">
-            <div><strong>Kunden-Nr:</strong> ${esc(c.kunden_nr)}</div>
-            <div><strong>Fachberater:</strong> ${esc(c.fachberater)}</div>
-            <div><strong>Stand:</strong> ${standDatum}</div>
-          </div>
-        </div>
-      </div>
-
-      <div class="title-section">
-        <h1 class="main-title">Sende- &amp; Belieferungsplan</h1>
-        <div class="plan-type">${esc(c.plan_typ)}</div>
-        <div class="customer-subtitle">${esc(c.name)} | ${esc(c.bereich)}</div>
-      </div>
-
-      <div class="address-box">
-        <strong>${esc(c.name)}</strong><br>
-        ${esc(c.strasse)}<br>
-        ${esc(c.plz)} ${esc(c.ort)}
-      </div>
-
-      <div class="tour-section">
-        <table class="tour-table">
-          <thead><tr>${tourHeaders}</tr></thead>
-          <tbody><tr>${tourItems}</tr></tbody>
-        </table>
-      </div>
-
-      <div class="days-grid">
-        ${dayCards}
-      </div>
-    </div>
-  </div>`;
-}
-
-function findCustomerInAllAreas(knr){
-  // Durchsuche alle Bereiche nach der Kundennummer
-  for(let area in ALL_DATA){
-    if(ALL_DATA[area][knr]){
-      return area;
-    }
-  }
-  return null;
-}
-
-function showOne(){
-  const k = document.getElementById("knr").value.trim();
-  
-  if(!k){
-    document.getElementById("out").innerHTML = "<div style='color:#9aa0a6; padding:20px; font-weight:500; text-align:center;'>🔍 Bitte Kundennummer eingeben...</div>";
-    return;
-  }
-  
-  // Prüfe zuerst im aktuellen Bereich
-  if(DATA[k]){
-    document.getElementById("out").innerHTML = render(DATA[k]);
-    return;
-  }
-  
-  // Suche in allen Bereichen
-  const foundArea = findCustomerInAllAreas(k);
-  
-  if(foundArea){
-    // Automatisch zum richtigen Bereich wechseln (Input beibehalten)
-    if(foundArea !== currentArea){
-      switchArea(foundArea, true);
-    }
-    // Kunde anzeigen
-    document.getElementById("out").innerHTML = render(ALL_DATA[foundArea][k]);
-  } else {
-    document.getElementById("out").innerHTML = `<div style="color:#f28b82; padding:20px; font-weight:600; text-align:center;">⚠️ Kunde ${k} nicht gefunden.</div>`;
-  }
-}
-
-function switchArea(area, preserveInput = false){
-  currentArea = area;
-  DATA = ALL_DATA[area] || {};
-  ORDER = Object.keys(DATA).sort((a,b)=> (Number(a)||0)-(Number(b)||0));
-
-  document.querySelectorAll('.area-btn').forEach(btn => btn.classList.remove('active'));
-  document.getElementById(`btn-${area}`).classList.add('active');
-
-  updateList();
-  
-  if(!preserveInput){
-    document.getElementById("knr").value = "";
-    document.getElementById("out").innerHTML = `<div style="color:#8ab4f8; padding:20px; font-weight:600; text-align:center;">✓ Bereich gewechselt zu: ${getAreaName(area)}<br><br>Bitte Kunden wählen...</div>`;
-  }
-}
-
-function getAreaName(area){
-  const names = {'direkt':'Direkt','mk':'MK','nms':'HuPa NMS','malchow':'HuPa Malchow'};
-  return names[area] || area;
-}
-
-function updateList(){
-  console.log("=== updateList() aufgerufen ===");
-  console.log("DATA:", DATA);
-  console.log("ORDER:", ORDER);
-  console.log("ORDER.length:", ORDER.length);
-  
-  const listDiv = document.getElementById("list");
-  console.log("list div gefunden:", !!listDiv);
-  
-  if (!DATA || Object.keys(DATA).length === 0) {
-    console.warn("Keine Kunden im aktuellen Bereich");
-    listDiv.innerHTML = `
-      <div style="padding:20px; text-align:center; color:#9aa0a6; font-size:13px;">
-        <p>Keine Kunden im aktuellen Bereich</p>
-      </div>
-    `;
-    return;
-  }
-  
-  console.log("Erstelle HTML für", ORDER.length, "Kunden...");
-  
-  try {
-    const html = ORDER.map((k, idx) => {
-      const name = (DATA[k] && DATA[k].name) ? DATA[k].name : "";
-      if (idx < 3) {
-        console.log(`Kunde ${idx}: ${k} - ${name}`);
-      }
-      return `<div class="item" onclick="document.getElementById('knr').value='${k}';showOne()"><b style="color:#8ab4f8">${k}</b> <span style="color:#5f6368">•</span> <span style="color:#b8b8b8">${esc(name)}</span></div>`;
-    }).join("");
-    
-    console.log("HTML erstellt, Länge:", html.length);
-    console.log("Erste 200 Zeichen:", html.substring(0, 200));
-    
-    listDiv.innerHTML = html;
-    console.log("Liste aktualisiert!");
-  } catch(err) {
-    console.error("FEHLER in updateList:", err);
-    listDiv.innerHTML = `<div style="padding:20px; color:red;">Fehler: ${err.message}</div>`;
-  }
-}
-
-function printAll(){
-  // Dialog erstellen für Liefertag-Auswahl
-  const dialogHtml = `
-    <div id="printDialog" style="position:fixed; top:0; left:0; right:0; bottom:0; background:rgba(0,0,0,0.7); display:flex; align-items:center; justify-content:center; z-index:9999;">
-      <div style="background:#2d2d2d; padding:30px; border-radius:12px; max-width:500px; width:90%; border:1px solid #3c3c3c;">
-        <h3 style="margin-top:0; color:#e8eaed; font-size:20px;">Drucken nach Liefertag</h3>
-        <p style="color:#9aa0a6; margin-bottom:20px;">Wählen Sie den Liefertag aus. Die Kunden werden nach Tournummer sortiert gedruckt.</p>
-        <div style="display:grid; grid-template-columns:1fr 1fr; gap:10px; margin-bottom:20px;">
-          <button onclick="printByDeliveryDay('Montag')" style="padding:12px; background:#1a73e8; color:white; border:none; cursor:pointer; border-radius:6px; font-weight:600;">Montag</button>
-          <button onclick="printByDeliveryDay('Dienstag')" style="padding:12px; background:#1a73e8; color:white; border:none; cursor:pointer; border-radius:6px; font-weight:600;">Dienstag</button>
-          <button onclick="printByDeliveryDay('Mittwoch')" style="padding:12px; background:#1a73e8; color:white; border:none; cursor:pointer; border-radius:6px; font-weight:600;">Mittwoch</button>
-          <button onclick="printByDeliveryDay('Donnerstag')" style="padding:12px; background:#1a73e8; color:white; border:none; cursor:pointer; border-radius:6px; font-weight:600;">Donnerstag</button>
-          <button onclick="printByDeliveryDay('Freitag')" style="padding:12px; background:#1a73e8; color:white; border:none; cursor:pointer; border-radius:6px; font-weight:600;">Freitag</button>
-          <button onclick="printByDeliveryDay('Samstag')" style="padding:12px; background:#1a73e8; color:white; border:none; cursor:pointer; border-radius:6px; font-weight:600;">Samstag</button>
-        </div>
-        <div style="display:flex; gap:10px;">
-          <button onclick="printByDeliveryDay('ALLE')" style="flex:1; padding:12px; background:#0f9d58; color:white; border:none; cursor:pointer; border-radius:6px; font-weight:600;">Alle Tage</button>
-          <button onclick="closePrintDialog()" style="flex:1; padding:12px; background:#5f6368; color:white; border:none; cursor:pointer; border-radius:6px; font-weight:600;">Abbrechen</button>
-        </div>
-      </div>
-    </div>
-  `;
-  document.body.insertAdjacentHTML('beforeend', dialogHtml);
-}
-
-function closePrintDialog(){
-  const dialog = document.getElementById('printDialog');
-  if(dialog) dialog.remove();
-}
-
-function printByDeliveryDay(day){
-  closePrintDialog();
-  
-  const areaName = getAreaName(currentArea);
-  
-  // Kunden filtern und sortieren
-  let customersToPrint = [];
-  
-  if(day === 'ALLE'){
-    // Alle Kunden in ursprünglicher Reihenfolge
-    customersToPrint = ORDER.map(k => ({key: k, data: DATA[k]})).filter(c => c.data);
-  } else {
-    // Nur Kunden die an diesem Tag beliefert werden
-    ORDER.forEach(k => {
-      if(DATA[k] && DATA[k].tours && DATA[k].tours[day]){
-        const tourNr = DATA[k].tours[day];
-        if(tourNr && tourNr !== "—" && tourNr.trim() !== ""){
-          customersToPrint.push({
-            key: k,
-            data: DATA[k],
-            tour: tourNr
-          });
-        }
-      }
-    });
-    
-    // Nach Tournummer sortieren
-    customersToPrint.sort((a, b) => {
-      const tourA = String(a.tour).replace(/\D/g, '');
-      const tourB = String(b.tour).replace(/\D/g, '');
-      return (Number(tourA) || 0) - (Number(tourB) || 0);
-    });
-  }
-  
-  if(customersToPrint.length === 0){
-    alert(`Keine Kunden mit Lieferung am ${day} gefunden.`);
-    return;
-  }
-  
-  const message = day === 'ALLE' 
-    ? `Möchten Sie wirklich alle ${customersToPrint.length} Kunden aus "${areaName}" drucken?`
-    : `Möchten Sie ${customersToPrint.length} Kunden für ${day} (sortiert nach Tour) drucken?`;
-    
-  if(!confirm(message)) return;
-  
-  // HTML generieren
-  let html = "";
-  customersToPrint.forEach(c => {
-    html += render(c.data);
-  });
-  
-  document.getElementById("out").innerHTML = html;
-  setTimeout(() => window.print(), 500);
-}
-
-console.log("=== Script Ende - Rufe updateList() auf ===");
-console.log("Aktueller Bereich:", currentArea);
-console.log("DATA keys:", Object.keys(DATA).length);
-updateList();
-console.log("=== updateList() Aufruf abgeschlossen ===");
-</script>
-</body>
-</html>
-"""
 
 # --- STREAMLIT APP ---
 st.set_page_config(page_title="Sendeplan Generator - 4 Bereiche", layout="wide")
@@ -1134,147 +112,270 @@ else:
     st.info("Kein Logo gewählt/gefunden. (Upload oder Datei 'Logo_NORDfrische Center (NFC).png')")
 
 st.subheader("Excel")
-up = st.file_uploader("Excel Datei laden", type=["xlsx"])
-
-if up:
-    SHEETS = {
-        'direkt': 'Direkt 1 - 99',
-        'mk': 'Hupa MK 882',
-        'nms': 'Hupa 2221-4444',
-        'malchow': 'Hupa 7773-7779'
-    }
-
-    all_data = {}
-
-    for area_key, sheet_name in SHEETS.items():
-        st.write(f"Verarbeite: **{sheet_name}**...")
+uploads = st.file_uploader(
+    "Excel Datei(en) laden – mehrere Dateien werden zusammengeführt "
+    "(alternativ ZIP mit CSV/Parquet je Blatt)",
+    type=["xlsx", "zip"],
+    accept_multiple_files=True,
+)
+areas = st.multiselect(
+    "Bereiche",
+    list(SHEETS),
+    default=list(SHEETS),
+    format_func=SHEETS.get,
+    help="Nur gewählte Bereiche werden eingelesen; weitere später bei Bedarf (bereits Gelesenes bleibt erhalten)",
+)
+variants_up = st.file_uploader(
+    "Planvarianten (JSON, optional) – z.B. Feiertagswochen als Änderungen am Standardplan",
+    type=["json"],
+)
+
+if uploads and not areas:
+    st.info("Bitte mindestens einen Bereich wählen.")
+elif uploads:
+    profiler = None
+    if st.session_state.get("profile_run"):
+        # Profil-Lauf: im Script-Thread statt im Pool, damit cProfile alles sieht
+        from sendeplan_profile import new_profiler
+
+        profiler = new_profiler()
+        with st.spinner("Verarbeitung mit Profiler..."):
+            batch = collect_outputs(
+                profiler.runcall(lambda: [
+                    process_source(u.name, u.getvalue(), {a: SHEETS[a] for a in areas}, detail_stats=True)
+                    for u in uploads
+                ])
+            )
+    else:
+        # Verarbeitung im gemeinsamen Pool; gleiche Dateien (auch aus anderen Sitzungen) nur einmal
+        batch = collect_outputs(area_outputs(uploads, areas))
+
+    for msg in batch.errors:
+        st.error(msg)
+    plans = {}
+    for (source, area_key), plan in batch.plans.items():
+        plans[SHEETS[area_key] if len(uploads) == 1 else f"{source}: {SHEETS[area_key]}"] = plan
+
+    all_data = batch.all_data
+    for area_key, data in all_data.items():
+        if len(uploads) == 1:
+            st.success(f"✓ {SHEETS[area_key]}: {len(data)} Kunden verarbeitet")
+        else:
+            st.success(f"✓ {SHEETS[area_key]}: {len(data)} Kunden aus {len(uploads)} Dateien")
+
+    if batch.conflicts:
+        st.warning(
+            f"{len(batch.conflicts)} Kunden-Nr. mit abweichendem Inhalt in mehreren Dateien "
+            "(verwendet wird jeweils die erste Datei):"
+        )
+        st.dataframe(
+            [
+                {"Bereich": SHEETS[area_key], "Kunden-Nr": knr, "Dateien": ", ".join(sources)}
+                for area_key, knr, sources in batch.conflicts
+            ],
+            use_container_width=True,
+        )
+
+    variants = None
+    if variants_up is not None:
+        from sendeplan_variants import apply_variants, load_variants
 
         try:
-            df = pd.read_excel(up, sheet_name=sheet_name)
-        except Exception as e:
-            st.error(f"Fehler beim Laden von '{sheet_name}': {e}")
-            continue
+            variants = apply_variants(all_data, load_variants(io.BytesIO(variants_up.getvalue())))
+        except ValueError as e:
+            st.error(f"Planvarianten: {e}")
+        for name, delta in (variants or {}).items():
+            st.success(f"✓ Variante {name}: {sum(len(d) for d in delta.values())} Kunden geändert")
+
+    # Erstelle HTML (gestreamt in eine temporäre Datei)
+    if profiler is not None:
+        html_file, (json_pos, json_len) = profiler.runcall(
+            build_html_file, all_data, logo_preview_uri or "", variants=variants)
+    else:
+        html_file, (json_pos, json_len) = build_html_file(all_data, logo_preview_uri or "", variants=variants)
 
-        cols = df.columns.tolist()
-        trip = detect_triplets(cols)
-        bmap = detect_bspalten(cols)
-        ds_trip = detect_ds_triplets(cols)
-
-        data = {}
-
-        for _, r in df.iterrows():
-            knr = norm(r.get("Nr", ""))
-            if not knr:
-                continue
-
-            bestell = []
-            for d_de in DAYS_DE:
-                day_items = []
-
-                # 1) Triplets
-                if d_de in trip:
-                    for group_text, f in trip[d_de].items():
-                        s = norm(r.get(f.get("Sort")))
-                        t = safe_time(r.get(f.get("Zeit")))
-                        tag = norm(r.get(f.get("Tag")))
-
-                        if s or t or tag:
-                            actual_gid = canon_group_id(s)
-                            day_items.append({
-                                "liefertag": d_de,
-                                "sortiment": s,
-                                "bestelltag": tag,
-                                "bestellschluss": t,
-                                "prio": SORT_PRIO.get(actual_gid, 50)
-                            })
-
-                # 2) B-Spalten
-                keys = [k for k in bmap.keys() if k[0] == d_de]
-                for k in keys:
-                    f = bmap[k]
-                    s = norm(r.get(f.get("sort", "")))
-                    z = safe_time(r.get(f.get("zeit", "")))
-
-                    l_col = f.get("l")
-                    if l_col:
-                        tag = norm(r.get(l_col, ""))
-                        if not tag:
-                            tag = k[2]  # Fallback Spaltennamen
-                    else:
-                        tag = k[2]
-
-                    if s or z:
-                        actual_gid = canon_group_id(s)
-                        day_items.append({
-                            "liefertag": d_de,
-                            "sortiment": s,
-                            "bestelltag": tag,
-                            "bestellschluss": z,
-                            "prio": SORT_PRIO.get(actual_gid, 50)
-                        })
-
-                # 3) Deutsche See
-                if d_de in ds_trip:
-                    for key_ds in ds_trip[d_de]:
-                        f = ds_trip[d_de][key_ds]
-                        s = norm(r.get(f.get("Sort")))
-                        t = safe_time(r.get(f.get("Zeit")))
-                        tag = norm(r.get(f.get("Tag")))
-                        if s or t or tag:
-                            day_items.append({
-                                "liefertag": d_de,
-                                "sortiment": s,
-                                "bestelltag": tag,
-                                "bestellschluss": t,
-                                "prio": 5.5  # nach Avo (5), vor Werbemittel (6)
-                            })
-
-                day_items.sort(key=lambda x: x["prio"])
-                bestell.extend(day_items)
-
-            data[knr] = {
-                "plan_typ": PLAN_TYP,
-                "bereich": BEREICH,
-                "kunden_nr": knr,
-                "name": norm(r.get("Name", "")),
-                "strasse": norm(r.get("Strasse", "")),
-                "plz": norm(r.get("Plz", "")),
-                "ort": norm(r.get("Ort", "")),
-                "fachberater": norm(r.get("Fachberater", "")),
-                "tours": {d: norm(r.get(TOUR_COLS[d], "")) for d in DAYS_DE},
-                "bestell": bestell
-            }
-
-        all_data[area_key] = data
-        st.success(f"✓ {sheet_name}: {len(data)} Kunden verarbeitet")
-
-    # Erstelle JSON
-    json_data = json.dumps(all_data, ensure_ascii=False, separators=(",", ":"))
-    
     # Debug-Option
-    show_debug = st.checkbox("Debug-Informationen anzeigen", value=False)
+    debug_col, profile_col = st.columns(2)
+    show_debug = debug_col.checkbox("Debug-Informationen anzeigen", value=False)
+    profile_col.checkbox("Diesen Lauf profilieren (cProfile)", value=False, key="profile_run",
+                         help="Verarbeitet die Dateien erneut unter dem Profiler (langsamer, ohne Pool/Cache)")
+    if profiler is not None:
+        from sendeplan_profile import profile_bytes, top_functions, total_time
+
+        st.write(f"**Profil:** {total_time(profiler):.2f} s (Einlesen, Extraktion, HTML)")
+        st.write("Nach kumulierter Zeit:")
+        st.dataframe(top_functions(profiler, "cumulative"), use_container_width=True)
+        st.write("Nach eigener Zeit:")
+        st.dataframe(top_functions(profiler, "tottime"), use_container_width=True)
+        st.download_button(
+            "Download Profil (.prof, für pstats/snakeviz)",
+            data=profile_bytes(profiler),
+            file_name="sendeplan_profil.prof",
+            mime="application/octet-stream"
+        )
     if show_debug:
+        html_file.seek(json_pos)
+        json_start = html_file.read(100).decode("utf-8", errors="replace")
+        html_file.seek(0, 2)
         st.write("**Debug-Info:**")
         st.write(f"- all_data Keys: {list(all_data.keys())}")
         st.write(f"- Direkt Kunden-Anzahl: {len(all_data.get('direkt', {}))}")
-        st.write(f"- JSON Größe: {len(json_data)} Zeichen")
-        st.write(f"- JSON Start: {json_data[:100]}...")
-    
-    # Erstelle HTML
-    html = HTML_TEMPLATE.replace(
-        "__DATA_JSON__", json_data
-    ).replace(
-        "__LOGO_DATAURI__", logo_preview_uri or ""
-    )
-    
-    if show_debug:
-        st.write(f"- HTML Größe: {len(html)} Zeichen")
+        st.write(f"- JSON Größe: {json_len} Bytes")
+        st.write(f"- JSON Start: {json_start}...")
+        st.write(f"- HTML Größe: {html_file.tell()} Bytes")
+        for label, plan in plans.items():
+            if plan.unmatched:
+                st.write(f"- Nicht zugeordnete Spalten ({label}): {len(plan.unmatched)}")
+                st.code("\n".join(str(c) for c in plan.unmatched))
+        for label, plan in plans.items():
+            if plan.stats:
+                skipped = sum(1 for s in plan.stats if s.skipped)
+                with st.expander(f"Spaltenstatistik {label}: {len(plan.stats)} Spalten, {skipped} leer übersprungen"):
+                    if plan.stats[0].seconds is None:
+                        st.caption("Verschiedene Werte und Zeiten werden mit \"Diesen Lauf profilieren\" erfasst.")
+                    st.dataframe(column_stats_table(plan.stats), use_container_width=True)
+
+    # Einzige vollständige Kopie: die Bytes für den Download
+    html_file.seek(0)
+    html_bytes = html_file.read()
+    html_file.close()
 
     st.write("---")
     st.write(f"**Gesamt:** {sum(len(all_data[k]) for k in all_data)} Kunden in {len(all_data)} Bereichen")
     st.download_button(
         "Download Sendeplan (A4)",
-        data=html,
+        data=html_bytes,
         file_name="sendeplan_4_bereiche.html",
         mime="text/html"
     )
+
+    st.subheader("Update für verteilte Sendepläne")
+    base_up = st.file_uploader(
+        "Bereits verteilte Sendeplan-HTML (oder JSON) – nur die Änderungen seitdem als Update-Datei",
+        type=["html", "json"],
+    )
+    if base_up:
+        from sendeplan_patch import make_patch, patch_counts, read_sendeplan, write_patch
+
+        try:
+            base_data, base_hash = read_sendeplan(base_up.getvalue())
+        except ValueError as e:
+            st.error(f"Keine Sendeplan-Datei: {e}")
+        else:
+            patch = make_patch(base_data, all_data, base_hash)
+            counts = patch_counts(patch)
+            if counts:
+                st.dataframe(
+                    [{"Bereich": SHEETS.get(a, a), "neu/geändert": changed, "entfernt": removed}
+                     for a, (changed, removed) in counts.items()],
+                    use_container_width=True,
+                )
+                patch_buf = io.BytesIO()
+                write_patch(patch_buf, patch)
+                st.download_button(
+                    f"Download Update ({patch_buf.tell() / 1024:.0f} KiB, im Viewer über \"Update laden\")",
+                    data=patch_buf.getvalue(),
+                    file_name="sendeplan_update.json",
+                    mime="application/json"
+                )
+            else:
+                st.info("Keine Änderungen gegenüber der verteilten Datei.")
+
+    st.subheader("Einzelseiten je Kunde")
+    zip_inline = st.checkbox("CSS und Logo in jede Seite einbetten (größer, aber einzeln versendbar)", value=False)
+    if st.checkbox("Einzelseiten als ZIP erzeugen (Ordner je Bereich und Fachberater)", value=False):
+        zip_file, zip_count = build_customer_zip(all_data, logo_preview_uri or "", inline_assets=zip_inline)
+        zip_bytes = zip_file.read()
+        zip_file.close()
+        st.download_button(
+            f"Download Einzelseiten ({zip_count} Kunden, ZIP)",
+            data=zip_bytes,
+            file_name="sendeplan_einzelseiten.zip",
+            mime="application/zip"
+        )
+
+    st.subheader("Viewer je Fachberater")
+    if st.checkbox("Je Fachberater einen eigenen Sendeplan erzeugen (nur dessen Kunden, ZIP)", value=False):
+        from sendeplan_shards import write_shards
+
+        shard_buf = io.BytesIO()
+        shards = write_shards(shard_buf, all_data, logo_preview_uri or "", variants)
+        st.dataframe(
+            [{"Fachberater": fb, "Datei": name, "Kunden": customers, "Größe (KiB)": round(size / 1024)}
+             for fb, name, customers, size in shards],
+            use_container_width=True,
+        )
+        st.download_button(
+            f"Download Viewer je Fachberater ({len(shards)} Dateien, ZIP)",
+            data=shard_buf.getvalue(),
+            file_name="sendeplan_fachberater.zip",
+            mime="application/zip"
+        )
+
+    st.subheader("Tour-Manifeste")
+    if st.checkbox("Tour-Manifeste je Liefertag erzeugen (HTML zum Drucken, CSV)", value=False):
+        from sendeplan_manifest import manifest_html, tour_manifest, write_manifest_csv
+
+        manifest_summary, manifest_lines = tour_manifest(all_data)
+        st.dataframe(manifest_summary, use_container_width=True)
+        csv_buf = io.BytesIO()
+        write_manifest_csv(manifest_lines, csv_buf)
+        st.download_button(
+            "Download Tour-Manifeste (HTML)",
+            data=manifest_html(manifest_summary, manifest_lines),
+            file_name="tour_manifeste.html",
+            mime="text/html"
+        )
+        st.download_button(
+            "Download Tour-Manifeste (CSV)",
+            data=csv_buf.getvalue(),
+            file_name="tour_manifeste.csv",
+            mime="text/csv"
+        )
+
+    st.subheader("Lieferkalender")
+    cal_cols = st.columns(3)
+    cal_start = cal_cols[0].date_input("Ab", value=datetime.date.today(), format="DD.MM.YYYY")
+    cal_weeks = cal_cols[1].number_input("Wochen", min_value=1, max_value=104, value=12)
+    cal_alarm = cal_cols[2].number_input("Erinnerung vor Bestellschluss (Min., 0 = ohne)", min_value=0, value=60)
+    if st.checkbox("Lieferkalender erzeugen (CSV mit allen Terminen, ICS je Kunde als ZIP)", value=False):
+        from sendeplan_calendar import build_ics_zip, date_range_weeks, expand_calendar, write_calendar_csv
+        from sendeplan_schedule import schedule_frame
+
+        cal_range = date_range_weeks(cal_start, int(cal_weeks))
+        cal_items = schedule_frame(all_data)
+        cal_frame = expand_calendar(all_data, *cal_range, cal_items)
+        cal_buf = io.BytesIO()
+        write_calendar_csv(cal_frame, cal_buf)
+        ics_zip, ics_count = build_ics_zip(all_data, *cal_range, int(cal_alarm), cal_items)
+        st.download_button(
+            f"Download Lieferkalender ({len(cal_frame)} Termine, CSV)",
+            data=cal_buf.getvalue(),
+            file_name=f"lieferkalender_{cal_range[0]:%Y-%m-%d}.csv",
+            mime="text/csv"
+        )
+        st.download_button(
+            f"Download Kalender je Kunde ({ics_count} ICS-Dateien, ZIP)",
+            data=ics_zip,
+            file_name=f"lieferkalender_{cal_range[0]:%Y-%m-%d}.zip",
+            mime="application/zip"
+        )
+
+    st.subheader("Export Langformat (BI/Routing)")
+    export_fmt = st.radio("Format", ["csv", "sqlite", "parquet"], horizontal=True)
+    if st.checkbox("Langformat exportieren (Kunde × Liefertag × Sortiment + Tour)", value=False):
+        from sendeplan_export import export_schedule
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            export_path = Path(tmp_dir) / f"sendeplan_langformat.{export_fmt}"
+            try:
+                export_rows = export_schedule(all_data, export_path, export_fmt)
+            except RuntimeError as e:
+                st.error(str(e))
+            else:
+                st.download_button(
+                    f"Download Langformat ({export_rows} Zeilen, {export_fmt.upper()})",
+                    data=export_path.read_bytes(),
+                    file_name=export_path.name,
+                    mime="application/octet-stream"
+                )
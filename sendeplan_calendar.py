@@ -0,0 +1,294 @@
+# sendeplan_calendar.py
+# -----------------------------------------------------------------------------
+# Lieferkalender: das Wochenmuster (Liefertag, Bestelltag, Bestellschluss je
+# Sortiment) über einen Datumsbereich zu konkreten Terminen ausgerollt.
+# Vorkommen eines Wochentags im Bereich = Versatz in Tagen ab Start, für alle
+# Zeilen auf einmal mit numpy (keine Schleife je Kunde oder Woche).
+#   CSV: je Bestell-Position x Liefertermin eine Zeile mit Liefer- und Bestelldatum.
+#   ICS: je Kunde eine Datei mit Lieferungen (ganztägig, Tour und Sortimente)
+#        und Bestellschlüssen (15 Minuten, mit Erinnerung). Die Texte entstehen
+#        einmal je Wochenmuster; je Termin kommen nur Datum und UID dazu.
+# Zeiten in den ICS-Dateien sind ortsfeste Zeiten ohne Zeitzone (floating).
+# -----------------------------------------------------------------------------
+
+import datetime
+import io
+import itertools
+import zipfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from sendeplan_core import safe_path_part
+from sendeplan_manifest import join_groups
+from sendeplan_schedule import clock_minutes, day_index, schedule_frame
+
+CALENDAR_COLUMNS = [
+    "area", "kunden_nr", "name", "fachberater", "tour", "sortiment",
+    "liefertag", "lieferdatum", "bestelltag", "bestelldatum", "bestellschluss",
+]
+CUSTOMER_KEYS = ["area", "kunden_nr"]
+WEEKDAY_SHORT = ["Mo", "Di", "Mi", "Do", "Fr", "Sa", "So"]
+ICS_HEADER = "BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//Sendeplan Generator//Lieferkalender//DE\r\n" \
+             "CALSCALE:GREGORIAN\r\nMETHOD:PUBLISH\r\n"
+ICS_FOOTER = "END:VCALENDAR\r\n"
+# Textteile eines VEVENT in Reihenfolge (datum zweimal: in der UID und in DTSTART)
+EVENT_PARTS = ["uid", "datum", "zeit", "start", "datum", "ende", "tail"]
+
+
+def date_range_weeks(start, weeks: int) -> tuple:
+    """(start, ende) für weeks volle Wochen ab start (ende einschließlich)."""
+    start = pd.Timestamp(start).normalize()
+    return start, start + pd.Timedelta(days=7 * weeks - 1)
+
+
+def _span(start, end) -> tuple:
+    """(start, Tage bis end) mit Prüfung der Reihenfolge."""
+    start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    if end < start:
+        raise ValueError(f"Ende {end:%d.%m.%Y} liegt vor dem Start {start:%d.%m.%Y}")
+    return start, (end - start).days
+
+
+def occurrences(day: np.ndarray, start: pd.Timestamp, span: int) -> tuple:
+    """
+    Alle Vorkommen der Wochentage day[i] (0 = Montag, NaN = keins) in den span+1
+    Tagen ab start: (Zeilenindex, Tage ab start), je Zeile aufsteigend.
+    """
+    weeks = span // 7 + 1
+    first = (day - start.weekday()) % 7
+    row = np.repeat(np.arange(len(day)), weeks)
+    offset = first[row] + 7 * np.tile(np.arange(weeks), len(day))
+    keep = offset <= span  # NaN fällt hier heraus
+    return row[keep], offset[keep].astype("int64")
+
+
+def _customer_ids(items: pd.DataFrame) -> np.ndarray:
+    """Laufende Nummer je Kunde (im Langformat stehen die Zeilen eines Kunden am Stück)."""
+    area, knr = items["area"].to_numpy(dtype=object), items["kunden_nr"].to_numpy(dtype=object)
+    new = np.ones(len(items), dtype=bool)
+    new[1:] = (area[1:] != area[:-1]) | (knr[1:] != knr[:-1])
+    return np.cumsum(new) - 1
+
+
+def expand_calendar(all_data: dict, start, end, items: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Eine Zeile je Bestell-Position x Liefertermin zwischen start und end (je
+    einschließlich), je Kunde chronologisch. bestelldatum: letzter Bestelltag vor
+    der Lieferung (gleicher Wochentag zählt als Vorwoche, wie in den Manifesten;
+    kann vor start liegen); bestellzeit = bestelldatum + Bestellschluss. Ohne
+    auswertbaren Tag/Uhrzeit NaT. items: schedule_frame(all_data), falls schon vorhanden.
+    """
+    start, span = _span(start, end)
+    items = schedule_frame(all_data) if items is None else items
+    deliver = day_index(items["liefertag"]).to_numpy()
+    lead = (deliver - day_index(items["bestelltag"]).to_numpy()) % 7
+    lead[lead == 0] = 7
+
+    row, offset = occurrences(deliver, start, span)
+    order = np.lexsort((items["pos"].to_numpy()[row], offset, _customer_ids(items)[row]))
+    row, offset = row[order], offset[order]
+
+    # Texte als Kategorien auswählen: kopiert je Zeile nur einen Code statt eines Strings
+    out = pd.DataFrame({c: pd.Categorical(items[c]).take(row)
+                        for c in CALENDAR_COLUMNS if c not in ("lieferdatum", "bestelldatum")})
+    base = start.to_datetime64()
+    out["lieferdatum"] = base + pd.to_timedelta(offset, unit="D")
+    out["bestelldatum"] = base + pd.to_timedelta(offset - lead[row], unit="D")
+    out["bestellzeit"] = out["bestelldatum"] + pd.to_timedelta(clock_minutes(items["bestellschluss"]).to_numpy()[row],
+                                                               unit="m")
+    return out[CALENDAR_COLUMNS + ["bestellzeit"]]
+
+
+def write_calendar_csv(cal: pd.DataFrame, path_or_buf, chunk_rows: int = 250_000) -> None:
+    """
+    CSV für Excel (Semikolon, UTF-8 mit BOM, Datum als JJJJ-MM-TT) in einen Pfad
+    oder ein Binär-File; in Blöcken zu chunk_rows Zeilen geschrieben.
+    """
+    cal.to_csv(path_or_buf, sep=";", index=False, columns=CALENDAR_COLUMNS, date_format="%Y-%m-%d",
+               lineterminator="\r\n", encoding="utf-8-sig", chunksize=chunk_rows)
+
+
+def _ics_text(s: pd.Series) -> pd.Series:
+    """TEXT-Werte nach RFC 5545 maskieren (\\, ;, , und Zeilenumbrüche)."""
+    return (s.str.replace("\\", "\\\\", regex=False).str.replace(";", "\\;", regex=False)
+            .str.replace(",", "\\,", regex=False).str.replace("\n", "\\n", regex=False))
+
+
+def _fold(line: str) -> str:
+    """Zeile nach RFC 5545 auf höchstens 75 Oktette falten (Fortsetzung mit Leerzeichen)."""
+    parts, cur, size = [], [], 0
+    for ch in line:
+        n = len(ch.encode("utf-8"))
+        if size + n > 75:
+            parts.append("".join(cur))
+            cur, size = [" "], 1
+        cur.append(ch)
+        size += n
+    parts.append("".join(cur))
+    return "\r\n".join(parts)
+
+
+def _prop(name: str, values: pd.Series) -> pd.Series:
+    """'NAME:Wert' als CRLF-Zeile; nur zu lange Zeilen werden (in Python) gefaltet."""
+    lines = name + ":" + values
+    long = lines.str.encode("utf-8").str.len() > 75
+    if long.any():
+        lines = lines.where(~long, lines[long].map(_fold))
+    return lines + "\r\n"
+
+
+def _objects(values, n: int = None) -> pd.Series:
+    """Texte als object-Spalte (kein Arrow-String): sie werden ohnehin in Python verbunden."""
+    return pd.Series(values if n is None else [values] * n, dtype=object)
+
+
+def _delivery_patterns(items: pd.DataFrame) -> pd.DataFrame:
+    """Je Kunde x Liefertag: Wochentag und SUMMARY (Tour, jedes Sortiment einmal, leere entfallen)."""
+    keys = CUSTOMER_KEYS + ["liefertag"]
+    pat = items.drop_duplicates(keys)[keys + ["tour"]]
+    named = items[items["sortiment"].ne("")].drop_duplicates(keys + ["sortiment"])
+    if named.empty:
+        pat = pat.assign(sortimente=None)
+    else:
+        sortimente = join_groups(named, keys, "sortiment", ", ").rename("sortimente")
+        pat = pat.merge(sortimente.reset_index(), on=keys, how="left")
+    tour = pat["tour"].str.strip()
+    tour = (" (Tour " + tour + ")").where(tour.ne("") & tour.ne("—"), "")
+    pat["day"] = day_index(pat["liefertag"])
+    pat["summary"] = _prop("SUMMARY", _ics_text("Lieferung" + tour + (": " + pat["sortimente"]).fillna("")))
+    return pat
+
+
+def _order_patterns(items: pd.DataFrame) -> pd.DataFrame:
+    """
+    Je Kunde x Bestelltag x Bestellschluss: Wochentag, Uhrzeit (Minuten) und
+    SUMMARY mit Sortimenten und Liefertagen ("Wiesenhof für Mo/Do, Avo für Mi").
+    """
+    items = items.assign(day=day_index(items["bestelltag"]), minutes=clock_minutes(items["bestellschluss"]),
+                         deliver=day_index(items["liefertag"]))
+    items = items[items["day"].notna() & items["minutes"].notna() & items["deliver"].notna()]
+    keys = CUSTOMER_KEYS + ["day", "minutes"]
+    if items.empty:
+        return pd.DataFrame({c: pd.Series(dtype=object) for c in keys + ["summary"]})
+    items = items.assign(label=items["sortiment"].where(items["sortiment"].ne(""), "Lieferung"),
+                         short=np.array(WEEKDAY_SHORT, dtype=object)[items["deliver"].to_numpy(dtype="int64")])
+    items = items.drop_duplicates(keys + ["label", "deliver"])
+    labels = join_groups(items, keys + ["label"], "short", "/").reset_index()
+    labels["ziel"] = labels["label"] + " für " + labels["short"]
+    pat = join_groups(labels, keys, "ziel", ", ").rename("ziele").reset_index()
+    pat["summary"] = _prop("SUMMARY", _ics_text("Bestellschluss: " + pat["ziele"]))
+    return pat
+
+
+def calendar_events(all_data: dict, start, end, alarm_minutes: int = 60, items: pd.DataFrame = None) -> list:
+    """
+    VEVENT-Texte je Kunde als [(Bereich, Kunden-Nr, Name, Text)]: Lieferungen
+    zwischen start und end (ganztägig) und die Bestellschlüsse im selben Zeitraum
+    (Erinnerung alarm_minutes vorher, 0 = ohne); je Kunde chronologisch.
+    """
+    start, span = _span(start, end)
+    items = schedule_frame(all_data) if items is None else items
+    if items.empty:
+        return []
+    ymd = np.array([(start + pd.Timedelta(days=i)).strftime("%Y%m%d") for i in range(span + 2)], dtype=object)
+    stamp = "@sendeplan\r\nDTSTAMP:" + datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ") + "\r\n"
+    alarm = ""
+    if alarm_minutes:
+        alarm = (f"BEGIN:VALARM\r\nACTION:DISPLAY\r\nDESCRIPTION:Bestellschluss\r\n"
+                 f"TRIGGER:-PT{int(alarm_minutes)}M\r\nEND:VALARM\r\n")
+
+    customers = items.drop_duplicates(CUSTOMER_KEYS)[CUSTOMER_KEYS + ["name"]].reset_index(drop=True)
+    customer_id = {key: i for i, key in enumerate(zip(customers["area"], customers["kunden_nr"]))}
+
+    def expand(pat: pd.DataFrame, uid: str, tail: pd.Series) -> pd.DataFrame:
+        """
+        Muster x Termine, eine Zeile je Event: Kunde, Versatz (Tage ab start) und Zeile
+        im Muster, dazu die Textteile EVENT_PARTS ohne zeit/start/ende (setzt der Aufrufer).
+        Die festen Teile stehen einmal je Muster, die Termine setzen nur Datum und Zeit.
+        """
+        row, offset = occurrences(pat["day"].to_numpy(), start, span)
+        cust = np.fromiter((customer_id[k] for k in zip(pat["area"], pat["kunden_nr"])), dtype="int64",
+                           count=len(pat))
+        uids = ("BEGIN:VEVENT\r\nUID:" + uid + "-" + pat["area"] + "-" + pat["kunden_nr"] + "-").to_numpy(dtype=object)
+        return pd.DataFrame({
+            "cust": cust[row],
+            "offset": offset,
+            "row": row,
+            "uid": _objects(uids[row]),
+            "datum": _objects(ymd[offset]),
+            "tail": _objects(tail.to_numpy(dtype=object)[row]),
+        })
+
+    # Lieferungen: ganztägig, DTEND = Folgetag
+    pat = _delivery_patterns(items)
+    deliveries = expand(pat, "lieferung", "\r\n" + pat["summary"] + "TRANSP:TRANSPARENT\r\nEND:VEVENT\r\n")
+    deliveries["sort"] = 0
+    deliveries["zeit"] = _objects("", len(deliveries))
+    deliveries["start"] = _objects(stamp + "DTSTART;VALUE=DATE:", len(deliveries))
+    deliveries["ende"] = _objects("\r\nDTEND;VALUE=DATE:" + ymd[deliveries["offset"].to_numpy() + 1])
+
+    # Bestellschlüsse: 15 Minuten ab Bestellschluss
+    pat = _order_patterns(items)
+    orders = expand(pat, "bestellschluss", "\r\nDURATION:PT15M\r\n" + pat["summary"] + alarm + "END:VEVENT\r\n")
+    minutes = pat["minutes"].to_numpy(dtype="int64")
+    row = orders["row"].to_numpy()
+    orders["sort"] = 1 + minutes[row]
+    orders["zeit"] = orders["ende"] = _objects(
+        np.array([f"T{m // 60:02d}{m % 60:02d}00" for m in minutes], dtype=object)[row])
+    orders["start"] = _objects(stamp + "DTSTART:", len(orders))
+
+    # je Kunde nach Tag (Lieferung vor Bestellschluss, dann Uhrzeit), je Kunde ein join
+    events = pd.concat([deliveries, orders], ignore_index=True)
+    if events.empty:
+        return []
+    order = np.lexsort((events["sort"].to_numpy(), events["offset"].to_numpy(), events["cust"].to_numpy()))
+    cust = events["cust"].to_numpy()[order]
+    parts = [events[c].to_numpy(dtype=object)[order] for c in EVENT_PARTS]
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(cust)) + 1, [len(cust)]]).tolist()
+    area, knr, name = (customers[c].tolist() for c in CUSTOMER_KEYS + ["name"])
+    return [
+        (area[c], knr[c], name[c], "".join(itertools.chain.from_iterable(zip(*(p[lo:hi] for p in parts)))))
+        for c, lo, hi in zip(cust[starts[:-1]].tolist(), starts[:-1], starts[1:])
+    ]
+
+
+def ics_filename(area_key: str, kunden_nr: str) -> str:
+    return f"lieferkalender_{safe_path_part(area_key, 'bereich')}_{safe_path_part(kunden_nr, 'kunde')}.ics"
+
+
+def ics_files(events: list):
+    """(Dateiname, ICS-Bytes) je Kunde zu calendar_events."""
+    titles = pd.Series([f"Lieferkalender {knr} {name or ''}".rstrip() for _, knr, name, _ in events], dtype=object)
+    calnames = _prop("X-WR-CALNAME", _ics_text(titles)) if len(titles) else titles
+    for (area_key, knr, _, body), calname in zip(events, calnames):
+        yield ics_filename(area_key, knr), (ICS_HEADER + calname + body + ICS_FOOTER).encode("utf-8")
+
+
+def write_ics(target, all_data: dict, start, end, alarm_minutes: int = 60, items: pd.DataFrame = None) -> int:
+    """
+    Je Kunde eine ICS-Datei in einen Ordner, ein ZIP (Pfad auf .zip) oder ein
+    Binär-File (als ZIP). Gibt die Anzahl der Dateien zurück.
+    """
+    files = ics_files(calendar_events(all_data, start, end, alarm_minutes, items))
+    count = 0
+    if hasattr(target, "write") or Path(target).suffix.lower() == ".zip":
+        with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            for name, data in files:
+                zf.writestr(name, data)
+                count += 1
+    else:
+        target = Path(target)
+        target.mkdir(parents=True, exist_ok=True)
+        for name, data in files:
+            (target / name).write_bytes(data)
+            count += 1
+    return count
+
+
+def build_ics_zip(all_data: dict, start, end, alarm_minutes: int = 60, items: pd.DataFrame = None) -> tuple:
+    """(ZIP-Bytes, Anzahl Kunden) für Downloads."""
+    buf = io.BytesIO()
+    count = write_ics(buf, all_data, start, end, alarm_minutes, items)
+    return buf.getvalue(), count
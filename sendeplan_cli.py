@@ -0,0 +1,489 @@
+# sendeplan_cli.py
+# -----------------------------------------------------------------------------
+# Headless-Aufruf des Sendeplan Generators (ohne Streamlit), z.B.:
+#   python sendeplan_cli.py build region_a.xlsx region_b.xlsx -o sendeplan.html
+#   python sendeplan_cli.py render sendeplan.json -o sendeplan.html   (ohne pandas)
+#   python sendeplan_cli.py bench-read Sendeplan.xlsx   (Lese-Engines im Vergleich)
+# -----------------------------------------------------------------------------
+
+import argparse
+import base64
+import datetime
+import mimetypes
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from sendeplan_core import (
+    IMPORT_BUDGET_MS,
+    SHEETS,
+    extract_area,
+    load_data_json,
+    load_logo_data_uri,
+    process_workbooks,
+    write_customer_zip,
+    write_data_json,
+    write_html,
+)
+
+
+WORKBOOKS_HELP = "Excel-Dateien oder Ordner/ZIP mit CSV/Parquet je Blatt; bei mehreren wird zusammengeführt"
+
+
+def logo_path_to_data_uri(path: str) -> str:
+    p = Path(path)
+    mime = mimetypes.guess_type(p.name)[0] or "image/png"
+    return f"data:{mime};base64," + base64.b64encode(p.read_bytes()).decode("ascii")
+
+
+def cmd_build(args) -> int:
+    sources = [(Path(p).name, p) for p in args.workbooks]
+    batch = process_workbooks(sources, max_workers=args.workers, engine=args.engine)
+
+    for msg in batch.errors:
+        print(f"FEHLER {msg}", file=sys.stderr)
+    for area_key, knr, sources_ in batch.conflicts:
+        print(f"KONFLIKT {SHEETS[area_key]} Kunde {knr}: {', '.join(sources_)}", file=sys.stderr)
+
+    if args.json:
+        with open(args.json, "wb") as fp:
+            write_data_json(fp, batch.all_data)
+        print(f"Daten: {args.json}")
+    write_outputs(args, batch.all_data)
+    return 1 if batch.errors else 0
+
+
+def cmd_render(args) -> int:
+    with open(args.data, "rb") as fp:
+        all_data = load_data_json(fp)
+    write_outputs(args, all_data)
+    return 0
+
+
+def write_outputs(args, all_data: dict) -> None:
+    """HTML (und optional ZIP) schreiben; gemeinsam für build und render."""
+    logo_uri = logo_path_to_data_uri(args.logo) if args.logo else load_logo_data_uri()
+    variants = None
+    if args.variant:
+        from sendeplan_variants import apply_variants, load_variants
+
+        variants = apply_variants(all_data, [v for path in args.variant for v in load_variants(path)])
+    with open(args.output, "wb") as fp:
+        write_html(fp, all_data, logo_uri, variants)
+    if args.zip:
+        with open(args.zip, "wb") as fp:
+            count = write_customer_zip(fp, all_data, logo_uri, inline_assets=args.zip_inline)
+        print(f"Einzelseiten: {count} Kunden -> {args.zip}")
+    if args.fachberater:
+        from sendeplan_shards import write_shards
+
+        shards = write_shards(args.fachberater, all_data, logo_uri, variants, getattr(args, "workers", None))
+        for fb, name, customers, size in shards:
+            print(f"  {fb}: {customers} Kunden, {size / 1024:.0f} KiB -> {name}")
+        print(f"Viewer je Fachberater: {len(shards)} Dateien -> {args.fachberater}")
+
+    if args.patch:
+        from sendeplan_patch import load_sendeplan, make_patch, patch_counts, write_patch
+
+        base, base_hash = load_sendeplan(args.patch)
+        patch = make_patch(base, all_data, base_hash)
+        output = Path(args.output)
+        patch_path = args.patch_output or output.with_name(output.stem + "_update.json")
+        with open(patch_path, "wb") as fp:
+            size = write_patch(fp, patch)
+        for area_key, (changed, removed) in patch_counts(patch).items():
+            print(f"  {SHEETS.get(area_key, area_key)}: {changed} neu/geändert, {removed} entfernt")
+        print(f"Update: Stand {base_hash[:12]} -> {patch['target'][:12]}, {size / 1024:.0f} KiB -> {patch_path}")
+
+    for area_key, data in all_data.items():
+        print(f"✓ {SHEETS.get(area_key, area_key)}: {len(data)} Kunden")
+    for name, delta in (variants or {}).items():
+        print(f"✓ Variante {name}: {sum(len(d) for d in delta.values())} Kunden geändert")
+    print(f"Geschrieben: {args.output}")
+
+
+def cmd_manifest(args) -> int:
+    from sendeplan_manifest import manifest_html, tour_manifest, write_manifest_csv
+
+    batch = process_workbooks([(Path(p).name, p) for p in args.workbooks], max_workers=args.workers,
+                              engine=args.engine)
+    for msg in batch.errors:
+        print(f"FEHLER {msg}", file=sys.stderr)
+
+    summary, lines = tour_manifest(batch.all_data)
+    if args.html:
+        Path(args.html).write_text(manifest_html(summary, lines), encoding="utf-8")
+        print(f"Geschrieben: {args.html}")
+    if args.csv:
+        write_manifest_csv(lines, args.csv)
+        print(f"Geschrieben: {args.csv}")
+    if args.summary_csv:
+        write_manifest_csv(summary, args.summary_csv)
+        print(f"Geschrieben: {args.summary_csv}")
+    print(f"{len(summary)} Touren, {len(lines)} Kundenstopps")
+    return 1 if batch.errors else 0
+
+
+def cmd_export(args) -> int:
+    from sendeplan_export import export_schedule
+
+    batch = process_workbooks([(Path(p).name, p) for p in args.workbooks], max_workers=args.workers,
+                              engine=args.engine)
+    for msg in batch.errors:
+        print(f"FEHLER {msg}", file=sys.stderr)
+
+    rows = export_schedule(batch.all_data, args.output, args.format)
+    print(f"Geschrieben: {args.output} ({rows} Zeilen)")
+    return 1 if batch.errors else 0
+
+
+def cmd_calendar(args) -> int:
+    """Wochenmuster als Termine über mehrere Wochen: gemeinsame CSV und/oder ICS je Kunde."""
+    from sendeplan_calendar import date_range_weeks, expand_calendar, write_calendar_csv, write_ics
+    from sendeplan_schedule import schedule_frame
+
+    if not (args.csv or args.ics):
+        print("FEHLER: --csv und/oder --ics angeben", file=sys.stderr)
+        return 2
+    batch = process_workbooks([(Path(p).name, p) for p in args.workbooks], max_workers=args.workers,
+                              engine=args.engine)
+    for msg in batch.errors:
+        print(f"FEHLER {msg}", file=sys.stderr)
+
+    start, end = date_range_weeks(args.von or datetime.date.today(), args.wochen)
+    items = schedule_frame(batch.all_data)
+    t0 = time.perf_counter()
+    if args.csv:
+        cal = expand_calendar(batch.all_data, start, end, items)
+        write_calendar_csv(cal, args.csv)
+        print(f"Geschrieben: {args.csv} ({len(cal)} Zeilen)")
+    if args.ics:
+        count = write_ics(args.ics, batch.all_data, start, end, args.erinnerung, items)
+        print(f"Geschrieben: {args.ics} ({count} Kalender)")
+    print(f"Zeitraum {start:%d.%m.%Y}–{end:%d.%m.%Y} in {time.perf_counter() - t0:.1f} s")
+    return 1 if batch.errors else 0
+
+
+def cmd_cutoffs(args) -> int:
+    """Kunden/Sortimente mit Bestellschluss im Zeitfenster, aus einer Sendeplan-HTML oder build --json."""
+    from sendeplan_core import AREA_NAMES
+    from sendeplan_cutoffs import build_cutoff_index, read_sendeplan_html
+
+    if args.source.lower().endswith(".json"):
+        with open(args.source, "rb") as fp:
+            all_data = load_data_json(fp)
+        index = build_cutoff_index(all_data)
+    else:
+        all_data, index = read_sendeplan_html(Path(args.source).read_bytes())
+
+    rows = index.rows(all_data, index.window(args.tag, args.von, args.bis))
+    if args.csv:
+        import csv
+
+        with open(args.csv, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["bestellschluss"], delimiter=";")
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Geschrieben: {args.csv}")
+    else:
+        for r in rows:
+            print(f"{r['bestellschluss']}  {AREA_NAMES.get(r['area'], r['area']):<13} {r['kunden_nr']:>6} "
+                  f"{r['name'][:30]:<30} {r['sortiment']} (Lieferung {r['liefertag']})")
+    print(f"{len(rows)} Positionen mit Bestellschluss {args.tag} {args.von}–{args.bis}", file=sys.stderr)
+    return 0
+
+
+def cmd_serve(args) -> int:
+    from sendeplan_server import make_server
+
+    logo_uri = logo_path_to_data_uri(args.logo) if args.logo else None
+    server = make_server(args.workbook, args.host, args.port, logo_uri)
+    if args.reload_interval > 0:
+        server.service.watch(args.reload_interval)
+    print(f"Sendeplan-Dienst auf http://{args.host}:{args.port}/ (Datei: {args.workbook})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def cmd_convert(args) -> int:
+    from sendeplan_readers import export_sheets
+
+    count = export_sheets(args.workbook, args.output, list(SHEETS.values()), args.format, args.engine)
+    print(f"Geschrieben: {args.output} ({count} Blätter als {args.format})")
+    return 0
+
+
+def cmd_bench_read(args) -> int:
+    """
+    Liest alle Blätter mit jeder verfügbaren Engine (Bestwert aus --runs) und
+    prüft, dass extract_area überall dasselbe Ergebnis liefert. Exit 1 bei Abweichung.
+    """
+    import tempfile
+
+    from sendeplan_readers import available_engines, export_sheets, open_source
+
+    def read_all(src, engine=None):
+        source = open_source(src, engine)
+        return {area_key: source.parse(sheet_name) for area_key, sheet_name in SHEETS.items()}
+
+    data = Path(args.workbook).read_bytes()
+    with tempfile.TemporaryDirectory() as tmp:
+        # openpyxl (Standard von pandas) zuerst: Referenz für Ergebnis und Faktor
+        candidates = [(engine, data, engine) for engine in reversed(available_engines())]
+        for fmt in ("csv", "parquet"):
+            target = Path(tmp) / f"blaetter_{fmt}.zip"
+            export_sheets(data, target, list(SHEETS.values()), fmt)
+            candidates.append((f"{fmt} (ZIP)", target.read_bytes(), None))
+
+        reference, ok = None, True
+        for label, src, engine in candidates:
+            times = []
+            for _ in range(args.runs):
+                t = time.perf_counter()
+                frames = read_all(src, engine)
+                times.append(time.perf_counter() - t)
+            result = {k: extract_area(df) for k, df in frames.items()}
+            if reference is None:
+                reference, base = result, min(times)
+            same = result == reference
+            ok = ok and same
+            print(f"{label:<14} {min(times) * 1000:8.1f} ms  x{base / min(times):5.1f}  "
+                  f"{'gleich' if same else 'ABWEICHUNG'}")
+    return 0 if ok else 1
+
+
+def cmd_colstats(args) -> int:
+    """Spaltenstatistik je Blatt (befüllt, verschiedene Werte, Zeit); leere Spalten liest die Extraktion nicht."""
+    from sendeplan_core import column_stats_table, iter_workbook
+
+    for area_key, sheet_name, _, plan, error in iter_workbook(args.workbook, engine=args.engine, detail_stats=True):
+        if error is not None:
+            print(f"FEHLER {sheet_name}: {error}", file=sys.stderr)
+            continue
+        rows = column_stats_table(plan.stats)
+        skipped = sum(1 for s in plan.stats if s.skipped)
+        print(f"{sheet_name}: {len(rows)} Spalten, {skipped} leer übersprungen, "
+              f"Normalisierung {sum(s.seconds for s in plan.stats) * 1000:.1f} ms")
+        if args.empty:
+            rows = [r for r in rows if r["übersprungen"]]
+        for r in rows:
+            print(f"  {r['Spalte'][:40]:<40} {r['Art']:<17} {r['befüllt']:>6} {r['Anteil']:>5} "
+                  f"{r['verschiedene']:>6} {r['Zeit (ms)']:>8} {r['übersprungen']}")
+    return 0
+
+
+def cmd_watch(args) -> int:
+    from sendeplan_watch import FolderWatcher
+
+    watcher = FolderWatcher(
+        args.folder, args.out_dir,
+        logo_uri=logo_path_to_data_uri(args.logo) if args.logo else None,
+        zip_pages=args.zip, zip_inline=args.zip_inline, json_data=args.json,
+        exports=args.export, manifest=args.manifest, engine=args.engine, interval=args.interval,
+    )
+    try:
+        watcher.run(once=args.once)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_equivalence(args) -> int:
+    """
+    Schnelle Extraktionspfade gegen die Referenz (iterrows) auf synthetischen und
+    angegebenen Excel-Dateien; Exit 1 bei Abweichungen oder Fehlern.
+    """
+    from sendeplan_equivalence import compare_paths, format_report, synthetic_workbook
+
+    cases = [(f"synthetisch (seed {seed}, {args.kunden} Kunden je Blatt)", lambda seed=seed: synthetic_workbook(
+        args.kunden, seed)) for seed in range(args.seed, args.seed + args.synthetic)]
+    cases += [(p, lambda p=p: Path(p).read_bytes()) for p in args.workbooks]
+
+    ok = True
+    for title, load in cases:
+        try:
+            result = compare_paths(load(), args.path or None, runs=args.runs)
+        except ValueError as e:
+            print(f"FEHLER {title}: {e}", file=sys.stderr)
+            ok = False
+            continue
+        print(format_report(title, *result, max_diffs=args.max_diffs))
+        ok = ok and all(r.ok for r in result[3])
+    print("Alle Pfade gleich der Referenz" if ok else "Abweichungen oder Fehler gefunden", file=sys.stderr)
+    return 0 if ok else 1
+
+
+def cmd_importtime(args) -> int:
+    """
+    Misst `import <modul>` in frischen Interpretern (Bestwert aus --runs) und prüft,
+    dass pandas dabei nicht geladen wird. Exit 1 bei Überschreitung des Budgets.
+    """
+    probe = (
+        "import sys, time\n"
+        "t = time.perf_counter()\n"
+        f"import {args.module}\n"
+        "print((time.perf_counter() - t) * 1000, 'pandas' in sys.modules)\n"
+    )
+    here = str(Path(__file__).resolve().parent)
+    times = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, "-c", probe], cwd=here, capture_output=True, text=True, check=True)
+        ms, pandas_loaded = out.stdout.split()
+        times.append(float(ms))
+    best = min(times)
+    print(f"import {args.module}: {best:.1f} ms (Budget {args.budget} ms, {args.runs} Läufe)")
+    ok = best <= args.budget
+    if pandas_loaded == "True":
+        print(f"FEHLER {args.module} lädt pandas beim Import", file=sys.stderr)
+        ok = False
+    return 0 if ok else 1
+
+
+def _add_output_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("-o", "--output", default="sendeplan_4_bereiche.html")
+    p.add_argument("--logo", help="Logo-Datei (PNG/JPG/SVG)")
+    p.add_argument("--zip", help="zusätzlich Einzelseiten je Kunde als ZIP schreiben")
+    p.add_argument("--zip-inline", action="store_true", help="CSS und Logo in jede Einzelseite einbetten")
+    p.add_argument("--fachberater", metavar="ZIEL",
+                   help="zusätzlich je Fachberater einen eigenen Viewer schreiben (Ordner oder .zip)")
+    p.add_argument("--variant", action="append", default=[],
+                   help="Planvarianten als JSON (Overlay auf den Standardplan, im Viewer wählbar); mehrfach möglich")
+    p.add_argument("--patch", metavar="BASIS",
+                   help="zusätzlich ein Update gegenüber einer verteilten Sendeplan-HTML (oder JSON) schreiben")
+    p.add_argument("--patch-output", help="Datei für das Update (Standard: <output>_update.json)")
+
+
+def _add_engine_arg(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--engine", choices=["auto", "calamine", "openpyxl"], default=None,
+                   help="Excel-Engine (Standard: SENDEPLAN_EXCEL_ENGINE bzw. calamine, falls installiert)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Sendeplan Generator (headless)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("build", help="Excel-Datei(en) verarbeiten und Sendeplan-HTML schreiben")
+    p.add_argument("workbooks", nargs="+", help=WORKBOOKS_HELP)
+    _add_output_args(p)
+    p.add_argument("--workers", type=int, default=None, help="Anzahl paralleler Prozesse")
+    _add_engine_arg(p)
+    p.add_argument("--json", help="extrahierte Daten zusätzlich als JSON schreiben (für render)")
+    p.set_defaults(func=cmd_build)
+
+    p = sub.add_parser("render", help="Sendeplan-HTML aus zuvor geschriebenem JSON erzeugen (ohne Excel/pandas)")
+    p.add_argument("data", help="JSON aus build --json")
+    _add_output_args(p)
+    p.set_defaults(func=cmd_render)
+
+    p = sub.add_parser("manifest", help="Tour-Manifeste je Liefertag als HTML/CSV schreiben")
+    p.add_argument("workbooks", nargs="+", help=WORKBOOKS_HELP)
+    p.add_argument("--html", default="tour_manifeste.html", help="druckbare HTML-Ausgabe")
+    p.add_argument("--csv", help="CSV je Kunde und Tour")
+    p.add_argument("--summary-csv", help="CSV je Tour (Zusammenfassung)")
+    p.add_argument("--workers", type=int, default=None, help="Anzahl paralleler Prozesse")
+    _add_engine_arg(p)
+    p.set_defaults(func=cmd_manifest)
+
+    p = sub.add_parser("export", help="Langformat als CSV, Parquet oder SQLite exportieren")
+    p.add_argument("workbooks", nargs="+", help=WORKBOOKS_HELP)
+    p.add_argument("-o", "--output", required=True, help="Zieldatei (.csv, .parquet, .sqlite/.db)")
+    p.add_argument("--format", choices=["csv", "parquet", "sqlite"], help="sonst aus der Dateiendung")
+    p.add_argument("--workers", type=int, default=None, help="Anzahl paralleler Prozesse")
+    _add_engine_arg(p)
+    p.set_defaults(func=cmd_export)
+
+    p = sub.add_parser("calendar", help="Lieferkalender über mehrere Wochen als CSV und/oder ICS je Kunde")
+    p.add_argument("workbooks", nargs="+", help=WORKBOOKS_HELP)
+    p.add_argument("--von", help="erster Tag (JJJJ-MM-TT, Standard: heute)")
+    p.add_argument("--wochen", type=int, default=12, help="Anzahl Wochen ab --von")
+    p.add_argument("--csv", help="alle Termine als eine CSV")
+    p.add_argument("--ics", help="ICS je Kunde in einen Ordner oder ein .zip")
+    p.add_argument("--erinnerung", type=int, default=60, metavar="MINUTEN",
+                   help="Erinnerung vor dem Bestellschluss (0 = ohne)")
+    p.add_argument("--workers", type=int, default=None, help="Anzahl paralleler Prozesse")
+    _add_engine_arg(p)
+    p.set_defaults(func=cmd_calendar)
+
+    p = sub.add_parser("cutoffs", help="Wer muss im Zeitfenster bestellen? (Bestellschluss-Index)")
+    p.add_argument("source", help="Sendeplan-HTML (mit eingebettetem Index) oder JSON aus build --json")
+    p.add_argument("--tag", required=True, help="Bestelltag, z.B. Dienstag oder Di")
+    p.add_argument("--von", default="00:00")
+    p.add_argument("--bis", default="23:59")
+    p.add_argument("--csv", help="Treffer als CSV schreiben statt ausgeben")
+    p.set_defaults(func=cmd_cutoffs)
+
+    p = sub.add_parser("serve", help="Lokalen HTTP-Dienst für einzelne Kundenpläne starten")
+    p.add_argument("workbook", help="Excel-Datei (wird bei Änderung neu eingelesen)")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8765)
+    p.add_argument("--logo", help="Logo-Datei (PNG/JPG/SVG)")
+    p.add_argument("--reload-interval", type=float, default=5.0,
+                   help="Sekunden zwischen Prüfungen auf eine neue Datei (0 = aus)")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("convert", help="Blätter einer Excel-Datei je als CSV/Parquet exportieren")
+    p.add_argument("workbook", help="Excel-Datei")
+    p.add_argument("-o", "--output", required=True, help="Zielordner oder .zip")
+    p.add_argument("--format", choices=["csv", "parquet"], default="parquet")
+    _add_engine_arg(p)
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser("bench-read", help="Lese-Engines (calamine, openpyxl, CSV, Parquet) vergleichen")
+    p.add_argument("workbook", help="Excel-Datei")
+    p.add_argument("--runs", type=int, default=3)
+    p.set_defaults(func=cmd_bench_read)
+
+    p = sub.add_parser("colstats", help="Spaltenstatistik je Blatt (Trefferquote, Zeit, leere Spalten)")
+    p.add_argument("workbook", help="Excel-Datei oder Ordner/ZIP mit CSV/Parquet je Blatt")
+    p.add_argument("--empty", action="store_true", help="nur durchgehend leere (übersprungene) Spalten zeigen")
+    _add_engine_arg(p)
+    p.set_defaults(func=cmd_colstats)
+
+    p = sub.add_parser("watch", help="Ordner überwachen und Ausgaben bei neuer/geänderter Excel-Datei erzeugen")
+    p.add_argument("folder", help="Ordner, in den die Excel-Dateien exportiert werden")
+    p.add_argument("-o", "--out-dir", help="Zielordner (Standard: <Ordner>/sendeplan)")
+    p.add_argument("--interval", type=float, default=5.0, help="Sekunden zwischen zwei Prüfungen")
+    p.add_argument("--logo", help="Logo-Datei (PNG/JPG/SVG)")
+    p.add_argument("--zip", action="store_true", help="zusätzlich Einzelseiten je Kunde als ZIP")
+    p.add_argument("--zip-inline", action="store_true", help="CSS und Logo in jede Einzelseite einbetten")
+    p.add_argument("--json", action="store_true", help="zusätzlich die Daten als JSON (für render)")
+    p.add_argument("--export", action="append", default=[], choices=["csv", "parquet", "sqlite"],
+                   help="Langformat-Export (mehrfach möglich)")
+    p.add_argument("--manifest", action="store_true", help="zusätzlich Tour-Manifeste (HTML/CSV)")
+    p.add_argument("--once", action="store_true", help="einmal prüfen, Ausstehendes erzeugen und beenden")
+    _add_engine_arg(p)
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser("equivalence", help="Extraktionspfade gegen die Referenz (iterrows) vergleichen")
+    p.add_argument("workbooks", nargs="*", help="aufgezeichnete Excel-Dateien")
+    p.add_argument("--synthetic", type=int, default=1, metavar="N", help="Anzahl synthetischer Dateien (0 = keine)")
+    p.add_argument("--kunden", type=int, default=300, help="Kunden je Blatt der synthetischen Dateien")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--path", action="append", default=[],
+                   help="nur diese Pfade prüfen (calamine, openpyxl, csv, parquet, jobs; mehrfach möglich)")
+    p.add_argument("--runs", type=int, default=1, help="Läufe je Pfad (Bestwert zählt)")
+    p.add_argument("--max-diffs", type=int, default=10, help="angezeigte Abweichungen je Pfad")
+    p.set_defaults(func=cmd_equivalence)
+
+    p = sub.add_parser("importtime", help="Importzeit des Kerns gegen das Budget prüfen")
+    p.add_argument("--module", default="sendeplan_core")
+    p.add_argument("--budget", type=float, default=IMPORT_BUDGET_MS, help="Budget in ms")
+    p.add_argument("--runs", type=int, default=5)
+    p.set_defaults(func=cmd_importtime)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
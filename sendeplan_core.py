@@ -0,0 +1,1357 @@
+# sendeplan_core.py
+# -----------------------------------------------------------------------------
+# Kernlogik des Sendeplan Generators (ohne Streamlit):
+# Spaltenerkennung, Extraktion je Blatt, HTML-Ausgabe.
+# Wird von quelldrucksendezeiten.py (UI) und sendeplan_cli.py (headless) genutzt.
+# -----------------------------------------------------------------------------
+
+import json
+import re
+import datetime
+import base64
+import functools
+import hashlib
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+# pandas (und openpyxl) erst bei Bedarf laden: Rendern aus JSON, Server-Antworten usw.
+# kommen ohne aus. Geprüft mit `python sendeplan_cli.py importtime`.
+if TYPE_CHECKING:
+    import pandas as pd
+
+IMPORT_BUDGET_MS = 100  # Obergrenze für `import sendeplan_core` in einem frischen Interpreter
+
+try:  # optional: schnellerer JSON-Encoder
+    import orjson
+except ImportError:
+    orjson = None
+
+# Grundkonfiguration
+PLAN_TYP = "Standard"
+BEREICH = "Alle Sortimente Fleischwerk"
+DAYS_DE = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag"]
+
+# Mapping für Excel-Kürzel
+DAY_SHORT_TO_DE = {
+    "Mo": "Montag", "Di": "Dienstag", "Die": "Dienstag",
+    "Mi": "Mittwoch", "Mit": "Mittwoch", "Mitt": "Mittwoch",
+    "Do": "Donnerstag", "Don": "Donnerstag", "Donn": "Donnerstag",
+    "Fr": "Freitag", "Sa": "Samstag", "Sam": "Samstag",
+}
+
+# Wochentag -> Index (Mo=0 ... So=6), inkl. Excel-Kürzel
+DAY_INDEX = {d: i for i, d in enumerate(DAYS_DE + ["Sonntag"])}
+DAY_INDEX.update({short: DAY_INDEX[de] for short, de in DAY_SHORT_TO_DE.items()})
+DAY_INDEX.update({"So": 6, "Son": 6})
+
+# Uhrzeit am Anfang eines Texts, z.B. "10:00 Uhr" (normalize_time) oder "09:30:00"
+RX_CLOCK = re.compile(r"\s*(\d{1,2}):(\d{2})")
+
+# Reihenfolge der Sortimente innerhalb eines Tages (Prio)
+SORT_PRIO = {"21": 0, "1011": 1, "22": 2, "41": 3, "65": 4, "0": 5, "91": 6}
+
+# Bereich -> Blattname in der Excel-Datei
+SHEETS = {
+    'direkt': 'Direkt 1 - 99',
+    'mk': 'Hupa MK 882',
+    'nms': 'Hupa 2221-4444',
+    'malchow': 'Hupa 7773-7779'
+}
+
+TOUR_COLS = {
+    "Montag": "Mo",
+    "Dienstag": "Die",
+    "Mittwoch": "Mitt",
+    "Donnerstag": "Don",
+    "Freitag": "Fr",
+    "Samstag": "Sam",
+}
+_TOUR_COL_NAMES = frozenset(TOUR_COLS.values())
+
+
+# Spaltenmuster der Kopfzeile (gemeinsam für detect_* und plan_columns)
+_DAY_RX = r"(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)"
+RX_BSPALTE = re.compile(
+    r"^" + _DAY_RX + r"\s+(?:(Z|L)\s+)?(.+?)\s+B[_ ]\s*" + _DAY_RX + r"$",
+    re.IGNORECASE
+)
+RX_BSPALTE_OHNE_B = re.compile(
+    r"^" + _DAY_RX + r"\s+(Z|L)\s+(.+?)\s+" + _DAY_RX + r"$",
+    re.IGNORECASE
+)
+RX_HAS_B = re.compile(r"\sB[_ ]\s*", re.IGNORECASE)
+RX_TRIPLET = re.compile(
+    r"^" + _DAY_RX + r"\s+(.+?)\s+"
+    r"(Zeit|Zeitende|Bestellzeitende|Uhrzeit|Sort|Sortiment|Tag|Bestelltag)$",
+    re.IGNORECASE
+)
+RX_DS_TRIPLET = re.compile(
+    r"^DS\s+(.+?)\s+zu\s+" + _DAY_RX + r"\s+(Zeit|Sort|Tag)$",
+    re.IGNORECASE
+)
+
+# Stammdaten-Spalten (werden direkt per Name gelesen)
+STAMM_COLS = ("Nr", "Name", "Strasse", "Plz", "Ort", "Fachberater")
+
+
+def norm(x) -> str:
+    if x is None:
+        return ""
+    if isinstance(x, float) and x != x:  # NaN
+        return ""
+    s = str(x).replace("\u00a0", " ").strip()
+    s = re.sub(r"\s+", " ", s)
+    if re.fullmatch(r"\d+\.0", s):
+        s = s[:-2]
+    return s
+
+
+def _is_timestamp(x) -> bool:
+    # pd.Timestamp kann nur existieren, wenn pandas bereits geladen ist
+    pd = sys.modules.get("pandas")
+    return pd is not None and isinstance(x, pd.Timestamp)
+
+
+def normalize_time(s) -> str:
+    if isinstance(s, datetime.time) or _is_timestamp(s):
+        return s.strftime("%H:%M") + " Uhr"
+    s = norm(s)
+    if not s:
+        return ""
+    if re.fullmatch(r"\d{1,2}:\d{2}", s):
+        return s + " Uhr"
+    if re.fullmatch(r"\d{1,2}", s):
+        return s.zfill(2) + ":00 Uhr"
+    return s
+
+
+def day_to_index(tag) -> Optional[int]:
+    """Bestelltag wie in der Tabelle ('Dienstag', ' di ', 'Mitt.', 'DONNERSTAG') -> 0..6, None wenn kein Tag."""
+    s = norm(tag).rstrip(".")
+    day = DAY_INDEX.get(s)
+    return day if day is not None else DAY_INDEX.get(s.capitalize())
+
+
+def clock_to_minutes(s) -> Optional[int]:
+    """'10:00 Uhr' / '09:30:00' -> Minuten seit Mitternacht, None wenn keine Uhrzeit."""
+    m = RX_CLOCK.match(str(s))
+    if not m or int(m.group(1)) > 23 or int(m.group(2)) > 59:
+        return None
+    return int(m.group(1)) * 60 + int(m.group(2))
+
+
+def safe_time(val) -> str:
+    """
+    verhindert Fälle wie "Montag Montag" (Tag landet fälschlich in Zeit)
+    """
+    raw = norm(val)
+    if re.fullmatch(r"(Montag|Dienstag|Mittwoch|Donnerstag|Freitag|Samstag)", raw):
+        return ""
+    return normalize_time(val)
+
+
+@functools.lru_cache(maxsize=4096)  # wenige verschiedene Bezeichnungen, sehr viele Zellen
+def canon_group_id(label: str) -> str:
+    """
+    Mapped Sortimentsbezeichnungen robust auf interne IDs.
+    WICHTIG: Spezifischere Regeln MÜSSEN vor allgemeineren kommen!
+    """
+    s = norm(label).lower()
+
+    # harte Treffer (Zahlen)
+    m = re.search(r"\b(1011|21|41|65|0|91|22)\b", s)
+    if m:
+        return m.group(1)
+
+    # Bio-Geflügel (41)
+    if "bio" in s and "geflügel" in s:
+        return "41"
+
+    # Wiesenhof/Geflügel (1011)
+    if "wiesenhof" in s:
+        return "1011"
+    if "geflügel" in s:
+        return "1011"
+
+    # Frischfleisch (65)
+    if "frischfleisch" in s or "veredlung" in s or "schwein" in s or "pök" in s:
+        return "65"
+
+    # Fleisch/Wurst (21)
+    if "fleisch" in s or "wurst" in s or "heidemark" in s:
+        return "21"
+
+    # Avo-Gewürze (0)
+    if "avo" in s or "gewürz" in s:
+        return "0"
+
+    # Werbemittel (91)
+    if "werbe" in s or "werbemittel" in s:
+        return "91"
+
+    # Pfeiffer etc. (22)
+    if "pfeiffer" in s or "gmyrek" in s or "siebert" in s or "bard" in s or "mago" in s:
+        return "22"
+
+    return "?"
+
+
+def detect_bspalten(columns: List[str]):
+    """
+    Erkennung für Spalten wie:
+    "Mo Z Wiesenhof B_Di" / "Mo L Bio B_Mi" / "Mo Wiesenhof B_Di" etc.
+    UND auch Spalten OHNE "B": "Mit Z 41 Mo" (nur Tag ZL Gruppe Tag)
+    """
+    rx_b = RX_BSPALTE
+    rx_no_b = RX_BSPALTE_OHNE_B
+
+    mapping = {}
+
+    # Phase 1: ohne B
+    for c in columns:
+        if RX_HAS_B.search(c):
+            continue
+
+        m = rx_no_b.match(c.strip())
+        if m:
+            day_de = DAY_SHORT_TO_DE.get(m.group(1))
+            zl = m.group(2).upper()
+            group_text = m.group(3).strip()
+            bestell_de_from_name = DAY_SHORT_TO_DE.get(m.group(4))
+
+            if day_de and bestell_de_from_name:
+                key = (day_de, group_text, bestell_de_from_name)
+                mapping.setdefault(key, {})
+                if zl == "Z":
+                    mapping[key]["zeit"] = c
+                elif zl == "L":
+                    mapping[key]["l"] = c
+
+    # Phase 2: mit B
+    for c in columns:
+        m = rx_b.match(c.strip())
+        if m:
+            day_de = DAY_SHORT_TO_DE.get(m.group(1))
+            zl = (m.group(2) or "").upper()
+            group_text = m.group(3).strip()
+            bestell_de_from_name = DAY_SHORT_TO_DE.get(m.group(4))
+
+            if day_de and bestell_de_from_name:
+                key = (day_de, group_text, bestell_de_from_name)
+                mapping.setdefault(key, {})
+                if zl == "Z":
+                    if "zeit" not in mapping[key]:
+                        mapping[key]["zeit"] = c
+                elif zl == "L":
+                    if "l" not in mapping[key]:
+                        mapping[key]["l"] = c
+                else:
+                    mapping[key]["sort"] = c
+                    mapping[key]["group_text"] = group_text
+
+    return mapping
+
+
+def detect_triplets(columns: List[str]):
+    rx = RX_TRIPLET
+    found = {}
+    for c in columns:
+        m = rx.match(c.strip())
+        if not m:
+            continue
+
+        day_de = DAY_SHORT_TO_DE.get(m.group(1))
+        if not day_de:
+            continue
+
+        group_text = m.group(2).strip()
+
+        end_key = m.group(3).lower()
+        if end_key in ("sort", "sortiment"):
+            key = "Sort"
+        elif end_key in ("tag", "bestelltag"):
+            key = "Tag"
+        else:
+            key = "Zeit"
+
+        found.setdefault(day_de, {}).setdefault(group_text, {})[key] = c
+
+    return found
+
+
+def detect_ds_triplets(columns: List[str]):
+    rx = RX_DS_TRIPLET
+    tmp = {}
+    for c in columns:
+        m = rx.match(c.strip())
+        if not m:
+            continue
+
+        day_de = DAY_SHORT_TO_DE.get(m.group(2))
+        if day_de:
+            key = f"DS {m.group(1)} zu {m.group(2)}"
+            tmp.setdefault(day_de, {}).setdefault(key, {})[m.group(3).capitalize()] = c
+    return tmp
+
+
+# Version des Spaltenplans; erhöhen, wenn sich die Erkennung ändert (invalidiert den Cache)
+HEADER_PLAN_VERSION = 1
+
+_HEADER_PLANS = {}
+
+
+def header_cache_dir() -> Path:
+    """Cache-Ordner für Spaltenpläne und -statistiken: SENDEPLAN_CACHE_DIR, sonst ~/.cache/sendeplan."""
+    return Path(os.environ.get("SENDEPLAN_CACHE_DIR") or Path.home() / ".cache" / "sendeplan")
+
+
+class HeaderPlan:
+    """
+    Ergebnis der Kopfzeilen-Erkennung eines Blatts:
+    trip / bmap / ds_trip wie detect_triplets / detect_bspalten / detect_ds_triplets,
+    tours = Liefertag -> Tour-Spalte, unmatched = nicht zugeordnete Spalten.
+    stats = Spaltenstatistik des Blatts (nur bei auf ein Blatt zugeschnittenen Plänen, s. sheet_plan).
+    """
+    __slots__ = ("trip", "bmap", "ds_trip", "tours", "unmatched", "stats")
+
+    def __init__(self, trip, bmap, ds_trip, tours, unmatched, stats=None):
+        self.trip = trip
+        self.bmap = bmap
+        self.ds_trip = ds_trip
+        self.tours = tours
+        self.unmatched = unmatched
+        self.stats = stats
+
+    def to_dict(self) -> dict:
+        return {
+            "trip": self.trip,
+            "bmap": [[list(k), v] for k, v in self.bmap.items()],
+            "ds_trip": self.ds_trip,
+            "tours": self.tours,
+            "unmatched": [str(c) for c in self.unmatched],  # auch Datums-/Zahl-Überschriften
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "HeaderPlan":
+        return cls(
+            trip=d["trip"],
+            bmap={tuple(k): v for k, v in d["bmap"]},
+            ds_trip=d["ds_trip"],
+            tours=d["tours"],
+            unmatched=d["unmatched"],
+        )
+
+
+def classify_column(c) -> tuple:
+    """
+    Ordnet eine Spaltenüberschrift genau einer Art zu:
+    ("triplet"|"b"|"no_b"|"ds"|"tour"|"stamm"|"unmatched", match oder None).
+    """
+    if not isinstance(c, str):
+        return "unmatched", None
+    if c in STAMM_COLS:
+        return "stamm", None
+    if c in _TOUR_COL_NAMES:
+        return "tour", None
+    cs = c.strip()
+    if cs[:2].upper() == "DS":
+        m = RX_DS_TRIPLET.match(cs)
+        if m:
+            return "ds", m
+    m = RX_TRIPLET.match(cs)
+    if m:
+        return "triplet", m
+    if RX_HAS_B.search(c):
+        m = RX_BSPALTE.match(cs)
+        if m:
+            return "b", m
+    else:
+        m = RX_BSPALTE_OHNE_B.match(cs)
+        if m:
+            return "no_b", m
+    return "unmatched", None
+
+
+def plan_columns(columns: List[str]) -> HeaderPlan:
+    """
+    Erkennt alle Spalten in einem Durchlauf. Liefert dieselben Zuordnungen wie
+    detect_triplets / detect_bspalten / detect_ds_triplets (inkl. Reihenfolge):
+    Z/L-Spalten ohne "B" haben Vorrang vor Z/L-Spalten mit "B".
+    """
+    trip, ds_trip, tours = {}, {}, {}
+    unmatched = []
+    no_b_hits, b_hits = [], []
+
+    for c in columns:
+        kind, m = classify_column(c)
+        if kind == "triplet":
+            day_de = DAY_SHORT_TO_DE.get(m.group(1))
+            if not day_de:
+                unmatched.append(c)
+                continue
+            end_key = m.group(3).lower()
+            if end_key in ("sort", "sortiment"):
+                key = "Sort"
+            elif end_key in ("tag", "bestelltag"):
+                key = "Tag"
+            else:
+                key = "Zeit"
+            trip.setdefault(day_de, {}).setdefault(m.group(2).strip(), {})[key] = c
+        elif kind == "ds":
+            day_de = DAY_SHORT_TO_DE.get(m.group(2))
+            if not day_de:
+                unmatched.append(c)
+                continue
+            key = f"DS {m.group(1)} zu {m.group(2)}"
+            ds_trip.setdefault(day_de, {}).setdefault(key, {})[m.group(3).capitalize()] = c
+        elif kind in ("b", "no_b"):
+            day_de = DAY_SHORT_TO_DE.get(m.group(1))
+            bestell_de = DAY_SHORT_TO_DE.get(m.group(4))
+            if not (day_de and bestell_de):
+                unmatched.append(c)
+                continue
+            hit = ((day_de, m.group(3).strip(), bestell_de), (m.group(2) or "").upper(), c)
+            (b_hits if kind == "b" else no_b_hits).append(hit)
+        elif kind == "tour":
+            for d_de, col in TOUR_COLS.items():
+                if col == c:
+                    tours[d_de] = c
+        elif kind == "unmatched":
+            unmatched.append(c)
+
+    bmap = {}
+    for key, zl, c in no_b_hits:
+        f = bmap.setdefault(key, {})
+        if zl == "Z":
+            f["zeit"] = c
+        else:
+            f["l"] = c
+    for key, zl, c in b_hits:
+        f = bmap.setdefault(key, {})
+        if zl == "Z":
+            f.setdefault("zeit", c)
+        elif zl == "L":
+            f.setdefault("l", c)
+        else:
+            f["sort"] = c
+            f["group_text"] = key[1]
+
+    return HeaderPlan(trip, bmap, ds_trip, tours, unmatched)
+
+
+def header_fingerprint(columns: List[str]) -> str:
+    raw = json.dumps([HEADER_PLAN_VERSION, [str(c) for c in columns]], ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def header_plan(columns: List[str]) -> HeaderPlan:
+    """
+    Spaltenplan mit Cache: erst im Speicher, dann unter header_cache_dir()
+    (Schlüssel = Fingerprint der Spaltenliste). Gleiche Layouts überspringen die Erkennung.
+    """
+    fp = header_fingerprint(columns)
+    plan = _HEADER_PLANS.get(fp)
+    if plan is not None:
+        return plan
+
+    path = header_cache_dir() / f"header_{fp}.json"
+    try:
+        plan = HeaderPlan.from_dict(json.loads(path.read_text(encoding="utf-8")))
+    except Exception:
+        plan = plan_columns(columns)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(plan.to_dict(), ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError):
+            pass  # Cache ist optional (z.B. schreibgeschütztes Verzeichnis, nicht serialisierbarer Plan)
+
+    _HEADER_PLANS[fp] = plan
+    return plan
+
+
+# --- Spaltenstatistik und Ausdünnen leerer Spalten ---
+
+# Feld im Spaltenplan -> (Anzeige-Art, Normalisierung wie in extract_area)
+_FIELD_KINDS = {
+    "Sort": ("Triplet Sortiment", norm), "Zeit": ("Triplet Zeit", safe_time), "Tag": ("Triplet Tag", norm),
+    "sort": ("B Sortiment", norm), "zeit": ("B Zeit", safe_time), "l": ("B Liefertag", norm),
+}
+_DS_KINDS = {"Sort": ("DS Sortiment", norm), "Zeit": ("DS Zeit", safe_time), "Tag": ("DS Tag", norm)}
+
+
+class ColumnStat:
+    """
+    Trefferquote einer Spalte in einem Blatt: non_empty = befüllte Zellen;
+    distinct und seconds (Normalisierung aller Werte) nur bei detail=True, sonst None.
+    """
+    __slots__ = ("column", "kind", "rows", "non_empty", "distinct", "seconds")
+
+    def __init__(self, column, kind, rows, non_empty, distinct=None, seconds=None):
+        self.column = column
+        self.kind = kind
+        self.rows = rows
+        self.non_empty = non_empty
+        self.distinct = distinct
+        self.seconds = seconds
+
+    @property
+    def skipped(self) -> bool:
+        """Durchgehend leere Bestell-Spalte: entfällt aus dem Plan (Stamm-/Tourspalten bleiben)."""
+        return not self.non_empty and self.kind not in ("Stamm", "Tour")
+
+    def to_dict(self) -> dict:
+        return {a: getattr(self, a) for a in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "ColumnStat":
+        return cls(**{a: d.get(a) for a in cls.__slots__})
+
+
+def plan_fields(plan: HeaderPlan):
+    """(Spalte, Art, Normalisierung) aller Spalten, die extract_area je Zeile liest."""
+    for c in STAMM_COLS:
+        yield c, "Stamm", norm
+    for d_de in DAYS_DE:
+        yield TOUR_COLS[d_de], "Tour", norm
+    for groups in plan.trip.values():
+        for f in groups.values():
+            for key, c in f.items():
+                yield (c,) + _FIELD_KINDS[key]
+    for f in plan.bmap.values():
+        for key in ("sort", "zeit", "l"):
+            if f.get(key):
+                yield (f[key],) + _FIELD_KINDS[key]
+    for groups in plan.ds_trip.values():
+        for f in groups.values():
+            for key, c in f.items():
+                yield (c,) + _DS_KINDS[key]
+
+
+def column_stats(df: "pd.DataFrame", plan: HeaderPlan, detail: bool = False) -> List[ColumnStat]:
+    """
+    Statistik je gelesener Spalte. Ohne detail nur die befüllten Zellen (ein count()
+    über das Blatt, billig); mit detail zusätzlich verschiedene Werte und die Zeit
+    für die Normalisierung aller Werte der Spalte (norm bzw. safe_time).
+    """
+    seen, fields = set(), []
+    for c, kind, fn in plan_fields(plan):
+        if c in df.columns and c not in seen:
+            seen.add(c)
+            fields.append((c, kind, fn))
+    counts = df.count()  # ganzes Blatt: billiger als erst die Spalten auszuwählen
+    stats = []
+    for c, kind, fn in fields:
+        stat = ColumnStat(c, kind, len(df), int(counts[c]))
+        if detail:
+            values = df[c].dropna()
+            t0 = time.perf_counter()
+            for v in values:
+                fn(v)
+            stat.seconds = time.perf_counter() - t0
+            stat.distinct = int(values.nunique())
+        stats.append(stat)
+    return stats
+
+
+def prune_plan(plan: HeaderPlan, empty) -> HeaderPlan:
+    """
+    Spaltenplan ohne die Spalten aus empty (im Blatt durchgehend leer). Gruppen ohne
+    verbleibende Spalte entfallen ganz, B-Spalten ohne Sortiment und Zeit ebenso
+    (sie ergeben nie eine Position); eine leere L-Spalte fällt auf den Spaltennamen zurück.
+    """
+    def keep(groups):
+        out = {}
+        for name, f in groups.items():
+            f = {k: c for k, c in f.items() if c not in empty}
+            if f:
+                out[name] = f
+        return out
+
+    trip = {d: g for d, g in ((d, keep(g)) for d, g in plan.trip.items()) if g}
+    ds_trip = {d: g for d, g in ((d, keep(g)) for d, g in plan.ds_trip.items()) if g}
+    bmap = {}
+    for key, f in plan.bmap.items():
+        f = {k: c for k, c in f.items() if k == "group_text" or c not in empty}
+        if f.get("sort") or f.get("zeit"):
+            bmap[key] = f
+    return HeaderPlan(trip, bmap, ds_trip, plan.tours, plan.unmatched)
+
+
+def sheet_plan(df: "pd.DataFrame", plan: HeaderPlan, detail: bool = False) -> HeaderPlan:
+    """Spaltenplan für genau dieses Blatt: leere Spalten entfernt, Statistik in stats."""
+    stats = column_stats(df, plan, detail)
+    pruned = prune_plan(plan, {s.column for s in stats if s.skipped})
+    pruned.stats = stats
+    return pruned
+
+
+def column_stats_table(stats: List[ColumnStat]) -> list:
+    """Statistik als Tabellenzeilen (Debug-Bereich, CLI); leere Spalten liest die Extraktion nicht."""
+    rows = []
+    for s in stats:
+        rows.append({
+            "Spalte": str(s.column),
+            "Art": s.kind,
+            "befüllt": s.non_empty,
+            "Anteil": f"{s.non_empty / s.rows:.0%}" if s.rows else "–",
+            "verschiedene": "" if s.distinct is None else s.distinct,
+            "Zeit (ms)": "" if s.seconds is None else round(s.seconds * 1000, 2),
+            "übersprungen": "ja" if s.skipped else "",
+        })
+    return rows
+
+
+def _column_stats_path(sheet_name: str, columns: List[str]) -> Path:
+    sheet_fp = hashlib.sha1(str(sheet_name).encode("utf-8")).hexdigest()[:12]
+    return header_cache_dir() / f"colstats_{header_fingerprint(columns)}_{sheet_fp}.json"
+
+
+def save_column_stats(sheet_name: str, columns: List[str], stats: List[ColumnStat]) -> None:
+    """Letzte Statistik je Blatt und Layout unter header_cache_dir() (colstats_<Fingerprints>.json)."""
+    path = _column_stats_path(sheet_name, columns)
+    doc = {
+        "sheet": sheet_name,
+        "updated": datetime.datetime.now().isoformat(timespec="seconds"),
+        "columns": [s.to_dict() for s in stats],
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(doc, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass  # wie der Spaltenplan-Cache optional
+
+
+def load_column_stats(sheet_name: str, columns: List[str]) -> dict:
+    """Gespeicherte Statistik zu Blatt und Layout ({} wenn keine vorliegt); columns als ColumnStat."""
+    path = _column_stats_path(sheet_name, columns)
+    try:
+        doc = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    doc["columns"] = [ColumnStat.from_dict(d) for d in doc.get("columns", [])]
+    return doc
+
+
+class BestellItem:
+    """
+    Eine Sortiments-Zeile eines Kunden (kompakt über __slots__).
+    Wird erst beim Serialisieren in das JSON-Dict umgewandelt.
+    """
+    __slots__ = ("liefertag", "sortiment", "bestelltag", "bestellschluss", "prio")
+
+    def __init__(self, liefertag, sortiment, bestelltag, bestellschluss, prio):
+        self.liefertag = liefertag
+        self.sortiment = sortiment
+        self.bestelltag = bestelltag
+        self.bestellschluss = bestellschluss
+        self.prio = prio
+
+    def to_dict(self) -> dict:
+        return {
+            "liefertag": self.liefertag,
+            "sortiment": self.sortiment,
+            "bestelltag": self.bestelltag,
+            "bestellschluss": self.bestellschluss,
+            "prio": self.prio,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "BestellItem":
+        return cls(d["liefertag"], d["sortiment"], d["bestelltag"], d["bestellschluss"], d["prio"])
+
+    def __eq__(self, other):
+        if not isinstance(other, BestellItem):
+            return NotImplemented
+        return all(getattr(self, a) == getattr(other, a) for a in self.__slots__)
+
+    __hash__ = None
+
+
+class Kunde:
+    """
+    Ein Kunde eines Bereichs. Touren liegen als Tupel in der Reihenfolge von DAYS_DE.
+    """
+    __slots__ = ("kunden_nr", "name", "strasse", "plz", "ort", "fachberater", "tours", "bestell")
+
+    def __init__(self, kunden_nr, name, strasse, plz, ort, fachberater, tours, bestell):
+        self.kunden_nr = kunden_nr
+        self.name = name
+        self.strasse = strasse
+        self.plz = plz
+        self.ort = ort
+        self.fachberater = fachberater
+        self.tours = tours
+        self.bestell = bestell
+
+    def to_dict(self) -> dict:
+        return {
+            "plan_typ": PLAN_TYP,
+            "bereich": BEREICH,
+            "kunden_nr": self.kunden_nr,
+            "name": self.name,
+            "strasse": self.strasse,
+            "plz": self.plz,
+            "ort": self.ort,
+            "fachberater": self.fachberater,
+            "tours": dict(zip(DAYS_DE, self.tours)),
+            "bestell": self.bestell,
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "Kunde":
+        tours = d.get("tours") or {}
+        return cls(
+            d["kunden_nr"], d["name"], d["strasse"], d["plz"], d["ort"], d["fachberater"],
+            tuple(tours.get(day, "") for day in DAYS_DE),
+            [BestellItem.from_dict(it) for it in d.get("bestell", [])],
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, Kunde):
+            return NotImplemented
+        return all(getattr(self, a) == getattr(other, a) for a in self.__slots__)
+
+    __hash__ = None
+
+
+def record_to_json(obj):
+    """
+    `default`-Hook für json.dump(s): wandelt Records erst beim Schreiben in Dicts um,
+    so existiert immer nur das gerade serialisierte Dict.
+    """
+    if isinstance(obj, (Kunde, BestellItem)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Langformat: eine Zeile je Kunde x Liefertag x Sortiment (Export, sendeplan_schedule)
+ITEM_COLUMNS = [
+    "area", "kunden_nr", "name", "fachberater", "liefertag", "pos",
+    "sortiment", "bestelltag", "bestellschluss", "prio", "tour",
+]
+
+
+def iter_schedule_rows(all_data: dict):
+    """Zeilen des Langformats (Spalten wie ITEM_COLUMNS) als Tupel, ohne Zwischenliste."""
+    day_pos = {d: i for i, d in enumerate(DAYS_DE)}
+    for area_key, data in all_data.items():
+        for knr, kunde in data.items():
+            name, fb, tours = kunde.name, kunde.fachberater, kunde.tours
+            for pos, it in enumerate(kunde.bestell):
+                yield (area_key, knr, name, fb, it.liefertag, pos, it.sortiment,
+                       it.bestelltag, it.bestellschluss, it.prio, tours[day_pos[it.liefertag]])
+
+
+def _prio_key(item: BestellItem):
+    return item.prio
+
+
+def extract_area(df: "pd.DataFrame", plan: HeaderPlan = None) -> Dict[str, Kunde]:
+    """
+    Liest alle Kunden eines Blatts in das interne Modell (Kunde/BestellItem).
+    Durchgehend leere Spalten werden vorab aus dem Plan entfernt (sheet_plan), je Zeile
+    werden nur noch die Spalten des Plans gelesen.
+    """
+    if plan is None:
+        plan = header_plan(df.columns.tolist())
+    if plan.stats is None:  # noch nicht auf dieses Blatt zugeschnitten
+        plan = sheet_plan(df, plan)
+    # Zeilen als Dicts nur über die Spalten des Plans (statt iterrows über alle Spalten)
+    columns = list(dict.fromkeys(c for c, _, _ in plan_fields(plan) if c in df.columns))
+    rows = [dict(zip(columns, values)) for values in zip(*(df[c].tolist() for c in columns))]
+    trip = plan.trip
+    bmap = plan.bmap
+    ds_trip = plan.ds_trip
+
+    # B-Spalten je Liefertag einmal vorsortieren statt pro Zeile zu filtern
+    bkeys = {d_de: [k for k in bmap.keys() if k[0] == d_de] for d_de in DAYS_DE}
+
+    data = {}
+
+    for r in rows:
+        knr = norm(r.get("Nr", ""))
+        if not knr:
+            continue
+
+        bestell = []
+        for d_de in DAYS_DE:
+            day_items = []
+
+            # 1) Triplets
+            if d_de in trip:
+                for group_text, f in trip[d_de].items():
+                    s = norm(r.get(f.get("Sort")))
+                    t = safe_time(r.get(f.get("Zeit")))
+                    tag = norm(r.get(f.get("Tag")))
+
+                    if s or t or tag:
+                        actual_gid = canon_group_id(s)
+                        day_items.append(BestellItem(d_de, s, tag, t, SORT_PRIO.get(actual_gid, 50)))
+
+            # 2) B-Spalten
+            for k in bkeys[d_de]:
+                f = bmap[k]
+                s = norm(r.get(f.get("sort", "")))
+                z = safe_time(r.get(f.get("zeit", "")))
+
+                l_col = f.get("l")
+                if l_col:
+                    tag = norm(r.get(l_col, ""))
+                    if not tag:
+                        tag = k[2]  # Fallback Spaltennamen
+                else:
+                    tag = k[2]
+
+                if s or z:
+                    actual_gid = canon_group_id(s)
+                    day_items.append(BestellItem(d_de, s, tag, z, SORT_PRIO.get(actual_gid, 50)))
+
+            # 3) Deutsche See
+            if d_de in ds_trip:
+                for key_ds in ds_trip[d_de]:
+                    f = ds_trip[d_de][key_ds]
+                    s = norm(r.get(f.get("Sort")))
+                    t = safe_time(r.get(f.get("Zeit")))
+                    tag = norm(r.get(f.get("Tag")))
+                    if s or t or tag:
+                        # nach Avo (5), vor Werbemittel (6)
+                        day_items.append(BestellItem(d_de, s, tag, t, 5.5))
+
+            day_items.sort(key=_prio_key)
+            bestell.extend(day_items)
+
+        data[knr] = Kunde(
+            kunden_nr=knr,
+            name=norm(r.get("Name", "")),
+            strasse=norm(r.get("Strasse", "")),
+            plz=norm(r.get("Plz", "")),
+            ort=norm(r.get("Ort", "")),
+            fachberater=norm(r.get("Fachberater", "")),
+            tours=tuple(norm(r.get(TOUR_COLS[d], "")) for d in DAYS_DE),
+            bestell=bestell,
+        )
+
+    return data
+
+
+def iter_workbook(src, sheets: Dict[str, str] = None, engine: str = None, detail_stats: bool = False):
+    """
+    Verarbeitet die Blätter einer Excel-Datei (Pfad, Bytes oder File-Objekt) nacheinander;
+    ebenso Ordner/ZIP mit CSV- oder Parquet-Exporten je Blatt (siehe sendeplan_readers).
+    engine: "auto" (calamine, falls installiert), "calamine" oder "openpyxl".
+    Liefert je Bereich (area_key, sheet_name, data, plan, error); bei Fehler sind data/plan None.
+    plan ist auf das Blatt zugeschnitten, plan.stats die Spaltenstatistik (mit detail_stats
+    inkl. verschiedener Werte und Zeiten); sie wird je Layout unter header_cache_dir() gespeichert.
+    """
+    from sendeplan_readers import open_source
+
+    if sheets is None:
+        sheets = SHEETS
+    source = open_source(src, engine)
+
+    for area_key, sheet_name in sheets.items():
+        try:
+            df = source.parse(sheet_name)
+            columns = df.columns.tolist()
+            plan = sheet_plan(df, header_plan(columns), detail_stats)
+        except Exception as e:
+            yield area_key, sheet_name, None, None, e
+            continue
+
+        save_column_stats(sheet_name, columns, plan.stats)
+        yield area_key, sheet_name, extract_area(df, plan), plan, None
+
+
+def process_workbook(src, sheets: Dict[str, str] = None, progress=None, engine: str = None,
+                     detail_stats: bool = False) -> tuple:
+    """
+    Verarbeitet eine Excel-Datei komplett: (all_data, plans, errors),
+    plans/errors jeweils je Bereich. progress(erledigt, gesamt) nach jedem Blatt.
+    """
+    if sheets is None:
+        sheets = SHEETS
+    all_data, plans, errors = {}, {}, {}
+    for i, (area_key, sheet_name, data, plan, error) in enumerate(iter_workbook(src, sheets, engine, detail_stats), start=1):
+        if progress is not None:
+            progress(i, len(sheets))
+        if error is not None:
+            errors[area_key] = f"Fehler beim Laden von '{sheet_name}': {error}"
+            continue
+        all_data[area_key] = data
+        plans[area_key] = plan
+    return all_data, plans, errors
+
+
+class BatchResult:
+    """
+    Ergebnis von process_workbooks:
+    all_data (zusammengeführt), plans je (Quelle, Bereich), errors als Meldungen,
+    conflicts = [(area_key, kunden_nr, [Quellen])] bei abweichendem Inhalt.
+    """
+    __slots__ = ("all_data", "plans", "errors", "conflicts")
+
+    def __init__(self, all_data, plans, errors, conflicts):
+        self.all_data = all_data
+        self.plans = plans
+        self.errors = errors
+        self.conflicts = conflicts
+
+
+def merge_area_data(results) -> tuple:
+    """
+    Führt [(Quelle, all_data), ...] je Bereich zusammen. Bei gleicher Kunden-Nr
+    gewinnt die erste Quelle; weicht der Inhalt ab, wird ein Konflikt gemeldet.
+    Liefert (all_data, conflicts).
+    """
+    merged = {}
+    owners = {}
+    conflicts = {}
+    for source, all_data in results:
+        for area_key, data in all_data.items():
+            target = merged.setdefault(area_key, {})
+            for knr, kunde in data.items():
+                if knr not in target:
+                    target[knr] = kunde
+                    owners[(area_key, knr)] = source
+                elif target[knr] != kunde:
+                    conflicts.setdefault((area_key, knr), [owners[(area_key, knr)]]).append(source)
+
+    return merged, [(area_key, knr, sources) for (area_key, knr), sources in conflicts.items()]
+
+
+def process_source(source: str, src, sheets: Dict[str, str] = None, progress=None, engine: str = None,
+                   detail_stats: bool = False) -> tuple:
+    try:
+        all_data, plans, errors = process_workbook(src, sheets, progress, engine, detail_stats)
+    except Exception as e:  # z.B. keine gültige Excel-Datei
+        return source, {}, {}, {"*": f"Fehler beim Öffnen: {e}"}
+    return source, all_data, plans, errors
+
+
+def process_workbooks(sources, sheets: Dict[str, str] = None, max_workers: int = None,
+                      engine: str = None) -> BatchResult:
+    """
+    Verarbeitet mehrere Excel-Dateien parallel (Prozess-Pool) und führt sie zusammen.
+    sources: [(Name, Pfad/Bytes), ...]; die Reihenfolge bestimmt den Vorrang beim Merge.
+    """
+    sources = list(sources)
+    if not sources:
+        return BatchResult({}, {}, [], [])
+    if max_workers is None:
+        max_workers = min(len(sources), os.cpu_count() or 1)
+
+    if max_workers <= 1 or len(sources) == 1:
+        outputs = [process_source(name, src, sheets, engine=engine) for name, src in sources]
+    else:
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+            futures = [pool.submit(process_source, name, src, sheets, engine=engine) for name, src in sources]
+            outputs = [f.result() for f in futures]
+
+    return collect_outputs(outputs)
+
+
+def collect_outputs(outputs) -> BatchResult:
+    """
+    Führt Ergebnisse von process_source [(Quelle, all_data, plans, errors), ...]
+    zu einem BatchResult zusammen; die Reihenfolge bestimmt den Vorrang beim Merge.
+    """
+    outputs = list(outputs)
+    plans, errors = {}, []
+    for source, _, source_plans, source_errors in outputs:
+        for area_key, plan in source_plans.items():
+            plans[(source, area_key)] = plan
+        errors.extend(f"{source}: {msg}" for msg in source_errors.values())
+
+    all_data, conflicts = merge_area_data((source, all_data) for source, all_data, _, _ in outputs)
+    return BatchResult(all_data, plans, errors, conflicts)
+
+
+def load_logo_data_uri() -> str:
+    """
+    Lädt Logo von Festplatte (Fallback), z.B. neben dem Script oder /mnt/data.
+    """
+    candidates = []
+    try:
+        here = Path(__file__).resolve().parent
+        candidates.append(here / "Logo_NORDfrische Center (NFC).png")
+    except Exception:
+        pass
+    candidates.append(Path.cwd() / "Logo_NORDfrische Center (NFC).png")
+    candidates.append(Path("/mnt/data/Logo_NORDfrische Center (NFC).png"))
+
+    for p in candidates:
+        try:
+            if p.exists() and p.is_file():
+                b = p.read_bytes()
+                return "data:image/png;base64," + base64.b64encode(b).decode("ascii")
+        except Exception:
+            continue
+    return ""
+
+
+def logo_file_to_data_uri(uploaded_file) -> str:
+    """
+    Wandelt ein hochgeladenes Streamlit-File (PNG/JPG/SVG) in eine Data-URI um.
+    """
+    if not uploaded_file:
+        return ""
+    mime = uploaded_file.type or "image/png"
+    b = uploaded_file.getvalue()
+    return f"data:{mime};base64," + base64.b64encode(b).decode("ascii")
+
+
+# --- HTML TEMPLATE (A4 MIT SCROLLBALKEN - PRINT OPTIMIERT - 4 BEREICHE) ---
+# liegt als sendeplan_template.html neben diesem Modul und wird erst beim ersten Bedarf geladen
+TEMPLATE_PATH = Path(__file__).resolve().parent / "sendeplan_template.html"
+TEMPLATE_PLACEHOLDERS = (
+    "__DATA_JSON__", "__DATA_HASH__", "__LOGO_DATAURI__", "__CUTOFF_JSON__", "__VARIANTS_JSON__",
+)
+
+
+@functools.lru_cache(maxsize=None)
+def html_template() -> str:
+    """
+    Template beim ersten Aufruf laden; Einrückung und Leerzeilen entfallen, sonst
+    bleibt der Inhalt unverändert. SENDEPLAN_NO_MINIFY=1 liefert die Quelle wie sie ist.
+    """
+    source = TEMPLATE_PATH.read_bytes().decode("utf-8")
+    if os.environ.get("SENDEPLAN_NO_MINIFY"):
+        return source
+    return "\n".join(s for s in (line.strip() for line in source.split("\n")) if s) + "\n"
+
+
+@functools.lru_cache(maxsize=None)
+def template_parts() -> tuple:
+    """
+    Template einmal an den Platzhaltern zerlegt und vorab kodiert:
+    gerade Indizes = feste Bytes, ungerade Indizes = Platzhaltername.
+    """
+    parts = re.split("(" + "|".join(TEMPLATE_PLACEHOLDERS) + ")", html_template())
+    return tuple(p if i % 2 else p.encode("utf-8") for i, p in enumerate(parts))
+
+
+@functools.lru_cache(maxsize=None)
+def template_css() -> str:
+    """CSS des Viewers, für eigenständige Einzelseiten wiederverwendet."""
+    t = html_template()
+    return t[t.index("<style>") + len("<style>"):t.index("</style>")]
+
+
+_JSON_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=record_to_json)
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=record_to_json)
+    return _JSON_ENCODER.encode(obj).encode("utf-8")
+
+
+def write_data_json(fp, all_data: dict, html: bool = False) -> int:
+    """
+    Schreibt all_data als kompaktes JSON in ein Binär-File, Kunde für Kunde.
+    Es entsteht nie der komplette JSON-String im Speicher. Gibt die Byte-Anzahl zurück.
+    html=True maskiert "</" für die Einbettung in ein <script>-Element.
+    """
+    dumps = _dumps_html if html else _dumps
+    n = fp.write(b"{")
+    for i, (area_key, data) in enumerate(all_data.items()):
+        n += fp.write((b"," if i else b"") + dumps(area_key) + b":{")
+        for j, (knr, kunde) in enumerate(data.items()):
+            n += fp.write((b"," if j else b"") + dumps(knr) + b":" + dumps(kunde))
+        n += fp.write(b"}")
+    n += fp.write(b"}")
+    return n
+
+
+def _dumps_html(obj) -> bytes:
+    return _dumps(obj).replace(b"</", b"<\\/")
+
+
+class _HashingWriter:
+    """Reicht write() durch (fp=None: verwirft) und bildet nebenbei den SHA-256 der Bytes."""
+    __slots__ = ("fp", "sha")
+
+    def __init__(self, fp=None):
+        self.fp = fp
+        self.sha = hashlib.sha256()
+
+    def write(self, b) -> int:
+        self.sha.update(b)
+        return len(b) if self.fp is None else self.fp.write(b)
+
+    def hexdigest(self) -> str:
+        return self.sha.hexdigest()[:32]
+
+
+def data_hash(all_data: dict) -> str:
+    """DATA_HASH, den write_html für all_data einbetten würde (Versionskennung der Daten)."""
+    hashing = _HashingWriter()
+    write_data_json(hashing, all_data, html=True)
+    return hashing.hexdigest()
+
+
+def load_data_json(fp) -> dict:
+    """
+    Gegenstück zu write_data_json: liest {bereich: {kunden_nr: Kunde}} aus einer
+    zuvor geschriebenen JSON-Datei (Binär- oder Textdatei). Braucht kein pandas.
+    """
+    return all_data_from_dict(json.load(fp))
+
+
+def all_data_from_dict(raw: dict) -> dict:
+    """Geparstes JSON {bereich: {kunden_nr: dict}} -> {bereich: {kunden_nr: Kunde}}."""
+    return {
+        area_key: {knr: Kunde.from_dict(d) for knr, d in data.items()}
+        for area_key, data in raw.items()
+    }
+
+
+def write_html(fp, all_data: dict, logo_uri: str = "", variants: dict = None) -> tuple:
+    """
+    Schreibt den Sendeplan (Template + Daten + Logo) direkt in ein Binär-File.
+    variants: {Name: Delta} aus sendeplan_variants, im Viewer als Plan wählbar.
+    Der Hash der Daten (__DATA_HASH__) ist im Viewer der Schlüssel für den
+    IndexedDB-Cache der dekodierten Bereiche.
+    Gibt (Offset, Länge) des JSON-Blocks zurück (für Debug-Ausgaben).
+    """
+    json_pos = json_len = 0
+    digest = ""
+    for i, part in enumerate(template_parts()):
+        if i % 2 == 0:
+            fp.write(part)
+        elif part == "__DATA_JSON__":
+            json_pos = fp.tell()
+            hashing = _HashingWriter(fp)
+            json_len = write_data_json(hashing, all_data, html=True)
+            digest = hashing.hexdigest()
+        elif part == "__DATA_HASH__":
+            fp.write(digest.encode("ascii"))
+        elif part == "__CUTOFF_JSON__":
+            from sendeplan_cutoffs import cutoff_index_json
+
+            fp.write(cutoff_index_json(all_data))
+        elif part == "__VARIANTS_JSON__":
+            fp.write(_dumps(variants or {}).replace(b"</", b"<\\/"))
+        else:
+            fp.write((logo_uri or "").encode("utf-8"))
+    return json_pos, json_len
+
+
+def build_html_file(all_data: dict, logo_uri: str = "", max_size: int = 1 << 20, variants: dict = None):
+    """
+    Baut den Sendeplan in eine SpooledTemporaryFile (ab max_size auf Platte)
+    und liefert sie auf Position 0 zurück, zusammen mit (Offset, Länge) des JSON.
+    """
+    spool = tempfile.SpooledTemporaryFile(max_size=max_size, mode="w+b")
+    json_span = write_html(spool, all_data, logo_uri, variants)
+    spool.seek(0)
+    return spool, json_span
+
+
+# --- Einzelseiten (serverseitig, gleiches Markup wie render() im Viewer) ---
+
+AREA_NAMES = {'direkt': 'Direkt', 'mk': 'MK', 'nms': 'HuPa NMS', 'malchow': 'HuPa Malchow'}
+
+
+def esc(s) -> str:
+    """Wie esc() im Viewer: nur & und < maskieren."""
+    return str(s or "").replace("&", "&amp;").replace("<", "&lt;")
+
+
+def _js_number(s: str) -> float:
+    # entspricht Number(s) || 0 im Viewer
+    try:
+        v = float(s) if s.strip() else 0.0
+    except ValueError:
+        return 0.0
+    return v if v == v else 0.0
+
+
+def customer_order(data: Dict[str, Kunde]) -> List[str]:
+    """Kunden-Nr numerisch sortiert (wie ORDER im Viewer)."""
+    return sorted(data.keys(), key=_js_number)
+
+
+def tour_sort_key(tour: str) -> float:
+    """Tournummer numerisch (Nicht-Ziffern entfernt), wie beim Druck nach Liefertag."""
+    return _js_number(re.sub(r"\D", "", str(tour)))
+
+
+def delivery_day_keys(data: Dict[str, Kunde], day: str) -> List[str]:
+    """
+    Kunden mit Tour am Liefertag, nach Tournummer sortiert (wie printByDeliveryDay);
+    day="ALLE" liefert alle Kunden in Standard-Reihenfolge.
+    """
+    order = customer_order(data)
+    if day == "ALLE":
+        return order
+    i = DAYS_DE.index(day)
+    hits = [k for k in order if data[k].tours[i] and data[k].tours[i] != "—" and data[k].tours[i].strip()]
+    return sorted(hits, key=lambda k: tour_sort_key(data[k].tours[i]))
+
+
+def render_customer_html(kunde: Kunde, logo_src: str = "", stand: str = None) -> str:
+    """Druckseite eines Kunden (Markup wie render() im Viewer)."""
+    if stand is None:
+        stand = datetime.date.today().strftime("%d.%m.%Y")
+
+    day_cards = []
+    for d in DAYS_DE:
+        items = [it for it in kunde.bestell if it.liefertag == d]
+        if not items:
+            continue
+        items_html = []
+        for it in items:
+            detail = ""
+            if it.bestelltag:
+                detail += f'<div class="sortiment-detail"><span class="label">Bestelltag:</span> {esc(it.bestelltag)}</div>'
+            if it.bestellschluss:
+                detail += f'<div class="sortiment-detail"><span class="label">Bestellschluss:</span> {esc(it.bestellschluss)}</div>'
+            items_html.append(
+                f'<div class="sortiment-item"><div class="sortiment-name">{esc(it.sortiment)}</div>{detail}</div>'
+            )
+        day_cards.append(
+            f'<div class="day-card active"><div class="day-card-header">{d}</div>'
+            f'<div class="day-card-body">{"".join(items_html)}</div></div>'
+        )
+
+    tour_headers = "".join(f"<th>{d[:2]}</th>" for d in DAYS_DE)
+    tour_items = "".join(f"<td>{esc(t or '—')}</td>" for t in kunde.tours)
+    logo_html = f'<img class="logo" src="{logo_src}" alt="Logo">' if logo_src else ""
+
+    return f"""<div class="paper">
+    <div class="paper-content">
+      <div class="header-section">
+        <div class="header-left">
+          {logo_html}
+          <div class="logo-subtitle">Das Fleischwerk von EDEKA Nord</div>
+        </div>
+        <div class="header-right">
+          <div class="customer-box">
+            <div><strong>Kunden-Nr:</strong> {esc(kunde.kunden_nr)}</div>
+            <div><strong>Fachberater:</strong> {esc(kunde.fachberater)}</div>
+            <div><strong>Stand:</strong> {stand}</div>
+          </div>
+        </div>
+      </div>
+
+      <div class="title-section">
+        <h1 class="main-title">Sende- &amp; Belieferungsplan</h1>
+        <div class="plan-type">{esc(PLAN_TYP)}</div>
+        <div class="customer-subtitle">{esc(kunde.name)} | {esc(BEREICH)}</div>
+      </div>
+
+      <div class="address-box">
+        <strong>{esc(kunde.name)}</strong><br>
+        {esc(kunde.strasse)}<br>
+        {esc(kunde.plz)} {esc(kunde.ort)}
+      </div>
+
+      <div class="tour-section">
+        <table class="tour-table">
+          <thead><tr>{tour_headers}</tr></thead>
+          <tbody><tr>{tour_items}</tr></tbody>
+        </table>
+      </div>
+
+      <div class="days-grid">
+        {"".join(day_cards)}
+      </div>
+    </div>
+  </div>"""
+
+
+def render_customer_page(kunde: Kunde, logo_src: str = "", css_href: str = None) -> str:
+    """
+    Eigenständige HTML-Seite für einen Kunden. Mit css_href wird das CSS verlinkt
+    statt eingebettet (für viele Einzeldateien mit gemeinsamem Stylesheet).
+    """
+    if css_href:
+        style = f'<link rel="stylesheet" href="{css_href}">'
+    else:
+        style = f"<style>{template_css()}</style>"
+    return (
+        '<!doctype html>\n<html lang="de">\n<head>\n<meta charset="utf-8">\n'
+        f"<title>Sendeplan {esc(kunde.kunden_nr)} – {esc(kunde.name)}</title>\n{style}\n</head>\n"
+        f'<body>\n<div class="wrap">\n{render_customer_html(kunde, logo_src)}\n</div>\n</body>\n</html>\n'
+    )
+
+
+# --- Einzelseiten als ZIP ---
+
+CUSTOMER_ZIP_CSS = "sendeplan.css"
+
+_UNSAFE_PATH_CHARS = re.compile(r'[\\/:*?"<>|]+')
+
+
+def safe_path_part(name: str, fallback: str) -> str:
+    """Ordner-/Dateiname ohne Sonderzeichen (Windows-tauglich)."""
+    s = _UNSAFE_PATH_CHARS.sub("_", norm(name)).strip(". ")
+    return s or fallback
+
+
+def data_uri_to_bytes(uri: str) -> tuple:
+    """'data:image/png;base64,...' -> ('image/png', Bytes); leer -> ('', b'')."""
+    if not uri or not uri.startswith("data:") or "," not in uri:
+        return "", b""
+    head, payload = uri[5:].split(",", 1)
+    mime = head.split(";")[0] or "application/octet-stream"
+    return mime, base64.b64decode(payload)
+
+
+def write_customer_zip(fp, all_data: dict, logo_uri: str = "", inline_assets: bool = False) -> int:
+    """
+    Schreibt je Kunde eine kleine HTML-Seite in ein ZIP: <Bereich>/<Fachberater>/<Kunden-Nr>.html.
+    CSS und Logo liegen einmal im ZIP-Wurzelverzeichnis und werden relativ verlinkt;
+    mit inline_assets=True ist jede Seite vollständig eigenständig. Gibt die Seitenzahl zurück.
+    """
+    count = 0
+    with zipfile.ZipFile(fp, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        logo_name = ""
+        if not inline_assets:
+            zf.writestr(CUSTOMER_ZIP_CSS, template_css())
+            mime, logo_bytes = data_uri_to_bytes(logo_uri)
+            if logo_bytes:
+                ext = {"image/svg+xml": "svg", "image/jpeg": "jpg"}.get(mime, "png")
+                logo_name = f"logo.{ext}"
+                zf.writestr(logo_name, logo_bytes)
+
+        for area_key, data in all_data.items():
+            area_dir = safe_path_part(AREA_NAMES.get(area_key, area_key), area_key)
+            for knr in customer_order(data):
+                kunde = data[knr]
+                fb_dir = safe_path_part(kunde.fachberater, "ohne Fachberater")
+                if inline_assets:
+                    page = render_customer_page(kunde, logo_uri)
+                else:
+                    page = render_customer_page(
+                        kunde,
+                        f"../../{logo_name}" if logo_name else "",
+                        css_href=f"../../{CUSTOMER_ZIP_CSS}",
+                    )
+                with zf.open(f"{area_dir}/{fb_dir}/{safe_path_part(knr, 'kunde')}.html", "w") as out:
+                    out.write(page.encode("utf-8"))
+                count += 1
+    return count
+
+
+def build_customer_zip(all_data: dict, logo_uri: str = "", inline_assets: bool = False,
+                       max_size: int = 1 << 20):
+    """Wie build_html_file, aber für das Einzelseiten-ZIP: (SpooledTemporaryFile, Seitenzahl)."""
+    spool = tempfile.SpooledTemporaryFile(max_size=max_size, mode="w+b")
+    count = write_customer_zip(spool, all_data, logo_uri, inline_assets)
+    spool.seek(0)
+    return spool, count
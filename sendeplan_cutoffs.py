@@ -0,0 +1,166 @@
+# sendeplan_cutoffs.py
+# -----------------------------------------------------------------------------
+# Invertierter Index Bestellschluss -> Bestell-Position: "wer muss Dienstag
+# zwischen 09:00 und 11:00 bestellen?" als Binärsuche statt Durchlauf aller
+# Kunden. Schlüssel = Minuten ab Montag 00:00 (Bestelltag + Bestellschluss),
+# aufsteigend sortiert in einem array; je Eintrag Bereich, Kunden-Nr und
+# Position in Kunde.bestell (Sortiment, Liefertag usw. stehen in all_data).
+# Wird als JSON in die Sendeplan-HTML eingebettet (<script id="cutoff-index">)
+# und lässt sich daraus wieder laden. Ohne pandas.
+# -----------------------------------------------------------------------------
+
+import array
+import bisect
+import json
+import re
+from typing import Optional
+
+from sendeplan_core import all_data_from_dict, clock_to_minutes, day_to_index
+
+INDEX_VERSION = 1
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+WEEKDAYS = ["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag", "Samstag", "Sonntag"]
+
+SCRIPT_OPEN = '<script type="application/json" id="cutoff-index">'
+DATA_SCRIPT_OPEN = '<script type="application/json" id="viewer-data">'
+_RX_DATA_START = re.compile(r"const ALL_DATA\s*=\s*")  # ältere Dateien: Daten als JS-Literal
+
+
+def week_minutes(bestelltag: str, bestellschluss: str) -> Optional[int]:
+    """('Dienstag', '09:30 Uhr') -> 1*1440 + 570; None ohne auswertbaren Tag oder Uhrzeit."""
+    day = day_to_index(bestelltag)
+    if day is None:
+        return None
+    minutes = clock_to_minutes(bestellschluss)
+    if minutes is None:
+        return None
+    return day * DAY_MINUTES + minutes
+
+
+def format_week_minutes(m: int) -> str:
+    day, minutes = divmod(m, DAY_MINUTES)
+    return f"{WEEKDAYS[day]} {minutes // 60:02d}:{minutes % 60:02d}"
+
+
+class CutoffIndex:
+    """
+    Spaltenweise, nach minutes sortiert: minutes[i] gehört zu
+    all_data[areas[area[i]]][kunden_nr[i]].bestell[pos[i]].
+    """
+    __slots__ = ("areas", "minutes", "area", "kunden_nr", "pos")
+
+    def __init__(self, areas, minutes, area, kunden_nr, pos):
+        self.areas = list(areas)
+        self.minutes = array.array("i", minutes)
+        self.area = array.array("B", area)
+        self.kunden_nr = list(kunden_nr)
+        self.pos = array.array("H", pos)
+
+    def __len__(self) -> int:
+        return len(self.minutes)
+
+    def between(self, start: int, end: int) -> list:
+        """
+        Indizes mit start <= minutes <= end (Minuten ab Montag 00:00).
+        end < start bedeutet über das Wochenende hinweg (z.B. Samstag 20:00 bis Montag 06:00).
+        """
+        lo = bisect.bisect_left(self.minutes, start)
+        if end >= start:
+            return list(range(lo, bisect.bisect_right(self.minutes, end, lo)))
+        return list(range(lo, len(self.minutes))) + list(range(bisect.bisect_right(self.minutes, end)))
+
+    def window(self, tag: str, von: str = "00:00", bis: str = "23:59") -> list:
+        """Indizes für Bestelltag tag (voll oder Kürzel) zwischen von und bis (je einschließlich)."""
+        day = day_to_index(tag)
+        start, end = clock_to_minutes(von), clock_to_minutes(bis)
+        if day is None or start is None or end is None:
+            raise ValueError(f"Ungültiges Zeitfenster: {tag} {von}–{bis}")
+        base = day * DAY_MINUTES
+        if end < start:  # z.B. 22:00–02:00: bis in den Folgetag
+            return self.between(base + start, (base + DAY_MINUTES + end) % WEEK_MINUTES)
+        return self.between(base + start, base + end)
+
+    def rows(self, all_data: dict, indices) -> list:
+        """Treffer als Zeilen (dict) mit Kunde und Bestell-Position aus all_data."""
+        out = []
+        for i in indices:
+            area_key = self.areas[self.area[i]]
+            kunde = all_data[area_key][self.kunden_nr[i]]
+            item = kunde.bestell[self.pos[i]]
+            out.append({
+                "bestellschluss": format_week_minutes(self.minutes[i]),
+                "area": area_key,
+                "kunden_nr": kunde.kunden_nr,
+                "name": kunde.name,
+                "fachberater": kunde.fachberater,
+                "sortiment": item.sortiment,
+                "liefertag": item.liefertag,
+            })
+        return out
+
+    def to_dict(self) -> dict:
+        return {
+            "v": INDEX_VERSION,
+            "areas": self.areas,
+            "minutes": self.minutes.tolist(),
+            "area": self.area.tolist(),
+            "kunden_nr": self.kunden_nr,
+            "pos": self.pos.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "CutoffIndex":
+        if d.get("v") != INDEX_VERSION:
+            raise ValueError(f"Unbekannte Index-Version {d.get('v')}")
+        return cls(d["areas"], d["minutes"], d["area"], d["kunden_nr"], d["pos"])
+
+
+def build_cutoff_index(all_data: dict) -> CutoffIndex:
+    """Alle Bestell-Positionen mit auswertbarem Bestelltag und -schluss, sortiert nach Wochenminute."""
+    areas = list(all_data)
+    entries = []
+    for a, area_key in enumerate(areas):
+        for knr, kunde in all_data[area_key].items():
+            for pos, item in enumerate(kunde.bestell):
+                m = week_minutes(item.bestelltag, item.bestellschluss)
+                if m is not None:
+                    entries.append((m, a, knr, pos))
+    entries.sort(key=lambda e: e[0])  # stabil: innerhalb gleicher Minute Plan-Reihenfolge
+    return CutoffIndex(
+        areas,
+        (e[0] for e in entries),
+        (e[1] for e in entries),
+        [e[2] for e in entries],
+        (e[3] for e in entries),
+    )
+
+
+def cutoff_index_json(all_data: dict) -> bytes:
+    """Index als JSON für die Einbettung in ein <script>-Element."""
+    raw = json.dumps(build_cutoff_index(all_data).to_dict(), ensure_ascii=False, separators=(",", ":"))
+    return raw.replace("</", "<\\/").encode("utf-8")
+
+
+def read_sendeplan_html(html: bytes) -> tuple:
+    """
+    Aus einer geschriebenen Sendeplan-HTML: (all_data, CutoffIndex).
+    Ohne eingebetteten Index (ältere Dateien) wird er aus den Daten neu gebaut.
+    """
+    text = html.decode("utf-8")
+    pos = text.find(DATA_SCRIPT_OPEN)
+    if pos >= 0:
+        pos += len(DATA_SCRIPT_OPEN)
+    else:
+        m = _RX_DATA_START.search(text)
+        if not m:
+            raise ValueError("Keine Sendeplan-Daten (viewer-data) gefunden")
+        pos = m.end()
+    raw, _ = json.JSONDecoder().raw_decode(text, pos)
+    all_data = all_data_from_dict(raw)
+    start = text.find(SCRIPT_OPEN)
+    if start < 0:
+        return all_data, build_cutoff_index(all_data)
+    start += len(SCRIPT_OPEN)
+    end = text.index("</script>", start)
+    return all_data, CutoffIndex.from_dict(json.loads(text[start:end]))
@@ -0,0 +1,640 @@
+# sendeplan_equivalence.py
+# -----------------------------------------------------------------------------
+# Differenzprüfung der Extraktionspfade gegen die Referenz: die ursprüngliche
+# Schleife (pd.read_excel je Blatt, df.iterrows() über alle Spalten, Erkennung
+# mit detect_triplets/detect_bspalten/detect_ds_triplets, Ergebnis als Dicts).
+# Jeder schnellere Pfad (Engines, Spaltenpläne mit Cache und Pruning, CSV/
+# Parquet-Exporte, Job-Pool je Bereich) muss Kunde für Kunde dasselbe all_data
+# liefern – inklusive Fallback tag = k[2] bei B-Spalten, safe_time gegen
+# Tagesnamen und prio-Reihenfolge mit Deutsche See bei 5.5.
+# Spaltenerkennung (detect_*) und Zell-Hilfsfunktionen (norm, normalize_time,
+# safe_time, canon_group_id) der Referenz sind eingefrorene Kopien der
+# ursprünglichen App: Änderungen an den Versionen in sendeplan_core fallen so
+# als Abweichung auf.
+#   python sendeplan_cli.py equivalence               (synthetische Datei)
+#   python sendeplan_cli.py equivalence Sendeplan.xlsx --runs 3
+# -----------------------------------------------------------------------------
+
+import datetime
+import io
+import random
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+import pandas as pd
+
+from sendeplan_core import (
+    BEREICH,
+    DAYS_DE,
+    PLAN_TYP,
+    SHEETS,
+    SORT_PRIO,
+    TOUR_COLS,
+    extract_area,
+    process_workbook,
+)
+
+KUNDE_FIELDS = ("plan_typ", "bereich", "kunden_nr", "name", "strasse", "plz", "ort", "fachberater")
+ITEM_FIELDS = ("liefertag", "sortiment", "bestelltag", "bestellschluss", "prio")
+
+
+# --- Referenz ----------------------------------------------------------------
+
+# Spaltenerkennung und Zell-Hilfsfunktionen wie in der ursprünglichen App (nicht anpassen)
+
+DAY_SHORT_TO_DE = {
+    "Mo": "Montag", "Di": "Dienstag", "Die": "Dienstag",
+    "Mi": "Mittwoch", "Mit": "Mittwoch", "Mitt": "Mittwoch",
+    "Do": "Donnerstag", "Don": "Donnerstag", "Donn": "Donnerstag",
+    "Fr": "Freitag", "Sa": "Samstag", "Sam": "Samstag",
+}
+
+
+def norm(x) -> str:
+    if x is None:
+        return ""
+    if isinstance(x, float) and pd.isna(x):
+        return ""
+    s = str(x).replace("\u00a0", " ").strip()
+    s = re.sub(r"\s+", " ", s)
+    if re.fullmatch(r"\d+\.0", s):
+        s = s[:-2]
+    return s
+
+
+def normalize_time(s) -> str:
+    if isinstance(s, (datetime.time, pd.Timestamp)):
+        return s.strftime("%H:%M") + " Uhr"
+    s = norm(s)
+    if not s:
+        return ""
+    if re.fullmatch(r"\d{1,2}:\d{2}", s):
+        return s + " Uhr"
+    if re.fullmatch(r"\d{1,2}", s):
+        return s.zfill(2) + ":00 Uhr"
+    return s
+
+
+def safe_time(val) -> str:
+    """
+    verhindert Fälle wie "Montag Montag" (Tag landet fälschlich in Zeit)
+    """
+    raw = norm(val)
+    if re.fullmatch(r"(Montag|Dienstag|Mittwoch|Donnerstag|Freitag|Samstag)", raw):
+        return ""
+    return normalize_time(val)
+
+
+def canon_group_id(label: str) -> str:
+    """
+    Mapped Sortimentsbezeichnungen robust auf interne IDs.
+    WICHTIG: Spezifischere Regeln MÜSSEN vor allgemeineren kommen!
+    """
+    s = norm(label).lower()
+
+    # harte Treffer (Zahlen)
+    m = re.search(r"\b(1011|21|41|65|0|91|22)\b", s)
+    if m:
+        return m.group(1)
+
+    # Bio-Geflügel (41)
+    if "bio" in s and "geflügel" in s:
+        return "41"
+
+    # Wiesenhof/Geflügel (1011)
+    if "wiesenhof" in s:
+        return "1011"
+    if "geflügel" in s:
+        return "1011"
+
+    # Frischfleisch (65)
+    if "frischfleisch" in s or "veredlung" in s or "schwein" in s or "pök" in s:
+        return "65"
+
+    # Fleisch/Wurst (21)
+    if "fleisch" in s or "wurst" in s or "heidemark" in s:
+        return "21"
+
+    # Avo-Gewürze (0)
+    if "avo" in s or "gewürz" in s:
+        return "0"
+
+    # Werbemittel (91)
+    if "werbe" in s or "werbemittel" in s:
+        return "91"
+
+    # Pfeiffer etc. (22)
+    if "pfeiffer" in s or "gmyrek" in s or "siebert" in s or "bard" in s or "mago" in s:
+        return "22"
+
+    return "?"
+
+
+def detect_bspalten(columns: List[str]):
+    """
+    Erkennung für Spalten wie:
+    "Mo Z Wiesenhof B_Di" / "Mo L Bio B_Mi" / "Mo Wiesenhof B_Di" etc.
+    UND auch Spalten OHNE "B": "Mit Z 41 Mo" (nur Tag ZL Gruppe Tag)
+    """
+    rx_b = re.compile(
+        r"^(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)\s+"
+        r"(?:(Z|L)\s+)?(.+?)\s+B[_ ]\s*(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)$",
+        re.IGNORECASE
+    )
+    rx_no_b = re.compile(
+        r"^(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)\s+"
+        r"(Z|L)\s+(.+?)\s+(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)$",
+        re.IGNORECASE
+    )
+
+    mapping = {}
+
+    # Phase 1: ohne B
+    for c in columns:
+        if re.search(r"\sB[_ ]\s*", c, re.IGNORECASE):
+            continue
+
+        m = rx_no_b.match(c.strip())
+        if m:
+            day_de = DAY_SHORT_TO_DE.get(m.group(1))
+            zl = m.group(2).upper()
+            group_text = m.group(3).strip()
+            bestell_de_from_name = DAY_SHORT_TO_DE.get(m.group(4))
+
+            if day_de and bestell_de_from_name:
+                key = (day_de, group_text, bestell_de_from_name)
+                mapping.setdefault(key, {})
+                if zl == "Z":
+                    mapping[key]["zeit"] = c
+                elif zl == "L":
+                    mapping[key]["l"] = c
+
+    # Phase 2: mit B
+    for c in columns:
+        m = rx_b.match(c.strip())
+        if m:
+            day_de = DAY_SHORT_TO_DE.get(m.group(1))
+            zl = (m.group(2) or "").upper()
+            group_text = m.group(3).strip()
+            bestell_de_from_name = DAY_SHORT_TO_DE.get(m.group(4))
+
+            if day_de and bestell_de_from_name:
+                key = (day_de, group_text, bestell_de_from_name)
+                mapping.setdefault(key, {})
+                if zl == "Z":
+                    if "zeit" not in mapping[key]:
+                        mapping[key]["zeit"] = c
+                elif zl == "L":
+                    if "l" not in mapping[key]:
+                        mapping[key]["l"] = c
+                else:
+                    mapping[key]["sort"] = c
+                    mapping[key]["group_text"] = group_text
+
+    return mapping
+
+
+def detect_triplets(columns: List[str]):
+    rx = re.compile(
+        r"^(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)\s+(.+?)\s+"
+        r"(Zeit|Zeitende|Bestellzeitende|Uhrzeit|Sort|Sortiment|Tag|Bestelltag)$",
+        re.IGNORECASE
+    )
+    found = {}
+    for c in columns:
+        m = rx.match(c.strip())
+        if not m:
+            continue
+
+        day_de = DAY_SHORT_TO_DE.get(m.group(1))
+        if not day_de:
+            continue
+
+        group_text = m.group(2).strip()
+
+        end_key = m.group(3).lower()
+        if end_key in ("sort", "sortiment"):
+            key = "Sort"
+        elif end_key in ("tag", "bestelltag"):
+            key = "Tag"
+        else:
+            key = "Zeit"
+
+        found.setdefault(day_de, {}).setdefault(group_text, {})[key] = c
+
+    return found
+
+
+def detect_ds_triplets(columns: List[str]):
+    rx = re.compile(
+        r"^DS\s+(.+?)\s+zu\s+(Mo|Die|Di|Mitt|Mit|Mi|Don|Donn|Do|Fr|Sam|Sa)\s+(Zeit|Sort|Tag)$",
+        re.IGNORECASE
+    )
+    tmp = {}
+    for c in columns:
+        m = rx.match(c.strip())
+        if not m:
+            continue
+
+        day_de = DAY_SHORT_TO_DE.get(m.group(2))
+        if day_de:
+            key = f"DS {m.group(1)} zu {m.group(2)}"
+            tmp.setdefault(day_de, {}).setdefault(key, {})[m.group(3).capitalize()] = c
+    return tmp
+
+
+def reference_extract(df: pd.DataFrame) -> dict:
+    """Die ursprüngliche Extraktion eines Blatts: {Kunden-Nr: Kunde als Dict}."""
+    cols = df.columns.tolist()
+    trip = detect_triplets(cols)
+    bmap = detect_bspalten(cols)
+    ds_trip = detect_ds_triplets(cols)
+
+    data = {}
+
+    for _, r in df.iterrows():
+        knr = norm(r.get("Nr", ""))
+        if not knr:
+            continue
+
+        bestell = []
+        for d_de in DAYS_DE:
+            day_items = []
+
+            # 1) Triplets
+            if d_de in trip:
+                for group_text, f in trip[d_de].items():
+                    s = norm(r.get(f.get("Sort")))
+                    t = safe_time(r.get(f.get("Zeit")))
+                    tag = norm(r.get(f.get("Tag")))
+
+                    if s or t or tag:
+                        actual_gid = canon_group_id(s)
+                        day_items.append({
+                            "liefertag": d_de,
+                            "sortiment": s,
+                            "bestelltag": tag,
+                            "bestellschluss": t,
+                            "prio": SORT_PRIO.get(actual_gid, 50)
+                        })
+
+            # 2) B-Spalten
+            keys = [k for k in bmap.keys() if k[0] == d_de]
+            for k in keys:
+                f = bmap[k]
+                s = norm(r.get(f.get("sort", "")))
+                z = safe_time(r.get(f.get("zeit", "")))
+
+                l_col = f.get("l")
+                if l_col:
+                    tag = norm(r.get(l_col, ""))
+                    if not tag:
+                        tag = k[2]  # Fallback Spaltennamen
+                else:
+                    tag = k[2]
+
+                if s or z:
+                    actual_gid = canon_group_id(s)
+                    day_items.append({
+                        "liefertag": d_de,
+                        "sortiment": s,
+                        "bestelltag": tag,
+                        "bestellschluss": z,
+                        "prio": SORT_PRIO.get(actual_gid, 50)
+                    })
+
+            # 3) Deutsche See
+            if d_de in ds_trip:
+                for key_ds in ds_trip[d_de]:
+                    f = ds_trip[d_de][key_ds]
+                    s = norm(r.get(f.get("Sort")))
+                    t = safe_time(r.get(f.get("Zeit")))
+                    tag = norm(r.get(f.get("Tag")))
+                    if s or t or tag:
+                        day_items.append({
+                            "liefertag": d_de,
+                            "sortiment": s,
+                            "bestelltag": tag,
+                            "bestellschluss": t,
+                            "prio": 5.5  # nach Avo (5), vor Werbemittel (6)
+                        })
+
+            day_items.sort(key=lambda x: x["prio"])
+            bestell.extend(day_items)
+
+        data[knr] = {
+            "plan_typ": PLAN_TYP,
+            "bereich": BEREICH,
+            "kunden_nr": knr,
+            "name": norm(r.get("Name", "")),
+            "strasse": norm(r.get("Strasse", "")),
+            "plz": norm(r.get("Plz", "")),
+            "ort": norm(r.get("Ort", "")),
+            "fachberater": norm(r.get("Fachberater", "")),
+            "tours": {d: norm(r.get(TOUR_COLS[d], "")) for d in DAYS_DE},
+            "bestell": bestell
+        }
+
+    return data
+
+
+def reference_frames(data: bytes, sheets: dict = None) -> dict:
+    """Blätter wie in der ursprünglichen App: pd.read_excel je Blatt (openpyxl)."""
+    frames = {}
+    for area_key, sheet_name in (sheets or SHEETS).items():
+        try:
+            frames[area_key] = pd.read_excel(io.BytesIO(data), sheet_name=sheet_name)
+        except ValueError:  # Blatt fehlt: wie in der App übersprungen
+            continue
+    return frames
+
+
+# --- Synthetische Arbeitsmappe ---------------------------------------------
+
+# Kürzel je Liefertag in wechselnden Schreibweisen (DAY_SHORT_TO_DE)
+_DAY_SPELLINGS = {
+    "Montag": ["Mo"], "Dienstag": ["Die", "Di"], "Mittwoch": ["Mitt", "Mit", "Mi"],
+    "Donnerstag": ["Don", "Donn", "Do"], "Freitag": ["Fr"], "Samstag": ["Sam", "Sa"],
+}
+_SORTIMENTE = ["", "", "Fleisch 21", "Wurst", "Wiesenhof", "Bio Geflügel", "Geflügel", "Avo Gewürze",
+               "Werbemittel", "Pfeiffer", "Schwein", "Sonderposten", " Frischfleisch  65 ", 1011, 21.0]
+_ZEITEN = ["", "", datetime.time(9, 30), datetime.time(14, 0), "10:00", "7:15", 9, 14.0, "12:00 Uhr",
+           "Montag", "Dienstag", "ca. 10", "Samstag "]
+_TAGE = ["", "Mo", "Di", "Dienstag", "Mittwoch", "Do", "Freitag", "Sa", " Montag "]
+
+
+def synthetic_columns(rng: random.Random) -> list:
+    """Kopfzeile mit allen erkannten Spaltenarten, Kürzel zufällig gewählt."""
+    cols = ["Nr", "Name", "Strasse", "Plz", "Ort", "Fachberater"] + [TOUR_COLS[d] for d in DAYS_DE]
+    for d_de in DAYS_DE:
+        d = rng.choice(_DAY_SPELLINGS[d_de])
+        cols += [f"{d} Fleisch Sort", f"{d} Fleisch Zeit", f"{d} Fleisch Tag"]  # Triplet
+        cols += [f"{d} Wurst Sortiment", f"{d} Wurst Uhrzeit", f"{d} Wurst Bestelltag"]
+        cols += [f"{d} Z Wiesenhof B_Di", f"{d} L Wiesenhof B_Di", f"{d} Wiesenhof B_Di"]  # B-Spalten mit L
+        cols += [f"{d} Z Avo B Mi", f"{d} Avo B Mi"]  # ohne L: Bestelltag aus dem Spaltennamen
+        cols += [f"{d} Z 41 Mo", f"{d} L 41 Mo"]  # ohne B
+        cols += [f"DS Fisch zu {d} Zeit", f"DS Fisch zu {d} Sort", f"DS Fisch zu {d} Tag"]
+    return cols + ["Bemerkung", "Leer"]
+
+
+def _synthetic_value(col: str, rng: random.Random):
+    if col == "Leer" or rng.random() < 0.35:
+        return None
+    last = col.rsplit(" ", 1)[-1]
+    if " L " in col:
+        return rng.choice(["", "", "Mittwoch", "Do"])  # meist leer -> Fallback k[2]
+    if " Z " in col or last in ("Zeit", "Uhrzeit"):
+        return rng.choice(_ZEITEN)
+    if last in ("Tag", "Bestelltag"):
+        return rng.choice(_TAGE)
+    if col == "Bemerkung":
+        return rng.choice(["", "Rampe 2", "nur vormittags"])
+    return rng.choice(_SORTIMENTE)
+
+
+def write_synthetic_workbook(fp, customers: int = 300, seed: int = 0, sheets: dict = None) -> None:
+    """
+    Arbeitsmappe mit allen Blättern und typischen Stolperstellen: Kürzel-Varianten,
+    B-Spalten mit/ohne L, Tagesnamen in Zeitzellen, Zahlen als Zeiten/Nummern,
+    geschützte Leerzeichen, leere und doppelte Kunden-Nr., eine leere Spalte.
+    """
+    from openpyxl import Workbook
+
+    rng = random.Random(seed)
+    wb = Workbook(write_only=True)
+    for sheet_name in (sheets or SHEETS).values():
+        ws = wb.create_sheet(sheet_name)
+        cols = synthetic_columns(rng)
+        ws.append(cols)
+        for i in range(customers):
+            knr = rng.choice([i + 1, float(i + 1), f" {i + 1} "]) if rng.random() > 0.02 else None
+            if i and rng.random() < 0.01:
+                knr = i  # doppelte Nummer: spätere Zeile gewinnt
+            row = [knr, f"Markt {i + 1}", f"Hauptstr. {i}", 17000 + i, "Neubrandenburg",
+                   rng.choice(["Krause", "Lange ", "", "Schmidt"])]
+            row += [rng.choice(["", 101, "102", 7.0, "—"]) for _ in DAYS_DE]
+            row += [_synthetic_value(c, rng) for c in cols[len(row):]]
+            ws.append(row)
+    wb.save(fp)
+
+
+def synthetic_workbook(customers: int = 300, seed: int = 0) -> bytes:
+    buf = io.BytesIO()
+    write_synthetic_workbook(buf, customers, seed)
+    return buf.getvalue()
+
+
+# --- Vergleich ---------------------------------------------------------------
+
+class Difference:
+    """Eine Abweichung: Bereich, Kunden-Nr, Feld (z.B. bestell[3].prio), Referenz- und Ist-Wert."""
+    __slots__ = ("area", "kunden_nr", "field", "expected", "actual")
+
+    def __init__(self, area, kunden_nr, field, expected, actual):
+        self.area = area
+        self.kunden_nr = kunden_nr
+        self.field = field
+        self.expected = expected
+        self.actual = actual
+
+    def __str__(self):
+        return f"{self.area} {self.kunden_nr} {self.field}: {self.expected!r} != {self.actual!r}"
+
+
+def _as_dict(kunde) -> dict:
+    return kunde if isinstance(kunde, dict) else kunde.to_dict()
+
+
+def _item_dict(item) -> dict:
+    return item if isinstance(item, dict) else item.to_dict()
+
+
+def diff_customer(area_key: str, knr: str, expected: dict, actual) -> list:
+    """Abweichungen eines Kunden; actual als Kunde oder Dict."""
+    actual = _as_dict(actual)
+    out = [Difference(area_key, knr, f, expected.get(f), actual.get(f))
+           for f in KUNDE_FIELDS if expected.get(f) != actual.get(f)]
+    exp_tours, act_tours = expected.get("tours", {}), actual.get("tours", {})
+    out += [Difference(area_key, knr, f"tours.{d}", exp_tours.get(d), act_tours.get(d))
+            for d in DAYS_DE if exp_tours.get(d) != act_tours.get(d)]
+
+    exp_items = [_item_dict(it) for it in expected.get("bestell", [])]
+    act_items = [_item_dict(it) for it in actual.get("bestell", [])]
+    if len(exp_items) != len(act_items):
+        out.append(Difference(area_key, knr, "len(bestell)", len(exp_items), len(act_items)))
+    for i, (e, a) in enumerate(zip(exp_items, act_items)):
+        # prio als Zahl vergleichen (5.5 bleibt 5.5, 0 == 0.0 wie im JSON)
+        out += [Difference(area_key, knr, f"bestell[{i}].{f}", e[f], a[f]) for f in ITEM_FIELDS if e[f] != a[f]]
+    return out
+
+
+def diff_all_data(expected: dict, actual: dict) -> list:
+    """
+    Abweichungen zwischen Referenz und Kandidat, Kunde für Kunde: fehlende und
+    zusätzliche Bereiche/Kunden, Felder, Positionen, Reihenfolge der Kunden.
+    """
+    out = []
+    for area_key in list(expected) + [a for a in actual if a not in expected]:
+        if area_key not in actual:
+            out.append(Difference(area_key, "*", "Bereich", "vorhanden", "fehlt"))
+            continue
+        if area_key not in expected:
+            out.append(Difference(area_key, "*", "Bereich", "fehlt", "vorhanden"))
+            continue
+        exp, act = expected[area_key], actual[area_key]
+        for knr, kunde in exp.items():
+            if knr not in act:
+                out.append(Difference(area_key, knr, "Kunde", "vorhanden", "fehlt"))
+            else:
+                out += diff_customer(area_key, knr, kunde, act[knr])
+        out += [Difference(area_key, knr, "Kunde", "fehlt", "vorhanden") for knr in act if knr not in exp]
+        common_exp = [k for k in exp if k in act]
+        common_act = [k for k in act if k in exp]
+        if common_exp != common_act:
+            pos = next(i for i, (a, b) in enumerate(zip(common_exp, common_act)) if a != b)
+            out.append(Difference(area_key, common_exp[pos], "Reihenfolge", f"Position {pos}",
+                                  f"Position {common_act.index(common_exp[pos])}"))
+    return out
+
+
+# --- Kandidaten --------------------------------------------------------------
+
+def _engine_path(engine: str, fmt: str = "xlsx"):
+    def run(src, sheets):
+        all_data, _, errors = process_workbook(src, sheets, engine=engine)
+        if errors:
+            raise RuntimeError("; ".join(errors.values()))
+        return all_data
+    run.fmt = fmt
+    return run
+
+
+def _jobs_path(src, sheets):
+    """Wie die App: ein Job je Bereich im gemeinsamen Prozess-Pool (inkl. Pool-Start)."""
+    from sendeplan_jobs import DONE, JobQueue
+
+    queue = JobQueue()
+    try:
+        jobs = [(area_key, queue.submit(area_key, src, {area_key: name})) for area_key, name in sheets.items()]
+        while not all(job.finished for _, job in jobs):
+            time.sleep(0.01)
+        all_data = {}
+        for area_key, job in jobs:
+            if job.state != DONE:
+                raise RuntimeError(job.error)
+            _, area_data, _, errors = job.result
+            if errors:
+                raise RuntimeError("; ".join(errors.values()))
+            all_data.update(area_data)
+        return all_data
+    finally:
+        queue.shutdown()
+
+
+_jobs_path.fmt = "xlsx"
+
+
+def candidate_paths() -> dict:
+    """Name -> run(Quelle, sheets) für alle hier verfügbaren Pfade; .fmt = benötigte Quelle."""
+    from sendeplan_readers import available_engines
+
+    paths = {engine: _engine_path(engine) for engine in available_engines()}
+    paths["csv"] = _engine_path(None, "csv")
+    paths["parquet"] = _engine_path(None, "parquet")
+    paths["jobs"] = _jobs_path
+    return paths
+
+
+class PathResult:
+    """Ergebnis eines Pfads: Zeit (bestes von runs), Abweichungen oder Fehler."""
+    __slots__ = ("name", "seconds", "differences", "error")
+
+    def __init__(self, name, seconds=None, differences=(), error=None):
+        self.name = name
+        self.seconds = seconds
+        self.differences = list(differences)
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.differences
+
+
+def _best_of(runs: int, fn):
+    best, result = None, None
+    for _ in range(max(1, runs)):
+        t0 = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def compare_paths(data: bytes, paths=None, sheets: dict = None, runs: int = 1) -> tuple:
+    """
+    Referenz und Kandidaten auf derselben Excel-Datei (Bytes).
+    Liefert (Referenz-Sekunden, Referenz-Extraktion-Sekunden, Kunden, [PathResult]);
+    verglichen werden die Blätter, die die Referenz lesen kann.
+    Erster Kandidat ist immer "extract_area": nur die Extraktion auf den
+    DataFrames der Referenz (ohne Lesen), gegen reference_extract.
+    """
+    from sendeplan_readers import export_sheets
+
+    sheets = sheets or SHEETS
+    available = candidate_paths()
+    paths = list(available) if paths is None else list(paths)
+    unknown = [p for p in paths if p not in available]
+    if unknown:
+        raise ValueError(f"Unbekannte Pfade: {', '.join(unknown)} (verfügbar: {', '.join(available)})")
+
+    def reference():
+        frames = reference_frames(data, sheets)
+        return frames, {area_key: reference_extract(df) for area_key, df in frames.items()}
+
+    ref_seconds, (frames, expected) = _best_of(runs, reference)
+    if not frames:
+        raise ValueError(f"Keines der Blätter gefunden: {', '.join(sheets.values())}")
+    sheets = {area_key: sheets[area_key] for area_key in frames}  # fehlende Blätter wie in der Referenz auslassen
+    ref_extract, _ = _best_of(runs, lambda: {a: reference_extract(df) for a, df in frames.items()})
+    customers = sum(len(d) for d in expected.values())
+
+    results = []
+    seconds, actual = _best_of(runs, lambda: {a: extract_area(df) for a, df in frames.items()})
+    results.append(PathResult("extract_area", seconds, diff_all_data(expected, actual)))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sources = {"xlsx": data}
+        for name in paths:
+            run = available[name]
+            try:
+                if run.fmt not in sources:  # Export vorab, nicht in der Zeit enthalten
+                    target = Path(tmp) / run.fmt
+                    export_sheets(io.BytesIO(data), target, list(sheets.values()), run.fmt)
+                    sources[run.fmt] = target
+                seconds, actual = _best_of(runs, lambda: run(sources[run.fmt], sheets))
+            except Exception as e:  # fehlende Engine/Bibliothek o.ä.: Pfad als Fehler melden
+                results.append(PathResult(name, error=f"{type(e).__name__}: {e}"))
+                continue
+            results.append(PathResult(name, seconds, diff_all_data(expected, actual)))
+    return ref_seconds, ref_extract, customers, results
+
+
+def format_report(title: str, ref_seconds: float, ref_extract: float, customers: int, results: list,
+                  max_diffs: int = 10) -> str:
+    """Textbericht: je Pfad OK/Abweichungen, Zeit und Faktor gegenüber der Referenz."""
+    lines = [f"{title}: {customers} Kunden, Referenz (iterrows) {ref_seconds:.2f} s, "
+             f"davon Extraktion {ref_extract:.2f} s"]
+    for r in results:
+        if r.error:
+            lines.append(f"  {r.name:<13} FEHLER  {r.error}")
+            continue
+        base = ref_extract if r.name == "extract_area" else ref_seconds
+        status = "OK" if r.ok else f"{len(r.differences)} Abweichungen"
+        lines.append(f"  {r.name:<13} {status:<16} {r.seconds:7.2f} s  {base / max(r.seconds, 1e-9):6.1f}x")
+        lines += [f"      {d}" for d in r.differences[:max_diffs]]
+        if len(r.differences) > max_diffs:
+            lines.append(f"      … {len(r.differences) - max_diffs} weitere")
+    return "\n".join(lines)
@@ -0,0 +1,144 @@
+# sendeplan_export.py
+# -----------------------------------------------------------------------------
+# Export des Langformats (Kunde x Liefertag x Sortiment + Tour) für BI/Routing:
+# CSV und Parquet portionsweise, SQLite per Bulk-Insert mit Indizes.
+# Die Zeilen werden direkt aus all_data erzeugt (keine zweite Vollkopie).
+# -----------------------------------------------------------------------------
+
+import csv
+import itertools
+import os
+import sqlite3
+from pathlib import Path
+
+from sendeplan_core import DAYS_DE, ITEM_COLUMNS, iter_schedule_rows
+
+EXPORT_FORMATS = ("csv", "parquet", "sqlite")
+CHUNK_ROWS = 20000
+
+CUSTOMER_COLUMNS = ["area", "kunden_nr", "name", "strasse", "plz", "ort", "fachberater"] + [
+    f"tour_{d.lower()}" for d in DAYS_DE
+]
+
+
+def iter_chunks(rows, size: int = CHUNK_ROWS):
+    it = iter(rows)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_customer_rows(all_data: dict):
+    for area_key, data in all_data.items():
+        for knr, k in data.items():
+            yield (area_key, knr, k.name, k.strasse, k.plz, k.ort, k.fachberater) + tuple(k.tours)
+
+
+def _replace_atomically(path: Path, write) -> int:
+    """Schreibt über eine temporäre Datei, damit Leser nie einen halben Export sehen."""
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        n = write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return n
+
+
+def export_csv(all_data: dict, path, chunk_rows: int = CHUNK_ROWS) -> int:
+    """CSV (Semikolon, UTF-8 mit BOM, wie die Manifeste). Gibt die Zeilenzahl zurück."""
+    def write(tmp):
+        n = 0
+        with open(tmp, "w", newline="", encoding="utf-8-sig") as f:
+            w = csv.writer(f, delimiter=";")
+            w.writerow(ITEM_COLUMNS)
+            for chunk in iter_chunks(iter_schedule_rows(all_data), chunk_rows):
+                w.writerows(chunk)
+                n += len(chunk)
+        return n
+
+    return _replace_atomically(Path(path), write)
+
+
+def export_parquet(all_data: dict, path, chunk_rows: int = CHUNK_ROWS) -> int:
+    """Parquet (eine Row-Group je Portion). Benötigt pyarrow."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise RuntimeError("Parquet-Export benötigt das Paket 'pyarrow'") from e
+
+    types = {"pos": pa.int32(), "prio": pa.float64()}
+    schema = pa.schema([(c, types.get(c, pa.string())) for c in ITEM_COLUMNS])
+
+    def write(tmp):
+        n = 0
+        with pq.ParquetWriter(tmp, schema, compression="zstd") as writer:
+            for chunk in iter_chunks(iter_schedule_rows(all_data), chunk_rows):
+                columns = list(zip(*chunk))
+                writer.write_table(pa.Table.from_arrays(
+                    [pa.array(col, type=schema.field(i).type) for i, col in enumerate(columns)],
+                    schema=schema,
+                ))
+                n += len(chunk)
+        return n
+
+    return _replace_atomically(Path(path), write)
+
+
+def export_sqlite(all_data: dict, path, chunk_rows: int = CHUNK_ROWS) -> int:
+    """
+    SQLite mit Tabellen 'schedule' (Langformat) und 'customers' (Stammdaten + Touren).
+    Indizes werden nach dem Laden angelegt (schneller als beim Einfügen).
+    """
+    def write(tmp):
+        n = 0
+        con = sqlite3.connect(tmp)
+        try:
+            con.execute("PRAGMA journal_mode=OFF")
+            con.execute("PRAGMA synchronous=OFF")
+            con.execute(
+                "CREATE TABLE schedule (area TEXT, kunden_nr TEXT, name TEXT, fachberater TEXT, "
+                "liefertag TEXT, pos INTEGER, sortiment TEXT, bestelltag TEXT, bestellschluss TEXT, "
+                "prio REAL, tour TEXT)"
+            )
+            con.execute(
+                "CREATE TABLE customers (" + ", ".join(f"{c} TEXT" for c in CUSTOMER_COLUMNS)
+                + ", PRIMARY KEY (area, kunden_nr))"
+            )
+            insert = f"INSERT INTO schedule VALUES ({', '.join('?' * len(ITEM_COLUMNS))})"
+            with con:
+                for chunk in iter_chunks(iter_schedule_rows(all_data), chunk_rows):
+                    con.executemany(insert, chunk)
+                    n += len(chunk)
+                con.executemany(
+                    f"INSERT INTO customers VALUES ({', '.join('?' * len(CUSTOMER_COLUMNS))})",
+                    iter_customer_rows(all_data),
+                )
+            with con:
+                con.execute("CREATE INDEX ix_schedule_customer ON schedule (area, kunden_nr)")
+                con.execute("CREATE INDEX ix_schedule_tour ON schedule (area, liefertag, tour)")
+                con.execute("CREATE INDEX ix_schedule_order ON schedule (bestelltag, bestellschluss)")
+            con.execute("ANALYZE")
+        finally:
+            con.close()
+        return n
+
+    return _replace_atomically(Path(path), write)
+
+
+def export_schedule(all_data: dict, path, fmt: str = None, chunk_rows: int = CHUNK_ROWS) -> int:
+    """Export im gewünschten Format (sonst aus der Dateiendung: .csv/.parquet/.sqlite/.db)."""
+    if fmt is None:
+        suffix = Path(path).suffix.lower().lstrip(".")
+        fmt = {"db": "sqlite", "sqlite3": "sqlite", "pq": "parquet"}.get(suffix, suffix)
+    if fmt == "csv":
+        return export_csv(all_data, path, chunk_rows)
+    if fmt == "parquet":
+        return export_parquet(all_data, path, chunk_rows)
+    if fmt == "sqlite":
+        return export_sqlite(all_data, path, chunk_rows)
+    raise ValueError(f"Unbekanntes Exportformat '{fmt}' (erlaubt: {', '.join(EXPORT_FORMATS)})")
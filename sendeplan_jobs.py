@@ -0,0 +1,236 @@
+# sendeplan_jobs.py
+# -----------------------------------------------------------------------------
+# Gemeinsame Job-Warteschlange für die Excel-Verarbeitung, wenn mehrere
+# Streamlit-Sitzungen gleichzeitig hochladen:
+# - ein begrenzter Prozess-Pool für alle Sitzungen (statt Parsen im Script-Thread),
+# - identische Uploads (gleicher Inhalt) laufen nur einmal,
+# - neue Jobs starten nur, solange der geschätzte Speicherbedarf ins Budget passt,
+# - Fortschritt je Job (Blätter erledigt / gesamt) zum Abfragen aus der Sitzung.
+# In der App einmal pro Prozess angelegt (st.cache_resource).
+# -----------------------------------------------------------------------------
+
+import collections
+import hashlib
+import os
+import threading
+import time
+
+from sendeplan_core import SHEETS, process_source
+
+QUEUED, RUNNING, DONE, FAILED = "wartet", "läuft", "fertig", "fehler"
+
+MEM_FACTOR = 40  # geschätzter Spitzenbedarf beim Einlesen je Byte .xlsx (openpyxl + DataFrames)
+MIN_JOB_MEMORY = 64 << 20
+KEEP_FINISHED = 600  # Sekunden, die fertige Ergebnisse für Wiederholungen/andere Sitzungen bleiben
+MAX_FINISHED = 16
+
+
+def available_memory() -> int:
+    """Verfügbarer Arbeitsspeicher in Bytes (Linux: MemAvailable), sonst 2 GiB als Annahme."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return 2 << 30
+
+
+def upload_key(data: bytes, sheets: dict = None) -> str:
+    """Inhalts-Schlüssel eines Uploads: gleiche Datei (egal welcher Name/Sitzung) = gleicher Job."""
+    h = hashlib.sha256(data)
+    h.update(repr(sorted((sheets or SHEETS).items())).encode("utf-8"))
+    return h.hexdigest()
+
+
+class Job:
+    """Ein Upload in der Warteschlange; result wie process_source: (Quelle, all_data, plans, errors)."""
+    __slots__ = ("key", "label", "size", "memory", "sheets", "state", "done", "total",
+                 "result", "error", "submitted_at", "started_at", "finished_at", "_data")
+
+    def __init__(self, key: str, label: str, data: bytes, sheets: dict):
+        self.key = key
+        self.label = label
+        self.size = len(data)
+        self.memory = max(MIN_JOB_MEMORY, self.size * MEM_FACTOR)
+        self.sheets = sheets
+        self.state = QUEUED
+        self.done = 0
+        self.total = len(sheets or SHEETS)
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._data = data
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (DONE, FAILED)
+
+    @property
+    def fraction(self) -> float:
+        if self.state == DONE:
+            return 1.0
+        return self.done / self.total if self.total else 0.0
+
+
+# --- Worker-Prozess ---
+
+_progress_queue = None
+
+
+def _init_worker(progress_queue):
+    global _progress_queue
+    _progress_queue = progress_queue
+
+
+def _run_job(key: str, label: str, data: bytes, sheets: dict) -> tuple:
+    def progress(done, total):
+        _progress_queue.put((key, done, total))
+
+    return process_source(label, data, sheets, progress)
+
+
+class JobQueue:
+    """
+    Begrenzter Prozess-Pool plus Warteschlange (FIFO). Ein Job startet, wenn ein
+    Worker frei ist und sein geschätzter Speicherbedarf zusammen mit den laufenden
+    Jobs ins Budget passt; ein einzelner Job läuft immer, auch wenn er allein zu groß ist.
+    """
+
+    def __init__(self, max_workers: int = None, memory_budget: int = None):
+        if max_workers is None:
+            max_workers = max(1, min(4, (os.cpu_count() or 2) - 1))
+        if memory_budget is None:
+            env_mb = os.environ.get("SENDEPLAN_PARSE_MEMORY_MB")
+            memory_budget = int(env_mb) << 20 if env_mb else available_memory() // 2
+        self.max_workers = max_workers
+        self.memory_budget = memory_budget
+        self._lock = threading.RLock()
+        self._jobs = {}
+        self._pending = collections.deque()
+        self._running = 0
+        self._running_memory = 0
+        self._pool = None
+        self._progress = None
+
+    def _ensure_pool(self):
+        if self._pool is not None:
+            return
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        ctx = multiprocessing.get_context("spawn")
+        if self._progress is None:
+            self._progress = ctx.Queue()
+            threading.Thread(target=self._progress_loop, name="sendeplan-progress", daemon=True).start()
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=ctx,
+            initializer=_init_worker, initargs=(self._progress,),
+        )
+
+    def _progress_loop(self):
+        while True:
+            msg = self._progress.get()
+            if msg is None:
+                return
+            key, done, total = msg
+            job = self._jobs.get(key)
+            if job is not None and job.state == RUNNING:
+                job.done, job.total = done, total
+
+    def submit(self, label: str, data: bytes, sheets: dict = None) -> Job:
+        """Job für einen Upload anlegen oder den laufenden/fertigen Job mit gleichem Inhalt liefern."""
+        key = upload_key(data, sheets)
+        with self._lock:
+            self._evict()
+            job = self._jobs.get(key)
+            if job is not None and job.state != FAILED:
+                return job
+            job = Job(key, label, data, sheets)
+            self._jobs[key] = job
+            self._pending.append(job)
+            self._pump()
+        return job
+
+    def get(self, key: str) -> Job:
+        return self._jobs.get(key)
+
+    def _pump(self):
+        # Aufruf nur mit gehaltenem Lock
+        while self._pending and self._running < self.max_workers:
+            job = self._pending[0]
+            if self._running and self._running_memory + job.memory > self.memory_budget:
+                return
+            self._pending.popleft()
+            self._ensure_pool()
+            job.state = RUNNING
+            job.started_at = time.time()
+            self._running += 1
+            self._running_memory += job.memory
+            pool = self._pool
+            try:
+                future = pool.submit(_run_job, job.key, job.label, job._data, job.sheets)
+            except Exception as e:  # BrokenProcessPool: Pool kaputt, bevor _finish es bemerkt hat
+                self._running -= 1
+                self._running_memory -= job.memory
+                job.error = f"{job.label}: Verarbeitung fehlgeschlagen ({e})"
+                job._data = None
+                job.finished_at = time.time()
+                job.state = FAILED
+                if self._pool is pool:  # nächster Job bekommt einen neuen Pool (_ensure_pool)
+                    self._pool = None
+                    pool.shutdown(wait=False)
+                continue
+            future.add_done_callback(lambda f, job=job, pool=pool: self._finish(job, pool, f))
+
+    def _finish(self, job: Job, pool, future):
+        from concurrent.futures.process import BrokenProcessPool
+
+        try:
+            job.result, state = future.result(), DONE
+        except Exception as e:
+            job.error, state = f"{job.label}: Verarbeitung fehlgeschlagen ({e})", FAILED
+            if isinstance(e, BrokenProcessPool):  # z.B. Worker vom System beendet (Speicher)
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None
+                        pool.shutdown(wait=False)
+        job._data = None
+        job.finished_at = time.time()
+        job.state = state  # zuletzt: Sitzungen lesen ohne Lock
+        with self._lock:
+            self._running -= 1
+            self._running_memory -= job.memory
+            self._pump()
+
+    def _evict(self):
+        # Aufruf nur mit gehaltenem Lock
+        now = time.time()
+        finished = sorted((j for j in self._jobs.values() if j.finished), key=lambda j: j.finished_at)
+        for i, job in enumerate(finished):
+            if now - job.finished_at > KEEP_FINISHED or i < len(finished) - MAX_FINISHED:
+                del self._jobs[job.key]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._running,
+                "queued": len(self._pending),
+                "memory_in_use": self._running_memory,
+                "memory_budget": self.memory_budget,
+                "max_workers": self.max_workers,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if self._progress is not None:
+            self._progress.put(None)
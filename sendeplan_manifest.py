@@ -0,0 +1,156 @@
+# sendeplan_manifest.py
+# -----------------------------------------------------------------------------
+# Tour-Manifeste je Liefertag: welche Kunden fährt Tour X am Tag Y, mit welchen
+# Sortimenten und Bestellschlüssen. Berechnung per group-by auf dem Langformat.
+# -----------------------------------------------------------------------------
+
+import datetime
+import html
+
+import pandas as pd
+
+from sendeplan_core import AREA_NAMES
+from sendeplan_schedule import clock_minutes, day_index, numeric_key, schedule_frame, tour_frame
+
+GROUP_KEYS = ["area", "liefertag", "tour"]
+CUSTOMER_KEYS = ["area", "kunden_nr", "liefertag"]
+
+LINE_COLUMNS = [
+    "area", "liefertag", "tour", "kunden_nr", "name", "strasse", "plz", "ort", "fachberater",
+    "positionen", "sortimente", "fruehester_bestellschluss",
+]
+SUMMARY_COLUMNS = ["area", "liefertag", "tour", "kunden", "positionen", "sortimente", "fruehester_bestellschluss"]
+
+
+def _with_cutoff(items: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ergänzt cut_key: Bestellschluss relativ zum Liefertag in Minuten (kleiner = früher).
+    Bestelltag gleich Liefertag zählt als Vorwoche; ohne Tag oder Uhrzeit bleibt NaN.
+    """
+    lead = (day_index(items["liefertag"]) - day_index(items["bestelltag"])) % 7
+    lead = lead.where(lead != 0, 7)
+    items = items.assign(cut_key=clock_minutes(items["bestellschluss"]) - lead * 24 * 60)
+    items["cut_label"] = (items["bestelltag"] + " " + items["bestellschluss"]).where(items["cut_key"].notna(), "")
+    return items
+
+
+def join_groups(items: pd.DataFrame, keys: list, col: str, sep: str) -> pd.Series:
+    """Texte je Gruppe in Zeilenreihenfolge verbinden (per group-by-Summe statt Python-join); auch im Kalender."""
+    joined = (items[col].astype(object) + sep).groupby([items[k] for k in keys], sort=False).sum()
+    return joined.str[:-len(sep)]
+
+
+def _earliest(items: pd.DataFrame, keys: list) -> pd.DataFrame:
+    """Frühester Bestellschluss je Gruppe (Zeilen ohne auswertbaren Schluss zählen nicht)."""
+    valid = items[items["cut_key"].notna()].sort_values("cut_key", kind="stable")
+    first = valid.drop_duplicates(keys, keep="first")
+    return first[keys + ["cut_label"]].rename(columns={"cut_label": "fruehester_bestellschluss"})
+
+
+def tour_manifest(all_data: dict) -> tuple:
+    """
+    Liefert (summary, lines):
+    summary = je Bereich x Liefertag x Tour: Kundenzahl, Positionen, Sortimente (mit Anzahl),
+              frühester Bestellschluss;
+    lines   = je Tour die Kunden (nach Kunden-Nr) mit Sortimenten und Bestellschluss.
+    """
+    tours = tour_frame(all_data)
+    if tours.empty:
+        # keine Touren (auch leere Daten): leere Tabellen mit festen Spalten
+        return pd.DataFrame(columns=SUMMARY_COLUMNS), pd.DataFrame(columns=LINE_COLUMNS)
+    items = schedule_frame(all_data)
+    items = _with_cutoff(items[items["tour"].str.strip().ne("") & items["tour"].ne("—")])
+
+    # Kunde x Liefertag: Sortimente als Text, Positionen, frühester Schluss
+    label = items["sortiment"].where(items["sortiment"].ne(""), "(ohne Sortiment)")
+    detail = (items["bestelltag"] + " " + items["bestellschluss"]).str.strip()
+    items["label"] = label + (" (" + detail + ")").where(detail.ne(""), "")
+    items = items.sort_values(CUSTOMER_KEYS + ["pos"], kind="stable")
+    grouped = items.groupby(CUSTOMER_KEYS, sort=False)
+    per_customer = (
+        pd.DataFrame({"positionen": grouped.size(), "sortimente": join_groups(items, CUSTOMER_KEYS, "label", "; ")})
+        .reset_index()
+        .merge(_earliest(items, CUSTOMER_KEYS), on=CUSTOMER_KEYS, how="left")
+    )
+
+    lines = tours.merge(per_customer, on=CUSTOMER_KEYS, how="left")
+    lines["positionen"] = lines["positionen"].fillna(0).astype("int64")
+    lines[["sortimente", "fruehester_bestellschluss"]] = lines[["sortimente", "fruehester_bestellschluss"]].fillna("")
+    lines = (
+        lines.assign(
+            _area=lines["area"].map({k: i for i, k in enumerate(all_data)}),
+            _day=day_index(lines["liefertag"]),
+            _tour=numeric_key(lines["tour"].str.replace(r"\D", "", regex=True)),
+            _knr=numeric_key(lines["kunden_nr"]),
+        )
+        .sort_values(["_area", "_day", "_tour", "tour", "_knr"], kind="stable")
+        .reset_index(drop=True)
+    )
+
+    # Tour: Kunden, Positionen, Sortimente mit Anzahl, frühester Schluss
+    counts = items.groupby(GROUP_KEYS + ["sortiment"]).size().reset_index(name="n")
+    counts = counts[counts["sortiment"].ne("")]
+    # astype(str): ohne Positionen ist die leere group-by-Spalte object statt str
+    counts["txt"] = counts["sortiment"].astype(str) + " ×" + counts["n"].astype(str)
+    summary = (
+        lines.groupby(GROUP_KEYS + ["_area", "_day", "_tour"], sort=False)
+        .agg(kunden=("kunden_nr", "size"), positionen=("positionen", "sum"))
+        .reset_index()
+        .merge(join_groups(counts, GROUP_KEYS, "txt", ", ").rename("sortimente").reset_index(),
+               on=GROUP_KEYS, how="left")
+        .merge(_earliest(items, GROUP_KEYS), on=GROUP_KEYS, how="left")
+        .fillna({"sortimente": "", "fruehester_bestellschluss": ""})
+    )
+
+    return summary[SUMMARY_COLUMNS], lines[LINE_COLUMNS]
+
+
+def write_manifest_csv(lines: pd.DataFrame, path_or_buf) -> None:
+    """CSV für Excel (Semikolon, UTF-8 mit BOM)."""
+    lines.to_csv(path_or_buf, sep=";", index=False, encoding="utf-8-sig")
+
+
+def manifest_html(summary: pd.DataFrame, lines: pd.DataFrame) -> str:
+    """Druckbare Übersicht: je Bereich und Liefertag eine Seite, je Tour eine Tabelle."""
+    e = html.escape
+    stand = datetime.date.today().strftime("%d.%m.%Y")
+    out = [
+        '<!doctype html>\n<html lang="de">\n<head>\n<meta charset="utf-8">\n<title>Tour-Manifeste</title>\n<style>',
+        """
+  @page { size: A4 portrait; margin: 12mm 10mm; }
+  * { box-sizing:border-box; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; }
+  body { margin:0; background:#fff; color:#000; }
+  .manifest { padding: 10mm; page-break-after: always; }
+  @media print { .manifest { padding: 0; } tr { page-break-inside: avoid; } }
+  .manifest h1 { color:#1e3a5f; font-size: 18pt; margin: 0 0 2mm 0; }
+  .manifest h2 { color:#1e3a5f; font-size: 12pt; margin: 5mm 0 1mm 0; }
+  .manifest .meta { color:#5f6368; font-size: 9pt; margin-bottom: 1mm; }
+  .manifest table { width:100%; border-collapse: collapse; font-size: 8.5pt; }
+  .manifest th { background:#1e3a5f; color:#fff; text-align:left; padding: 1mm; }
+  .manifest td { border-bottom: 1px solid #dadce0; padding: 1mm; vertical-align: top; color:#000; }
+</style>
+</head>
+<body>""",
+    ]
+    lines_by_tour = dict(iter(lines.groupby(GROUP_KEYS, sort=False)))
+    for (area_key, day), day_summary in summary.groupby(["area", "liefertag"], sort=False):
+        out.append('<div class="manifest">')
+        out.append(f"<h1>Tour-Manifest {e(AREA_NAMES.get(area_key, area_key))} – {e(day)}</h1>")
+        out.append(f'<div class="meta">Stand: {stand} · {int(day_summary["kunden"].sum())} Kunden '
+                   f'auf {len(day_summary)} Touren</div>')
+        for row in day_summary.itertuples(index=False):
+            out.append(f"<h2>Tour {e(row.tour)}</h2>")
+            out.append(f'<div class="meta">{row.kunden} Kunden · {row.positionen} Positionen'
+                       + (f" · frühester Bestellschluss: {e(row.fruehester_bestellschluss)}"
+                          if row.fruehester_bestellschluss else "")
+                       + (f"<br>{e(row.sortimente)}" if row.sortimente else "") + "</div>")
+            out.append("<table><thead><tr><th>#</th><th>Kunden-Nr</th><th>Name</th><th>Ort</th>"
+                       "<th>Sortimente (Bestelltag Bestellschluss)</th></tr></thead><tbody>")
+            tour_lines = lines_by_tour[(area_key, day, row.tour)]
+            for i, ln in enumerate(tour_lines.itertuples(index=False), start=1):
+                out.append(f"<tr><td>{i}</td><td>{e(ln.kunden_nr)}</td><td>{e(ln.name)}</td>"
+                           f"<td>{e(ln.plz)} {e(ln.ort)}</td><td>{e(ln.sortimente)}</td></tr>")
+            out.append("</tbody></table>")
+        out.append("</div>")
+    out.append("</body>\n</html>\n")
+    return "\n".join(out)
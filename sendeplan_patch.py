@@ -0,0 +1,136 @@
+# sendeplan_patch.py
+# -----------------------------------------------------------------------------
+# Kleine Update-Dateien für bereits verteilte Sendepläne: statt der kompletten
+# HTML nur die Kunden, die seit einem Stand hinzugekommen, entfallen oder
+# geändert sind, je Bereich. Ein Stand ist der DATA_HASH, den write_html in die
+# HTML einbettet; der Patch nennt Ausgangs- und Zielstand:
+#   {"format": "sendeplan-patch", "v": 1, "base": "<Hash>", "target": "<Hash>",
+#    "created": "2024-03-18T06:30:00",
+#    "areas": {"mk": {"set": {"4711": {...Kunde...}}, "remove": ["4712"]}}}
+# Weicht die Reihenfolge der Kunden eines Bereichs (bzw. der Bereiche) nach dem
+# Anwenden von der des Ziels ab, steht sie zusätzlich im Patch ("order" je
+# Bereich, "area_order"), damit das Ergebnis wieder genau den Ziel-Hash hat.
+# Der Viewer ("Update laden") prüft base gegen seinen aktuellen Stand, wendet
+# den Patch auf seine Daten an und merkt sich das Ergebnis im IndexedDB-Cache.
+# Ohne pandas.
+# -----------------------------------------------------------------------------
+
+import datetime
+import json
+import re
+from pathlib import Path
+
+from sendeplan_core import Kunde, all_data_from_dict, data_hash, record_to_json
+
+PATCH_FORMAT = "sendeplan-patch"
+PATCH_VERSION = 1
+
+_RX_DATA_HASH = re.compile(r'DATA_HASH\s*=\s*"(\w*)"')
+
+
+def diff_data(base: dict, new: dict) -> dict:
+    """
+    {Bereich: {"set": {Kunden-Nr: Kunde}, "remove": [Kunden-Nr]}} für alle
+    Bereiche mit Änderungen; neue und geänderte Kunden stehen beide in set.
+    """
+    areas = {}
+    for area_key in list(new) + [a for a in base if a not in new]:
+        old, cur = base.get(area_key, {}), new.get(area_key, {})
+        changed = {knr: k for knr, k in cur.items() if old.get(knr) != k}
+        removed = [knr for knr in old if knr not in cur]
+        if changed or removed:
+            areas[area_key] = {"set": changed, "remove": removed}
+    return areas
+
+
+def _apply_areas(all_data: dict, areas: dict) -> dict:
+    out = {area_key: dict(data) for area_key, data in all_data.items()}
+    for area_key, d in areas.items():
+        data = out.setdefault(area_key, {})
+        for knr in d.get("remove", []):
+            data.pop(knr, None)
+        data.update(d.get("set", {}))
+        if "order" in d:
+            data = out[area_key] = {knr: data[knr] for knr in d["order"]}
+        if not data:
+            del out[area_key]
+    return out
+
+
+def make_patch(base: dict, new: dict, base_hash: str = None) -> dict:
+    """
+    Patch von base nach new; base_hash wie in der verteilten HTML (sonst aus base berechnet).
+    Reihenfolgen nur, wo das bloße Anwenden von set/remove sie nicht schon ergibt.
+    """
+    areas = diff_data(base, new)
+    applied = _apply_areas(base, areas)
+    for area_key, data in new.items():
+        if list(applied.get(area_key, ())) != list(data):
+            areas.setdefault(area_key, {"set": {}, "remove": []})["order"] = list(data)
+    patch = {
+        "format": PATCH_FORMAT,
+        "v": PATCH_VERSION,
+        "base": base_hash or data_hash(base),
+        "target": data_hash(new),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "areas": areas,
+    }
+    if list(applied) != list(new):
+        patch["area_order"] = list(new)
+    return patch
+
+
+def patch_counts(patch: dict) -> dict:
+    """{Bereich: (neu/geändert, entfernt)} für Ausgaben."""
+    return {a: (len(d.get("set", {})), len(d.get("remove", []))) for a, d in patch["areas"].items()}
+
+
+def write_patch(fp, patch: dict) -> int:
+    """Patch als kompaktes JSON in ein Binär-File; gibt die Byte-Anzahl zurück."""
+    raw = json.dumps(patch, ensure_ascii=False, separators=(",", ":"), default=record_to_json)
+    return fp.write(raw.encode("utf-8"))
+
+
+def load_patch(fp) -> dict:
+    """Patch lesen und prüfen; Kunden in set als Kunde."""
+    raw = json.load(fp)
+    if not isinstance(raw, dict) or raw.get("format") != PATCH_FORMAT:
+        raise ValueError("Keine Sendeplan-Patch-Datei")
+    if raw.get("v") != PATCH_VERSION:
+        raise ValueError(f"Unbekannte Patch-Version {raw.get('v')}")
+    for d in raw["areas"].values():
+        d["set"] = {knr: Kunde.from_dict(k) for knr, k in d.get("set", {}).items()}
+        d["remove"] = list(d.get("remove", []))
+    return raw
+
+
+def apply_patch(all_data: dict, patch: dict, current_hash: str = None) -> dict:
+    """
+    Neues all_data = all_data + patch (all_data bleibt unverändert). Prüft den
+    Ausgangsstand gegen current_hash bzw. den Hash von all_data; das Ergebnis
+    hat die Reihenfolge des Ziels und damit den Hash patch["target"].
+    """
+    current = current_hash or data_hash(all_data)
+    if patch["base"] != current:
+        raise ValueError(f"Patch gilt für Stand {patch['base'][:12]}, vorliegend ist {current[:12]}")
+    out = _apply_areas(all_data, patch["areas"])
+    if "area_order" in patch:
+        out = {area_key: out.get(area_key, {}) for area_key in patch["area_order"]}
+    return out
+
+
+def read_sendeplan(raw: bytes) -> tuple:
+    """(all_data, DATA_HASH) aus den Bytes einer Sendeplan-HTML oder einer JSON aus build --json."""
+    if raw.lstrip()[:1] == b"{":
+        all_data = all_data_from_dict(json.loads(raw))
+        return all_data, data_hash(all_data)
+
+    from sendeplan_cutoffs import read_sendeplan_html
+
+    all_data, _ = read_sendeplan_html(raw)
+    m = _RX_DATA_HASH.search(raw.decode("utf-8"))
+    return all_data, (m.group(1) if m and m.group(1) else data_hash(all_data))
+
+
+def load_sendeplan(path) -> tuple:
+    return read_sendeplan(Path(path).read_bytes())
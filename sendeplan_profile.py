@@ -0,0 +1,53 @@
+# sendeplan_profile.py
+# -----------------------------------------------------------------------------
+# Profil eines einzelnen Laufs (Einlesen, Extraktion, HTML) auf Anfrage aus dem
+# Debug-Bereich: Top-Funktionen nach kumulierter und eigener Zeit plus die
+# Rohdaten als .prof (lesbar mit `python -m pstats` oder snakeviz).
+# Ohne Anforderung wird cProfile nicht einmal importiert.
+# -----------------------------------------------------------------------------
+
+import cProfile
+import marshal
+import os
+import pstats
+
+SORT_KEYS = {"cumulative": 3, "tottime": 2}  # Index in (cc, nc, tt, ct, callers)
+
+
+def new_profiler() -> cProfile.Profile:
+    return cProfile.Profile()
+
+
+def _location(key: tuple) -> str:
+    filename, line, _ = key
+    if filename == "~":  # eingebaute Funktion
+        return "(builtin)"
+    return f"{os.path.basename(filename)}:{line}"
+
+
+def top_functions(profiler: cProfile.Profile, sort: str = "cumulative", limit: int = 25) -> list:
+    """Die teuersten Funktionen als Tabellenzeilen; sort = 'cumulative' oder 'tottime'."""
+    entries = pstats.Stats(profiler).stats
+    total = sum(tt for _, _, tt, _, _ in entries.values()) or 1.0
+    idx = SORT_KEYS[sort]
+    rows = []
+    for key, entry in sorted(entries.items(), key=lambda kv: kv[1][idx], reverse=True)[:limit]:
+        cc, nc, tt, ct, _ = entry
+        rows.append({
+            "Funktion": key[2],
+            "Ort": _location(key),
+            "Aufrufe": str(nc) if nc == cc else f"{nc}/{cc}",  # rekursiv: gesamt/primitiv
+            "eigene Zeit (s)": round(tt, 4),
+            "kumuliert (s)": round(ct, 4),
+            "Anteil eigen": f"{tt / total:.1%}",
+        })
+    return rows
+
+
+def total_time(profiler: cProfile.Profile) -> float:
+    return sum(tt for _, _, tt, _, _ in pstats.Stats(profiler).stats.values())
+
+
+def profile_bytes(profiler: cProfile.Profile) -> bytes:
+    """Rohprofil im Format von Profile.dump_stats."""
+    return marshal.dumps(pstats.Stats(profiler).stats)
@@ -0,0 +1,212 @@
+# sendeplan_readers.py
+# -----------------------------------------------------------------------------
+# Einlesen der Blätter als DataFrame, unabhängig von der Quelle:
+# - Excel (.xlsx) mit der schnellsten verfügbaren Engine: python-calamine
+#   (Rust, optional) oder openpyxl als Rückfall,
+# - Exporte derselben Blätter als CSV oder Parquet, je Blatt eine Datei
+#   "<Blattname>.csv" / "<Blattname>.parquet" in einem Ordner oder ZIP.
+# Alle Quellen ergeben dieselben Werte nach norm/safe_time: Zahlen erkennen
+# read_csv/read_parquet spaltenweise wie read_excel. Uhrzeitzellen schreibt
+# export_sheets als "HH:MM" (normalize_time liest das wie datetime.time), Text
+# wie "09:30:00" bleibt Text; reine Datumsspalten werden beim Lesen wieder
+# datetime64 wie bei read_excel (leere Zellen NaT).
+# Engine-Wahl: Argument engine, sonst SENDEPLAN_EXCEL_ENGINE, sonst "auto".
+# -----------------------------------------------------------------------------
+
+import datetime
+import importlib.util
+import io
+import os
+import zipfile
+from pathlib import Path
+
+import pandas as pd
+
+EXCEL_ENGINES = {"calamine": "python_calamine", "openpyxl": "openpyxl"}  # Engine -> Modul
+ENGINES = ("auto",) + tuple(EXCEL_ENGINES)
+SHEET_SUFFIXES = (".parquet", ".csv")
+
+_CSV_SEPARATORS = (";", ",", "\t")
+# Zellen, die to_csv aus Datumsspalten (datetime64) schreibt
+_RX_DATE_TEXT = r"\d{4}-\d{2}-\d{2}(?: \d{2}:\d{2}:\d{2}(?:\.\d+)?)?"
+
+
+def excel_engine(engine: str = None) -> str:
+    """'auto' (bzw. None) -> calamine, wenn installiert, sonst openpyxl."""
+    engine = engine or os.environ.get("SENDEPLAN_EXCEL_ENGINE") or "auto"
+    if engine not in ENGINES:
+        raise ValueError(f"Unbekannte Engine '{engine}' (erlaubt: {', '.join(ENGINES)})")
+    if engine == "auto":
+        return available_engines()[0]
+    return engine
+
+
+def available_engines() -> list:
+    """Installierte Excel-Engines, schnellste zuerst."""
+    return [e for e, module in EXCEL_ENGINES.items() if importlib.util.find_spec(module)]
+
+
+def _frame_for_export(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Uhrzeitzellen (datetime.time) als "HH:MM": so bleiben sie von Textzellen wie
+    "09:30:00" unterscheidbar und ergeben nach safe_time dasselbe wie aus Excel.
+    """
+    df = df.copy()
+    for col in df.columns:
+        s = df[col]
+        if s.dtype == object and s.map(type).eq(datetime.time).any():
+            df[col] = s.map(lambda v: v.strftime("%H:%M") if isinstance(v, datetime.time) else v)
+    return df
+
+
+def _frame_for_parquet(df: pd.DataFrame) -> pd.DataFrame:
+    """Gemischte Spalten (z.B. Zahl/Text) als Text, wie sie to_csv schreiben würde."""
+    df = df.copy()
+    for col in df.columns:
+        s = df[col]
+        if s.dtype != object:
+            continue
+        kinds = set(s.dropna().map(type))
+        if len(kinds) > 1:
+            df[col] = s.map(lambda v: v if v is None or v != v else str(v))
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+def _restore_cell_types(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Textspalten, die nur aus to_csv-Datumswerten bestehen, zurück zu datetime64 wie
+    bei read_excel (leere Zellen NaT). Gemischte Spalten bleiben Text wie in Excel.
+    """
+    for col in df.columns:
+        s = df[col]
+        if not pd.api.types.is_string_dtype(s.dtype):
+            continue
+        text = s.dropna()
+        if text.empty or not text.map(type).eq(str).all():
+            continue
+        if text.str.fullmatch(_RX_DATE_TEXT).all():
+            df[col] = pd.to_datetime(s, format="ISO8601")
+    return df
+
+
+def _read_csv(data: bytes) -> pd.DataFrame:
+    """CSV aus pandas (Komma, UTF-8) oder Excel (Semikolon, UTF-8-BOM/cp1252)."""
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        text = data.decode("cp1252")
+    header = text.split("\n", 1)[0]
+    sep = max(_CSV_SEPARATORS, key=header.count)
+    return pd.read_csv(io.StringIO(text), sep=sep)
+
+
+def _read_parquet(data: bytes) -> pd.DataFrame:
+    return pd.read_parquet(io.BytesIO(data))
+
+
+# --- Quellen ---
+
+class ExcelSource:
+    """Excel-Datei mit fester Engine; parse(Blattname) -> DataFrame."""
+    __slots__ = ("engine", "_xls")
+
+    def __init__(self, src, engine: str):
+        self.engine = engine
+        self._xls = pd.ExcelFile(src, engine=engine)
+
+    @property
+    def sheet_names(self) -> list:
+        return list(self._xls.sheet_names)
+
+    def parse(self, sheet_name: str) -> pd.DataFrame:
+        return self._xls.parse(sheet_name)
+
+
+class SheetFilesSource:
+    """Je Blatt eine CSV-/Parquet-Datei; files: {Blattname: (Endung, Lesefunktion -> Bytes)}."""
+    __slots__ = ("engine", "_files")
+
+    def __init__(self, files: dict):
+        self.engine = "dateien"
+        self._files = files
+
+    @property
+    def sheet_names(self) -> list:
+        return list(self._files)
+
+    def parse(self, sheet_name: str) -> pd.DataFrame:
+        if sheet_name not in self._files:
+            raise ValueError(f"Blatt '{sheet_name}' fehlt (keine .csv/.parquet-Datei)")
+        suffix, read = self._files[sheet_name]
+        data = read()
+        return _restore_cell_types(_read_parquet(data) if suffix == ".parquet" else _read_csv(data))
+
+
+def _sheet_files(names, read) -> dict:
+    files = {}
+    for name in names:
+        p = Path(name)
+        if p.suffix.lower() in SHEET_SUFFIXES and not p.name.startswith(("._", "~$")):
+            # Parquet vor CSV, falls beide vorliegen
+            if p.stem not in files or p.suffix.lower() == ".parquet":
+                files[p.stem] = (p.suffix.lower(), lambda name=name: read(name))
+    return files
+
+
+def _is_sheet_archive(zf: zipfile.ZipFile) -> bool:
+    names = zf.namelist()
+    return "[Content_Types].xml" not in names and any(Path(n).suffix.lower() in SHEET_SUFFIXES for n in names)
+
+
+def open_source(src, engine: str = None):
+    """
+    Öffnet Pfad, Bytes oder File-Objekt: Ordner bzw. ZIP mit Blatt-Dateien,
+    sonst Excel mit der gewählten Engine.
+    """
+    if isinstance(src, (bytes, bytearray)):
+        src = io.BytesIO(src)
+    if isinstance(src, (str, os.PathLike)) and Path(src).is_dir():
+        root = Path(src)
+        return SheetFilesSource(_sheet_files(sorted(p.name for p in root.iterdir()),
+                                             lambda name: (root / name).read_bytes()))
+    if zipfile.is_zipfile(src):
+        zf = zipfile.ZipFile(src)
+        if _is_sheet_archive(zf):
+            return SheetFilesSource(_sheet_files(zf.namelist(), zf.read))
+    if hasattr(src, "seek"):
+        src.seek(0)
+    return ExcelSource(src, excel_engine(engine))
+
+
+def export_sheets(src, target, sheet_names, fmt: str = "csv", engine: str = None) -> int:
+    """
+    Schreibt die Blätter einer Excel-Datei je als <Blattname>.csv/.parquet
+    in einen Ordner oder (Endung .zip) ein ZIP. Liefert die Anzahl Blätter.
+    """
+    if fmt not in ("csv", "parquet"):
+        raise ValueError(f"Unbekanntes Format '{fmt}' (csv oder parquet)")
+    source = open_source(src, engine)
+    target = Path(target)
+    zf = zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) if target.suffix.lower() == ".zip" else None
+    if zf is None:
+        target.mkdir(parents=True, exist_ok=True)
+    count = 0
+    try:
+        for sheet_name in sheet_names:
+            df = _frame_for_export(source.parse(sheet_name))
+            buf = io.BytesIO()
+            if fmt == "parquet":
+                _frame_for_parquet(df).to_parquet(buf, index=False)
+            else:
+                df.to_csv(buf, index=False, encoding="utf-8")
+            name = f"{sheet_name}.{fmt}"
+            if zf is not None:
+                zf.writestr(name, buf.getvalue())
+            else:
+                (target / name).write_bytes(buf.getvalue())
+            count += 1
+    finally:
+        if zf is not None:
+            zf.close()
+    return count
@@ -0,0 +1,57 @@
+# sendeplan_schedule.py
+# -----------------------------------------------------------------------------
+# Langformat des extrahierten Plans (eine Zeile je Kunde x Liefertag x Sortiment)
+# als pandas-DataFrame, Grundlage für Manifeste, Exporte und Auswertungen.
+# -----------------------------------------------------------------------------
+
+import numpy as np
+import pandas as pd
+
+from sendeplan_core import DAY_INDEX, DAYS_DE, ITEM_COLUMNS, clock_to_minutes, iter_schedule_rows
+
+TOUR_COLUMNS = ["area", "kunden_nr", "name", "strasse", "plz", "ort", "fachberater", "liefertag", "tour"]
+
+
+def schedule_frame(all_data: dict) -> pd.DataFrame:
+    """
+    Eine Zeile je Bestell-Position: Kunde x Liefertag x Sortiment mit Bestelltag,
+    Bestellschluss, Prio und der Tour des Liefertags. pos = Reihenfolge im Plan des Kunden.
+    """
+    df = pd.DataFrame.from_records(list(iter_schedule_rows(all_data)), columns=ITEM_COLUMNS)
+    df["pos"] = df["pos"].astype("int32")
+    df["prio"] = df["prio"].astype("float64")
+    return df
+
+
+def tour_frame(all_data: dict) -> pd.DataFrame:
+    """Eine Zeile je Kunde x Liefertag mit eingetragener Tour (leere Touren und '—' entfallen)."""
+    rows = [
+        (area_key, knr, k.name, k.strasse, k.plz, k.ort, k.fachberater, day, tour)
+        for area_key, data in all_data.items()
+        for knr, k in data.items()
+        for day, tour in zip(DAYS_DE, k.tours)
+        if tour.strip() and tour != "—"
+    ]
+    return pd.DataFrame.from_records(rows, columns=TOUR_COLUMNS)
+
+
+def clock_minutes(s: pd.Series) -> pd.Series:
+    """'10:00 Uhr' / '09:30:00' -> Minuten seit Mitternacht (float, NaN wenn keine Uhrzeit)."""
+    # nur die (wenigen) verschiedenen Werte parsen, dann per Index verteilen
+    codes, uniques = pd.factorize(s)
+    parsed = np.full(len(uniques) + 1, np.nan)
+    for i, v in enumerate(uniques):
+        minutes = clock_to_minutes(v)
+        if minutes is not None:
+            parsed[i] = minutes
+    return pd.Series(parsed[codes], index=s.index)
+
+
+def day_index(s: pd.Series) -> pd.Series:
+    """Wochentag (voll oder Kürzel) -> 0..6, sonst NaN."""
+    return s.map(DAY_INDEX).astype(float)
+
+
+def numeric_key(s: pd.Series) -> pd.Series:
+    """Wie Number(x) || 0 im Viewer: für die Sortierung nach Kunden- bzw. Tournummer."""
+    return pd.to_numeric(s, errors="coerce").fillna(0)
@@ -0,0 +1,189 @@
+# sendeplan_server.py
+# -----------------------------------------------------------------------------
+# Kleiner lokaler HTTP-Dienst: liefert einzelne Kundenpläne aus einer einmal
+# eingelesenen Excel-Datei (JSON oder HTML), plus Listen je Liefertag/Tour.
+# Start: python sendeplan_cli.py serve Sendeplan.xlsx --port 8765
+#
+#   GET  /areas                                   Bereiche mit Kundenanzahl
+#   GET  /area/{area}/customer/{knr}[?format=html] ein Kunde
+#   GET  /area/{area}/day/{liefertag}             Kunden des Tages, nach Tour sortiert
+#   GET  /area/{area}/day/{liefertag}/tour/{nr}   Kunden einer Tour
+#   POST /reload                                  Excel-Datei neu einlesen
+# -----------------------------------------------------------------------------
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from sendeplan_core import (
+    AREA_NAMES,
+    DAYS_DE,
+    delivery_day_keys,
+    load_logo_data_uri,
+    process_workbook,
+    record_to_json,
+    render_customer_page,
+)
+
+
+class PlanStore:
+    """
+    Eingelesene Excel-Datei plus vorberechnete Tageslisten.
+    Wird bei Reload komplett ersetzt (kein Sperren beim Lesen nötig).
+    """
+    __slots__ = ("path", "stamp", "all_data", "errors", "day_lists", "tour_lists", "loaded_at")
+
+    def __init__(self, path: str, stamp, all_data: dict, errors: dict):
+        self.path = path
+        self.stamp = stamp
+        self.all_data = all_data
+        self.errors = errors
+        self.loaded_at = time.time()
+        self.day_lists = {}
+        self.tour_lists = {}
+        for area_key, data in all_data.items():
+            for i, day in enumerate(DAYS_DE):
+                rows = [
+                    {"kunden_nr": k, "name": data[k].name, "tour": data[k].tours[i]}
+                    for k in delivery_day_keys(data, day)
+                ]
+                self.day_lists[(area_key, day)] = rows
+                for row in rows:
+                    self.tour_lists.setdefault((area_key, day, row["tour"]), []).append(row)
+
+    @classmethod
+    def load(cls, path: str) -> "PlanStore":
+        stamp = file_stamp(path)
+        all_data, _, errors = process_workbook(path)
+        return cls(path, stamp, all_data, errors)
+
+
+def file_stamp(path: str):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class PlanService:
+    """Hält den aktuellen PlanStore und lädt ihn bei Änderungen der Datei neu."""
+
+    def __init__(self, path: str, logo_uri: str = ""):
+        self.path = path
+        self.logo_uri = logo_uri
+        self.store = PlanStore.load(path)
+        self._reload_lock = threading.Lock()
+
+    def reload(self, force: bool = False) -> bool:
+        with self._reload_lock:
+            stamp = file_stamp(self.path)
+            if not force and stamp == self.store.stamp:
+                return False
+            self.store = PlanStore.load(self.path)
+            return True
+
+    def watch(self, interval: float = 5.0):
+        """Hintergrund-Thread: lädt neu, sobald die Datei geändert und fertig geschrieben ist."""
+        def loop():
+            pending = None
+            while True:
+                time.sleep(interval)
+                try:
+                    stamp = file_stamp(self.path)
+                except OSError:
+                    continue
+                if stamp == self.store.stamp:
+                    pending = None
+                elif stamp == pending:  # zwei Prüfungen unverändert -> fertig geschrieben
+                    try:
+                        self.reload()
+                    except Exception as e:
+                        print(f"Reload fehlgeschlagen: {e}")
+                    pending = None
+                else:
+                    pending = stamp
+
+        t = threading.Thread(target=loop, name="sendeplan-reload", daemon=True)
+        t.start()
+        return t
+
+
+class PlanRequestHandler(BaseHTTPRequestHandler):
+    service: PlanService = None  # wird in make_server gesetzt
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, obj, status: int = 200):
+        body = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=record_to_json)
+        self._send(status, body.encode("utf-8"), "application/json; charset=utf-8")
+
+    def _error(self, status: int, msg: str):
+        self._json({"error": msg}, status)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        query = parse_qs(url.query)
+        store = self.service.store
+
+        if parts == ["areas"]:
+            return self._json({
+                "loaded_at": store.loaded_at,
+                "errors": store.errors,
+                "areas": {k: {"name": AREA_NAMES.get(k, k), "kunden": len(v)} for k, v in store.all_data.items()},
+            })
+
+        if len(parts) < 2 or parts[0] != "area":
+            return self._error(404, "Unbekannter Pfad")
+        area_key = parts[1]
+        data = store.all_data.get(area_key)
+        if data is None:
+            return self._error(404, f"Bereich '{area_key}' nicht gefunden")
+
+        if len(parts) == 4 and parts[2] == "customer":
+            kunde = data.get(parts[3])
+            if kunde is None:
+                return self._error(404, f"Kunde {parts[3]} nicht gefunden")
+            fmt = query.get("format", [""])[0]
+            if fmt == "html" or (not fmt and "text/html" in self.headers.get("Accept", "")):
+                page = render_customer_page(kunde, self.service.logo_uri)
+                return self._send(200, page.encode("utf-8"), "text/html; charset=utf-8")
+            return self._json(kunde)
+
+        if len(parts) >= 4 and parts[2] == "day":
+            day = parts[3]
+            if day not in DAYS_DE:
+                return self._error(404, f"Unbekannter Liefertag '{day}'")
+            rows = store.day_lists[(area_key, day)]
+            if len(parts) == 4:
+                return self._json(rows)
+            if len(parts) == 6 and parts[4] == "tour":
+                return self._json(store.tour_lists.get((area_key, day, parts[5]), []))
+
+        return self._error(404, "Unbekannter Pfad")
+
+    def do_POST(self):
+        if urlsplit(self.path).path.rstrip("/") != "/reload":
+            return self._error(404, "Unbekannter Pfad")
+        try:
+            changed = self.service.reload(force=True)
+        except Exception as e:
+            return self._error(500, f"Reload fehlgeschlagen: {e}")
+        return self._json({"reloaded": changed, "loaded_at": self.service.store.loaded_at})
+
+
+def make_server(path: str, host: str = "127.0.0.1", port: int = 8765, logo_uri: str = None) -> ThreadingHTTPServer:
+    service = PlanService(path, load_logo_data_uri() if logo_uri is None else logo_uri)
+    handler = type("BoundPlanRequestHandler", (PlanRequestHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.service = service
+    return server
@@ -0,0 +1,120 @@
+# sendeplan_shards.py
+# -----------------------------------------------------------------------------
+# Ein eigener, kleiner Viewer je Fachberater statt der Gesamt-HTML mit allen
+# Kunden aller Bereiche: all_data wird über alle Bereiche nach dem Feld
+# Fachberater aufgeteilt, jede Teil-HTML (gleiches Template, nur die eigenen
+# 50–200 Kunden, Planvarianten ebenso gefiltert) parallel im Prozess-Pool
+# erzeugt und in einen Ordner oder ein ZIP geschrieben.
+# -----------------------------------------------------------------------------
+
+import io
+import os
+import zipfile
+from pathlib import Path
+
+from sendeplan_core import safe_path_part, write_html
+
+NO_FACHBERATER = "ohne Fachberater"
+
+
+def shard_key(fachberater: str) -> str:
+    return (fachberater or "").strip() or NO_FACHBERATER
+
+
+def split_by_fachberater(all_data: dict) -> dict:
+    """
+    {Fachberater: all_data-Ausschnitt}, nach Namen sortiert; Bereichs- und
+    Kundenreihenfolge wie in all_data. Kunden ohne Fachberater unter NO_FACHBERATER.
+    """
+    shards = {}
+    for area_key, data in all_data.items():
+        for knr, kunde in data.items():
+            shards.setdefault(shard_key(kunde.fachberater), {}).setdefault(area_key, {})[knr] = kunde
+    return {fb: shards[fb] for fb in sorted(shards, key=str.casefold)}
+
+
+def shard_variants(variants: dict, shard: dict) -> dict:
+    """Deltas der Planvarianten auf die Kunden eines Ausschnitts beschränkt (alle Namen bleiben wählbar)."""
+    if not variants:
+        return None
+    return {
+        name: {
+            area_key: {knr: k for knr, k in changed.items() if knr in shard.get(area_key, {})}
+            for area_key, changed in delta.items()
+            if area_key in shard
+        }
+        for name, delta in variants.items()
+    }
+
+
+def shard_filenames(names) -> dict:
+    """Fachberater -> Dateiname sendeplan_<Name>.html, eindeutig auch nach dem Ersetzen von Sonderzeichen."""
+    out, used = {}, set()
+    for fb in names:
+        base = "sendeplan_" + safe_path_part(fb, "Fachberater").replace(" ", "_")
+        name, n = base, 1
+        while name.casefold() in used:
+            n += 1
+            name = f"{base}_{n}"
+        used.add(name.casefold())
+        out[fb] = name + ".html"
+    return out
+
+
+def render_shard(fachberater: str, shard: dict, logo_uri: str = "", variants: dict = None) -> tuple:
+    """(Fachberater, Anzahl Kunden, HTML-Bytes) eines Ausschnitts; läuft auch im Worker-Prozess."""
+    buf = io.BytesIO()
+    write_html(buf, shard, logo_uri, variants)
+    return fachberater, sum(len(d) for d in shard.values()), buf.getvalue()
+
+
+def render_shards(shards: dict, logo_uri: str = "", variants: dict = None, max_workers: int = None):
+    """
+    Teil-HTMLs zu split_by_fachberater (parallel ab zwei Workern);
+    liefert (Fachberater, Kunden, Bytes) in der Reihenfolge von shards.
+    """
+    tasks = [(fb, shard, logo_uri, shard_variants(variants, shard)) for fb, shard in shards.items()]
+    if max_workers is None:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+
+    if max_workers <= 1 or len(tasks) <= 1:
+        yield from (render_shard(*t) for t in tasks)
+        return
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+        futures = [pool.submit(render_shard, *t) for t in tasks]
+        for f in futures:
+            yield f.result()
+
+
+def write_shards(target, all_data: dict, logo_uri: str = "", variants: dict = None,
+                 max_workers: int = None) -> list:
+    """
+    Schreibt je Fachberater eine Sendeplan-HTML in einen Ordner, ein ZIP (Pfad auf
+    .zip) oder ein Binär-File (als ZIP). Liefert [(Fachberater, Dateiname, Kunden, Bytes)].
+    """
+    shards = split_by_fachberater(all_data)
+    filenames = shard_filenames(shards)
+    zf = None
+    if hasattr(target, "write") or Path(target).suffix.lower() == ".zip":
+        zf = zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED)
+    else:
+        target = Path(target)
+        target.mkdir(parents=True, exist_ok=True)
+
+    written = []
+    try:
+        for fb, customers, html in render_shards(shards, logo_uri, variants, max_workers):
+            if zf is not None:
+                zf.writestr(filenames[fb], html)
+            else:
+                (target / filenames[fb]).write_bytes(html)
+            written.append((fb, filenames[fb], customers, len(html)))
+    finally:
+        if zf is not None:
+            zf.close()
+    return written
@@ -0,0 +1,299 @@
+# sendeplan_variants.py
+# -----------------------------------------------------------------------------
+# Planvarianten (z.B. Oster- oder Weihnachtswoche) als Overlay auf den einmal
+# eingelesenen Standardplan statt einer zweiten, fast gleichen Excel-Datei.
+# Eine Variante ist eine Liste von Regeln (JSON), z.B.:
+#   {"name": "Ostern", "rules": [
+#     {"match": {"liefertag": "Freitag"}, "map": {"liefertag": {"Freitag": "Donnerstag"},
+#                                                 "bestelltag": {"Mittwoch": "Dienstag"}}},
+#     {"match": {"area": "mk"}, "set": {"bestellschluss": "08:00"}},
+#     {"match": {"liefertag": "Samstag", "tour": ["12", "14"]}, "cancel": true}]}
+# Regeln wirken der Reihe nach als Masken auf das Langformat (Bestell-Positionen)
+# und die Touren je Kunde x Liefertag. Touren ändern sich nur bei Regeln, deren
+# match allein Tour-Spalten nutzt (Bereich, Kunde, Fachberater, Liefertag, Tour):
+# verschobene Liefertage nehmen dann ihre Tour mit, cancel leert die Tour.
+# Tage in Regeln und Daten gelten in jeder Schreibweise ('Di.', 'dienstag'),
+# verglichen über day_to_index; geänderte Tage stehen danach voll ausgeschrieben.
+# Ergebnis je Variante: nur die geänderten Kunden (Delta), eingebettet in
+# dieselbe Sendeplan-HTML (Auswahl "Plan" im Viewer).
+# -----------------------------------------------------------------------------
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from sendeplan_core import DAYS_DE, PLAN_TYP, BestellItem, Kunde, day_to_index, normalize_time
+from sendeplan_schedule import schedule_frame
+
+ITEM_MATCH = ("area", "kunden_nr", "fachberater", "liefertag", "sortiment", "bestelltag", "bestellschluss", "tour")
+TOUR_MATCH = ("area", "kunden_nr", "fachberater", "liefertag", "tour")
+ITEM_EDIT = ("liefertag", "sortiment", "bestelltag", "bestellschluss")
+TOUR_EDIT = ("liefertag", "tour")
+
+_KEY = ["area", "kunden_nr"]
+_DAY_KEY = ["area", "kunden_nr", "liefertag"]
+_DAY_POS = {d: i for i, d in enumerate(DAYS_DE)}
+_WEEKDAYS = DAYS_DE + ["Sonntag"]
+
+
+def _day(value):
+    """Tag in beliebiger Schreibweise (wie day_to_index) -> voller Name, None wenn kein Tag."""
+    day = day_to_index(value)
+    return None if day is None else _WEEKDAYS[day]
+
+
+def _liefertag(value) -> str:
+    day = _day(value)
+    if day not in _DAY_POS:
+        raise ValueError(f"Ungültiger Liefertag '{value}' (erlaubt: {', '.join(DAYS_DE)})")
+    return day
+
+
+def _bestelltag(value) -> str:
+    day = _day(value)
+    if day is None:
+        raise ValueError(f"Ungültiger Bestelltag '{value}' (erlaubt: {', '.join(_WEEKDAYS)})")
+    return day
+
+
+def _canon(col: str, value) -> str:
+    """Regelwerte wie die extrahierten Daten schreiben (Tage voll, Uhrzeit 'HH:MM Uhr')."""
+    if col == "liefertag":
+        return _liefertag(value)
+    if col == "bestelltag":
+        return _bestelltag(value)
+    if col == "bestellschluss":
+        return normalize_time(value)
+    return str(value).strip()
+
+
+class VariantRule:
+    """Eine Regel: match (Spalte -> Wert oder Liste) plus map, set oder cancel."""
+    __slots__ = ("match", "map", "set", "cancel")
+
+    def __init__(self, match: dict, map: dict = None, set: dict = None, cancel: bool = False):
+        self.match = {
+            col: [_canon(col, v) for v in (vals if isinstance(vals, list) else [vals])]
+            for col, vals in (match or {}).items()
+        }
+        self.map = {
+            col: {_canon(col, old): _canon(col, new) for old, new in pairs.items()}
+            for col, pairs in (map or {}).items()
+        }
+        self.set = {col: _canon(col, v) for col, v in (set or {}).items()}
+        self.cancel = bool(cancel)
+
+        unknown = [c for c in self.match if c not in ITEM_MATCH]
+        if unknown:
+            raise ValueError(f"Unbekannte match-Spalte(n): {', '.join(unknown)} (erlaubt: {', '.join(ITEM_MATCH)})")
+        edits = list(self.map) + list(self.set)
+        if self.cancel == bool(edits):
+            raise ValueError("Regel braucht entweder cancel oder map/set")
+        allowed = TOUR_EDIT + ITEM_EDIT if self.tour_level else ITEM_EDIT
+        bad = [c for c in edits if c not in allowed]
+        if bad:
+            raise ValueError(
+                f"Spalte(n) {', '.join(bad)} nicht änderbar"
+                + (" (Tour nur bei match auf Tour-Spalten)" if "tour" in bad else "")
+            )
+
+    @property
+    def tour_level(self) -> bool:
+        """Regel betrifft auch die Touren (match nur auf Tour-Spalten)."""
+        return all(c in TOUR_MATCH for c in self.match)
+
+    def to_dict(self) -> dict:
+        d = {"match": {c: v[0] if len(v) == 1 else v for c, v in self.match.items()}}
+        if self.cancel:
+            d["cancel"] = True
+        if self.map:
+            d["map"] = self.map
+        if self.set:
+            d["set"] = self.set
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "VariantRule":
+        return cls(d.get("match"), d.get("map"), d.get("set"), d.get("cancel", False))
+
+
+class PlanVariant:
+    """Benannte Variante des Standardplans; name erscheint im Viewer als Plan-Typ."""
+    __slots__ = ("name", "rules")
+
+    def __init__(self, name: str, rules):
+        name = str(name or "").strip()
+        if not name or name == PLAN_TYP:
+            raise ValueError(f"Variante braucht einen Namen (nicht '{PLAN_TYP}')")
+        self.name = name
+        self.rules = list(rules)
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "rules": [r.to_dict() for r in self.rules]}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "PlanVariant":
+        rules = []
+        for i, r in enumerate(d.get("rules", []), 1):
+            try:
+                rules.append(VariantRule.from_dict(r))
+            except ValueError as e:
+                raise ValueError(f"Variante '{d.get('name')}', Regel {i}: {e}") from None
+        return cls(d.get("name"), rules)
+
+
+def load_variants(fp) -> list:
+    """Varianten aus JSON (ein Objekt oder eine Liste von Objekten), Datei oder Pfad."""
+    if isinstance(fp, (str, bytes)) or hasattr(fp, "__fspath__"):
+        with open(fp, "rb") as f:
+            raw = json.load(f)
+    else:
+        raw = json.load(fp)
+    return [PlanVariant.from_dict(d) for d in (raw if isinstance(raw, list) else [raw])]
+
+
+# --- Anwenden ---
+
+def _tour_rows(all_data: dict) -> pd.DataFrame:
+    """Kunde x Liefertag (alle Tage, auch ohne Tour) mit Fachberater für match."""
+    rows = [
+        (area_key, knr, k.fachberater, day, tour)
+        for area_key, data in all_data.items()
+        for knr, k in data.items()
+        for day, tour in zip(DAYS_DE, k.tours)
+    ]
+    return pd.DataFrame.from_records(rows, columns=["area", "kunden_nr", "fachberater", "liefertag", "tour"])
+
+
+def _bestelltage(s: pd.Series) -> pd.Series:
+    """Bestelltage der Daten voll ausgeschrieben (Vergleich mit den Regeln); andere Werte bleiben."""
+    return s.map({v: _day(v) or v for v in s.unique()})
+
+
+def _values(df: pd.DataFrame, col: str) -> pd.Series:
+    return _bestelltage(df[col]) if col == "bestelltag" else df[col]
+
+
+def _mask(df: pd.DataFrame, match: dict) -> np.ndarray:
+    m = np.ones(len(df), dtype=bool)
+    for col, values in match.items():
+        m &= _values(df, col).isin(values).to_numpy()
+    return m
+
+
+def _edit(df: pd.DataFrame, m: np.ndarray, rule: VariantRule, cols) -> pd.DataFrame:
+    """map, dann set auf die Zeilen der Maske (nur Spalten aus cols)."""
+    for col, pairs in rule.map.items():
+        if col in cols:
+            old = df.loc[m, col]
+            new = _values(df.loc[m], col).map(pairs)  # nicht zugeordnete Werte bleiben wie geschrieben
+            df.loc[m, col] = new.where(new.notna(), old)
+    for col, value in rule.set.items():
+        if col in cols:
+            df.loc[m, col] = value
+    return df
+
+
+def _edit_tours(tours: pd.DataFrame, m: np.ndarray, rule: VariantRule) -> pd.DataFrame:
+    moved = _edit(tours.loc[m].copy(), slice(None), rule, TOUR_EDIT)
+    if "liefertag" not in rule.map and "liefertag" not in rule.set:
+        tours.loc[m, "tour"] = moved["tour"]
+        return tours
+    # verschobene Tage nehmen ihre Tour mit (ein Tag ohne Tour überschreibt keine bestehende);
+    # der alte Tag bleibt leer, sofern nichts dorthin verschoben wird
+    moved = moved[moved["tour"].str.strip().ne("") & moved["tour"].ne("—")]
+    vacated = tours.loc[m].assign(tour="")
+    tours = pd.concat([tours.loc[~m], vacated, moved], ignore_index=True)
+    return tours.drop_duplicates(_DAY_KEY, keep="last")
+
+
+def _refresh_item_tours(items: pd.DataFrame, tours: pd.DataFrame) -> None:
+    """Tour je Position nach verschobenen Liefertagen/geänderten Touren neu zuordnen."""
+    lookup = pd.Series(tours["tour"].to_numpy(), index=pd.MultiIndex.from_frame(tours[_DAY_KEY]))
+    items["tour"] = lookup.reindex(pd.MultiIndex.from_frame(items[_DAY_KEY])).fillna("").to_numpy()
+
+
+def _rebuild(all_data: dict, items: pd.DataFrame, tours: pd.DataFrame, keys: pd.DataFrame) -> dict:
+    """Geänderte Kunden aus den Frames neu aufbauen; nur echte Unterschiede zum Standard."""
+    keys = pd.MultiIndex.from_frame(keys.drop_duplicates())
+    items = items[pd.MultiIndex.from_frame(items[_KEY]).isin(keys)]
+    tours = tours[pd.MultiIndex.from_frame(tours[_KEY]).isin(keys)]
+
+    # Reihenfolge wie extract_area: Liefertag, dann Prio, bei Gleichstand Plan-Reihenfolge
+    items = items.assign(_day=items["liefertag"].map(_DAY_POS)).sort_values(
+        ["area", "kunden_nr", "_day", "prio", "pos"], kind="stable")
+    bestell = {}
+    for area_key, knr, lt, sortiment, bt, bs, prio in zip(
+        items["area"], items["kunden_nr"], items["liefertag"], items["sortiment"],
+        items["bestelltag"], items["bestellschluss"], items["prio"],
+    ):
+        prio = int(prio) if prio.is_integer() else prio  # wie extrahiert (SORT_PRIO-Werte sind int)
+        bestell.setdefault((area_key, knr), []).append(BestellItem(lt, sortiment, bt, bs, prio))
+    tour_map = {(a, k, d): t for a, k, d, t in zip(tours["area"], tours["kunden_nr"], tours["liefertag"], tours["tour"])}
+
+    delta = {}
+    for area_key, knr in keys:
+        base = all_data[area_key][knr]
+        kunde = Kunde(
+            base.kunden_nr, base.name, base.strasse, base.plz, base.ort, base.fachberater,
+            tuple(tour_map.get((area_key, knr, d), "") for d in DAYS_DE),
+            bestell.get((area_key, knr), []),
+        )
+        if kunde != base:
+            delta.setdefault(area_key, {})[knr] = kunde
+    return {a: delta[a] for a in all_data if a in delta}  # Bereichsreihenfolge wie all_data
+
+
+def apply_variant(all_data: dict, variant: PlanVariant, frames: tuple = None) -> dict:
+    """
+    Regeln einer Variante auf all_data anwenden. Liefert das Delta
+    {bereich: {kunden_nr: Kunde}} mit allen Kunden, die sich gegenüber dem Standard ändern.
+    frames = (Langformat, Touren) aus variant_frames, um sie für mehrere Varianten wiederzuverwenden.
+    """
+    items, tours = frames if frames is not None else variant_frames(all_data)
+    items, tours = items.copy(), tours.copy()
+    touched = []
+    stale = False
+    for rule in variant.rules:
+        if stale and "tour" in rule.match:
+            _refresh_item_tours(items, tours)
+            stale = False
+        m_items = _mask(items, rule.match)
+        touched.append(items.loc[m_items, _KEY])
+        if rule.tour_level:
+            m_tours = _mask(tours, rule.match)
+            touched.append(tours.loc[m_tours, _KEY])
+            if rule.cancel:
+                tours.loc[m_tours, "tour"] = ""
+            elif "tour" in rule.map or "tour" in rule.set or "liefertag" in rule.map or "liefertag" in rule.set:
+                tours = _edit_tours(tours, m_tours, rule)
+            stale = stale or rule.cancel or any(c in TOUR_EDIT for c in list(rule.map) + list(rule.set))
+        if rule.cancel:
+            items = items.loc[~m_items]
+        else:
+            items = _edit(items, m_items, rule, ITEM_EDIT)
+            stale = stale or "liefertag" in rule.map or "liefertag" in rule.set
+    if not touched:
+        return {}
+    return _rebuild(all_data, items, tours, pd.concat(touched, ignore_index=True))
+
+
+def variant_frames(all_data: dict) -> tuple:
+    """Langformat und Touren des Standardplans, einmal für alle Varianten."""
+    return schedule_frame(all_data), _tour_rows(all_data)
+
+
+def apply_variants(all_data: dict, variants) -> dict:
+    """{Variantenname: Delta} für alle Varianten, in Reihenfolge."""
+    names = [v.name for v in variants]
+    dupes = sorted({n for n in names if names.count(n) > 1})
+    if dupes:
+        raise ValueError(f"Variantenname mehrfach: {', '.join(dupes)}")
+    frames = variant_frames(all_data)
+    return {v.name: apply_variant(all_data, v, frames) for v in variants}
+
+
+def variant_data(all_data: dict, delta: dict) -> dict:
+    """Vollständiger Plan einer Variante (Standard mit überschriebenen Kunden), z.B. für Exporte."""
+    return {area_key: {**data, **delta.get(area_key, {})} for area_key, data in all_data.items()}
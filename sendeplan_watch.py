@@ -0,0 +1,191 @@
+# sendeplan_watch.py
+# -----------------------------------------------------------------------------
+# Ordner-Überwachung für den täglichen Excel-Export: neue oder geänderte
+# .xlsx-Dateien werden erkannt, sobald sie fertig geschrieben sind, und die
+# Ausgaben (HTML, optional Einzelseiten-ZIP, JSON, Langformat, Manifeste)
+# werden neu erzeugt. Start: python sendeplan_cli.py watch /pfad/zum/ordner
+#
+# Läuft in einem Prozess ohne Pool, damit Caches zwischen den Läufen warm
+# bleiben (Spaltenpläne, Sortiments-IDs, Template, importierte Bibliotheken).
+# -----------------------------------------------------------------------------
+
+import os
+import time
+import zipfile
+from pathlib import Path
+
+from sendeplan_core import (
+    SHEETS,
+    load_logo_data_uri,
+    process_workbook,
+    template_parts,
+    write_customer_zip,
+    write_data_json,
+    write_html,
+)
+
+WATCH_PATTERN = "*.xlsx"
+
+
+def file_stamp(path: Path):
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def is_complete(path: Path) -> bool:
+    """xlsx ist ein ZIP: erst mit zentralem Verzeichnis am Ende vollständig geschrieben."""
+    try:
+        return zipfile.is_zipfile(path)
+    except OSError:
+        return False
+
+
+def _write_file(path: Path, write):
+    """Über eine temporäre Datei schreiben, damit Leser nie eine halbe Ausgabe sehen."""
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "wb") as fp:
+            result = write(fp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return result
+
+
+def log(msg: str):
+    print(f"[{time.strftime('%H:%M:%S')}] {msg}", flush=True)
+
+
+class FolderWatcher:
+    """
+    Prüft den Ordner alle interval Sekunden. Eine Datei gilt als fertig, wenn
+    Größe und Änderungszeit bei zwei Prüfungen gleich sind und sie ein gültiges ZIP ist.
+    Ausgaben landen in out_dir als <Dateiname>.html usw.
+    """
+
+    def __init__(self, folder, out_dir=None, logo_uri: str = None, zip_pages: bool = False,
+                 zip_inline: bool = False, json_data: bool = False, exports=(), manifest: bool = False,
+                 engine: str = None, interval: float = 5.0):
+        self.folder = Path(folder)
+        self.out_dir = Path(out_dir) if out_dir else self.folder / "sendeplan"
+        self.logo_uri = load_logo_data_uri() if logo_uri is None else logo_uri
+        self.zip_pages = zip_pages
+        self.zip_inline = zip_inline
+        self.json_data = json_data
+        self.exports = list(exports)
+        self.manifest = manifest
+        self.engine = engine
+        self.interval = interval
+        self._done = {}  # Pfad -> Stempel der zuletzt verarbeiteten Version
+        self._pending = {}  # Pfad -> Stempel der letzten Prüfung (noch nicht stabil)
+
+    def outputs(self, path: Path) -> list:
+        stem = self.out_dir / path.stem
+        out = [stem.with_suffix(".html")]
+        if self.zip_pages:
+            out.append(stem.with_name(stem.name + "_einzelseiten.zip"))
+        if self.json_data:
+            out.append(stem.with_suffix(".json"))
+        out += [stem.with_name(f"{stem.name}_langformat.{fmt}") for fmt in self.exports]
+        if self.manifest:
+            out += [stem.with_name(stem.name + "_manifeste.html"), stem.with_name(stem.name + "_manifeste.csv")]
+        return out
+
+    def scan(self) -> dict:
+        stamps = {}
+        for path in sorted(self.folder.glob(WATCH_PATTERN)):
+            if path.name.startswith(("~$", ".")):  # Excel-Sperrdateien, versteckte Dateien
+                continue
+            try:
+                stamps[path] = file_stamp(path)
+            except OSError:
+                continue  # gerade verschoben/gelöscht
+        return stamps
+
+    def _up_to_date(self, path: Path, stamp) -> bool:
+        """Nach einem Neustart: Ausgaben neuer als die Datei -> nicht erneut erzeugen."""
+        try:
+            return all(p.stat().st_mtime_ns >= stamp[0] for p in self.outputs(path))
+        except OSError:
+            return False
+
+    def poll(self, settle: bool = True) -> list:
+        """
+        Eine Prüfung; verarbeitet fertige neue/geänderte Dateien. settle=False
+        verarbeitet ohne zweite Prüfung (für --once). Liefert die verarbeiteten Pfade.
+        """
+        stamps = self.scan()
+        for path in list(self._pending):
+            if path not in stamps:
+                del self._pending[path]
+
+        processed = []
+        for path, stamp in stamps.items():
+            if self._done.get(path) == stamp:
+                continue
+            if path not in self._done and self._up_to_date(path, stamp):
+                self._done[path] = stamp
+                continue
+            if settle and self._pending.get(path) != stamp:
+                self._pending[path] = stamp  # beim nächsten Mal prüfen, ob unverändert
+                continue
+            if not is_complete(path):
+                self._pending[path] = stamp
+                continue
+            self._pending.pop(path, None)
+            self.regenerate(path)
+            self._done[path] = stamp
+            processed.append(path)
+        return processed
+
+    def regenerate(self, path: Path) -> bool:
+        t0 = time.perf_counter()
+        try:
+            all_data, _, errors = process_workbook(path, engine=self.engine)
+        except Exception as e:
+            log(f"FEHLER {path.name}: {e}")
+            return False
+        for msg in errors.values():
+            log(f"FEHLER {path.name}: {msg}")
+        if not all_data:
+            log(f"{path.name}: keine Daten, Ausgaben unverändert")
+            return False
+        t_read = time.perf_counter() - t0
+
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        html_path, *extra = self.outputs(path)
+        _write_file(html_path, lambda fp: write_html(fp, all_data, self.logo_uri))
+        if self.zip_pages:
+            _write_file(extra.pop(0), lambda fp: write_customer_zip(fp, all_data, self.logo_uri, self.zip_inline))
+        if self.json_data:
+            _write_file(extra.pop(0), lambda fp: write_data_json(fp, all_data))
+        if self.exports:
+            from sendeplan_export import export_schedule
+
+            for fmt in self.exports:
+                export_schedule(all_data, extra.pop(0), fmt)
+        if self.manifest:
+            from sendeplan_manifest import manifest_html, tour_manifest, write_manifest_csv
+
+            summary, lines = tour_manifest(all_data)
+            _write_file(extra.pop(0), lambda fp: fp.write(manifest_html(summary, lines).encode("utf-8")))
+            _write_file(extra.pop(0), lambda fp: write_manifest_csv(lines, fp))
+
+        customers = sum(len(d) for d in all_data.values())
+        log(f"{path.name}: {customers} Kunden in {len(all_data)}/{len(SHEETS)} Bereichen -> {self.out_dir} "
+            f"(Einlesen {t_read:.1f} s, gesamt {time.perf_counter() - t0:.1f} s)")
+        return True
+
+    def run(self, once: bool = False):
+        template_parts()  # Template einmal laden/verkleinern, bevor die erste Datei kommt
+        log(f"Überwache {self.folder} ({WATCH_PATTERN}, alle {self.interval:g} s) -> {self.out_dir}")
+        if once:
+            self.poll(settle=False)
+            return
+        while True:
+            try:
+                self.poll()
+            except Exception as e:  # Ordner kurz nicht erreichbar o.ä.: weiter beobachten
+                log(f"Prüfung fehlgeschlagen: {e}")
+            time.sleep(self.interval)
@@ -0,0 +1,22 @@
+# tests/conftest.py
+# -----------------------------------------------------------------------------
+# Gemeinsame Fixtures: Repo-Wurzel auf sys.path (flache sendeplan_*-Module) und
+# ein leerer Cache-Ordner je Test statt ~/.cache/sendeplan.
+# -----------------------------------------------------------------------------
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """SENDEPLAN_CACHE_DIR auf einen leeren Ordner, Spaltenplan-Cache im Speicher geleert."""
+    import sendeplan_core
+
+    monkeypatch.setenv("SENDEPLAN_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(sendeplan_core, "_HEADER_PLANS", {})
+    return tmp_path
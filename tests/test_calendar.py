@@ -0,0 +1,58 @@
+# tests/test_calendar.py
+# -----------------------------------------------------------------------------
+# Lieferkalender: CSV für Excel (BOM, Semikolon, CRLF, Maskierung) und ICS-Events
+# je Kunde in zeitlicher Reihenfolge.
+# -----------------------------------------------------------------------------
+
+import io
+import re
+
+from sendeplan_calendar import CALENDAR_COLUMNS, calendar_events, expand_calendar, ics_files, write_calendar_csv
+from sendeplan_core import BestellItem, Kunde
+
+ALL_DATA = {"mk": {
+    "1": Kunde("1", 'Markt "A"; B', "Weg 1", "10001", "Ort", "Krause", ("7", "", "", "8", "", ""),
+               [BestellItem("Montag", 'Obst; "x"', "Freitag", "10:00 Uhr", 0),
+                BestellItem("Donnerstag", "Fleisch", "Di", "09:30 Uhr", 1),
+                BestellItem("Donnerstag", "Wurst", "Mi", "", 2)]),
+    "2": Kunde("2", "Markt 2", "Weg 2", "10002", "Ort", "Krause", ("",) * 6, []),
+}}
+START, END = "2026-10-19", "2026-10-25"  # Montag bis Sonntag
+
+
+def test_csv():
+    buf = io.BytesIO()
+    write_calendar_csv(expand_calendar(ALL_DATA, START, END), buf, chunk_rows=2)
+    raw = buf.getvalue()
+    assert raw.startswith(b"\xef\xbb\xbf") and raw.count(b"\xef\xbb\xbf") == 1
+    lines = raw[3:].decode("utf-8").split("\r\n")
+    assert lines == [
+        ";".join(CALENDAR_COLUMNS),
+        'mk;1;"Markt ""A""; B";Krause;7;"Obst; ""x""";Montag;2026-10-19;Freitag;2026-10-16;10:00 Uhr',
+        'mk;1;"Markt ""A""; B";Krause;8;Fleisch;Donnerstag;2026-10-22;Di;2026-10-20;09:30 Uhr',
+        'mk;1;"Markt ""A""; B";Krause;8;Wurst;Donnerstag;2026-10-22;Mi;2026-10-21;',
+        "",
+    ]
+
+
+def test_ics_events():
+    events = calendar_events(ALL_DATA, START, END, alarm_minutes=30)
+    assert [(a, knr) for a, knr, _, _ in events] == [("mk", "1")]
+    body = events[0][3]
+    starts = re.findall(r"DTSTART(?:;VALUE=DATE)?:(\w+)", body)
+    # Bestellschlüsse im Zeitraum, auch für Lieferungen danach (Freitag für Montag)
+    assert starts == ["20261019", "20261020T093000", "20261022", "20261023T100000"]
+    assert body.count("BEGIN:VEVENT") == body.count("END:VEVENT") == 4
+    assert body.count("TRIGGER:-PT30M") == 2
+    assert "UID:lieferung-mk-1-20261022@sendeplan" in body
+    assert "SUMMARY:Bestellschluss: Fleisch für Do" in body
+
+    [(name, data)] = list(ics_files(events))
+    assert name == "lieferkalender_mk_1.ics"
+    text = data.decode("utf-8")
+    assert text.startswith("BEGIN:VCALENDAR\r\n") and text.endswith("END:VCALENDAR\r\n")
+    assert all(len(line.encode("utf-8")) <= 75 for line in text.split("\r\n"))
+
+
+def test_ohne_positionen():
+    assert calendar_events({"mk": {"2": ALL_DATA["mk"]["2"]}}, START, END) == []
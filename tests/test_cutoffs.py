@@ -0,0 +1,80 @@
+# tests/test_cutoffs.py
+# -----------------------------------------------------------------------------
+# Bestellschluss-Index: Fenstergrenzen (einschließlich), über Mitternacht bzw.
+# das Wochenende hinweg, Bestelltage in verschiedenen Schreibweisen.
+# -----------------------------------------------------------------------------
+
+import pytest
+
+from sendeplan_core import BestellItem, Kunde
+from sendeplan_cutoffs import CutoffIndex, build_cutoff_index, format_week_minutes, week_minutes
+
+# (Kunden-Nr, Bestelltag wie in der Tabelle, Bestellschluss)
+POSITIONEN = [
+    ("1", "Montag", "00:00 Uhr"),
+    ("2", "Di.", "09:00 Uhr"),
+    ("3", " dienstag ", "11:00 Uhr"),
+    ("4", "DIENSTAG", "11:01 Uhr"),
+    ("5", "Mitt", "23:30 Uhr"),
+    ("6", "Do", "01:59:00"),
+    ("7", "Sam", "20:00 Uhr"),
+    ("8", "So", "23:59 Uhr"),
+    ("9", "Feiertag", "10:00 Uhr"),  # kein Tag: nicht im Index
+    ("10", "Freitag", ""),  # keine Uhrzeit: nicht im Index
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    data = {"mk": {
+        knr: Kunde(knr, f"Markt {knr}", "Weg 1", "10001", "Ort", "Krause", ("",) * 6,
+                   [BestellItem("Montag", "Obst", tag, schluss, 0)])
+        for knr, tag, schluss in POSITIONEN
+    }}
+    return build_cutoff_index(data)
+
+
+def _kunden(index, indices):
+    return [index.kunden_nr[i] for i in indices]
+
+
+def test_aufbau(index):
+    assert len(index) == 8
+    assert list(index.minutes) == sorted(index.minutes)
+    assert format_week_minutes(index.minutes[0]) == "Montag 00:00"
+    assert format_week_minutes(index.minutes[-1]) == "Sonntag 23:59"
+    assert CutoffIndex.from_dict(index.to_dict()).to_dict() == index.to_dict()
+
+
+@pytest.mark.parametrize("tag", ["Dienstag", "dienstag", "DIENSTAG", " Di ", "di.", "Die", "Die."])
+def test_schreibweisen(index, tag):
+    assert week_minutes(tag, "09:00 Uhr") == 1440 + 540
+    assert _kunden(index, index.window(tag, "09:00", "11:00")) == ["2", "3"]
+
+
+def test_grenzen_einschliesslich(index):
+    assert _kunden(index, index.window("Dienstag", "09:00", "09:00")) == ["2"]
+    assert _kunden(index, index.window("Dienstag", "09:01", "10:59")) == []
+    assert _kunden(index, index.window("Dienstag", "08:59", "11:01")) == ["2", "3", "4"]
+    assert _kunden(index, index.window("Montag")) == ["1"]
+    assert _kunden(index, index.window("Sonntag", "23:59", "23:59")) == ["8"]
+
+
+def test_ueber_mitternacht(index):
+    assert _kunden(index, index.window("Mittwoch", "22:00", "02:00")) == ["5", "6"]
+    assert _kunden(index, index.window("Mittwoch", "23:31", "01:58")) == []
+    # Sonntag auf Montag: über das Wochenende
+    assert _kunden(index, index.window("So", "22:00", "00:00")) == ["8", "1"]
+
+
+def test_ueber_das_wochenende(index):
+    start, end = week_minutes("Samstag", "20:00"), week_minutes("Montag", "06:00")
+    assert _kunden(index, index.between(start, end)) == ["7", "8", "1"]
+    assert _kunden(index, index.between(start + 1, end)) == ["8", "1"]
+
+
+@pytest.mark.parametrize("tag, von, bis", [("Feiertag", "09:00", "10:00"), ("Montag", "9 Uhr", "10:00"),
+                                           ("Montag", "09:00", "24:00")])
+def test_ungueltiges_fenster(index, tag, von, bis):
+    with pytest.raises(ValueError):
+        index.window(tag, von, bis)
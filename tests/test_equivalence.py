@@ -0,0 +1,19 @@
+# tests/test_equivalence.py
+# -----------------------------------------------------------------------------
+# Alle hier verfügbaren Extraktionspfade gegen die eingefrorene Referenz auf der
+# synthetischen Arbeitsmappe (wie `sendeplan_cli.py equivalence`).
+# -----------------------------------------------------------------------------
+
+import importlib.util
+
+from sendeplan_equivalence import candidate_paths, compare_paths, synthetic_workbook
+
+
+def test_synthetische_arbeitsmappe(cache_dir):
+    paths = [p for p in candidate_paths() if p != "parquet" or importlib.util.find_spec("pyarrow")]
+    _, _, customers, results = compare_paths(synthetic_workbook(customers=60, seed=1), paths)
+    assert customers > 0
+    for r in results:
+        assert r.ok, (r.name, r.error, [str(d) for d in r.differences[:5]])
+    assert {r.name for r in results} == {"extract_area", *paths}
+    assert any(cache_dir.glob("header_*.json"))  # Spaltenpläne im Test-Ordner, nicht im Home
@@ -0,0 +1,55 @@
+# tests/test_extract.py
+# -----------------------------------------------------------------------------
+# Auf das Blatt zugeschnittener Spaltenplan (leere Spalten entfallen) und die
+# gespeicherte Spaltenstatistik.
+# -----------------------------------------------------------------------------
+
+import pytest
+
+from sendeplan_core import (SHEETS, column_stats, extract_area, header_plan, load_column_stats,
+                            plan_fields, save_column_stats, sheet_plan)
+from sendeplan_equivalence import synthetic_workbook
+from sendeplan_readers import open_source
+
+
+@pytest.fixture(scope="module")
+def frames():
+    source = open_source(synthetic_workbook(customers=40, seed=3))
+    return {k: source.parse(name) for k, name in SHEETS.items()}
+
+
+def _rows(data):
+    return {knr: kunde.to_dict() for knr, kunde in data.items()}
+
+
+@pytest.mark.parametrize("area_key", list(SHEETS))
+def test_gekuerzter_plan_gleiche_zeilen(frames, area_key, cache_dir):
+    df = frames[area_key].copy()
+    plan = header_plan(df.columns.tolist())
+    # Bestell-Spalten jeder zweiten Art leeren, damit der Plan sicher etwas verliert
+    bestell = [c for c, kind, _ in plan_fields(plan) if kind not in ("Stamm", "Tour")]
+    for c in bestell[::2]:
+        df[c] = None
+    pruned = sheet_plan(df, plan)
+    assert len(list(plan_fields(pruned))) < len(list(plan_fields(plan)))
+    assert _rows(extract_area(df, pruned)) == _rows(extract_area(df, plan))
+
+
+@pytest.mark.parametrize("detail", [False, True])
+def test_statistik_round_trip(frames, detail, cache_dir):
+    df = frames["mk"]
+    columns = df.columns.tolist()
+    assert load_column_stats(SHEETS["mk"], columns) == {}
+    stats = sheet_plan(df, header_plan(columns), detail).stats
+    save_column_stats(SHEETS["mk"], columns, stats)
+    assert list(cache_dir.glob("colstats_*.json"))
+    loaded = load_column_stats(SHEETS["mk"], columns)
+    assert loaded["sheet"] == SHEETS["mk"]
+    assert [s.to_dict() for s in loaded["columns"]] == [s.to_dict() for s in stats]
+    assert all((s.distinct is None and s.seconds is None) != detail for s in loaded["columns"])
+
+
+def test_statistik_ohne_detail_billig(frames, cache_dir):
+    df = frames["mk"]
+    stats = column_stats(df, header_plan(df.columns.tolist()))
+    assert stats and all(s.non_empty == int(df[s.column].count()) for s in stats)
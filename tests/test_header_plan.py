@@ -0,0 +1,78 @@
+# tests/test_header_plan.py
+# -----------------------------------------------------------------------------
+# Spaltenplan-Cache (header_plan): im Speicher, dann header_<Fingerprint>.json
+# unter SENDEPLAN_CACHE_DIR; auch für Datums-/Zahl-Überschriften und doppelte Spalten.
+# -----------------------------------------------------------------------------
+
+import datetime
+import json
+
+import pytest
+
+import sendeplan_core
+from sendeplan_core import STAMM_COLS, TOUR_COLS, header_fingerprint, header_plan, plan_columns
+
+COLUMNS = list(STAMM_COLS) + list(TOUR_COLS.values()) + [
+    "Mo Fleisch Sort", "Mo Fleisch Zeit", "Mo Fleisch Tag",
+    "Mo Z Wiesenhof B_Di", "Mo L Wiesenhof B_Di", "Mo Wiesenhof B_Di",
+    "Mo Z 41 Mo", "Mo L 41 Mo",
+    "DS Fisch zu Mo Zeit", "DS Fisch zu Mo Sort", "DS Fisch zu Mo Tag",
+    "Bemerkung",
+]
+
+
+def _nur_aus_datei(monkeypatch):
+    """Speicher-Cache leeren und die Erkennung sperren: header_plan muss die Datei lesen."""
+    monkeypatch.setattr(sendeplan_core, "_HEADER_PLANS", {})
+
+    def fail(columns):
+        raise AssertionError("Spaltenplan neu erkannt statt aus dem Cache gelesen")
+
+    monkeypatch.setattr(sendeplan_core, "plan_columns", fail)
+
+
+def _round_trip(columns, cache_dir, monkeypatch):
+    path = cache_dir / f"header_{header_fingerprint(columns)}.json"
+    assert not path.exists()
+    first = header_plan(columns)  # Fehlschlag: erkennen und schreiben
+    assert path.exists()
+    assert header_plan(columns) is first  # Treffer im Speicher
+    _nur_aus_datei(monkeypatch)
+    cached = header_plan(columns)  # Treffer aus der Datei
+    assert cached is not first
+    assert cached.to_dict() == first.to_dict()
+    return first, cached
+
+
+def test_round_trip(cache_dir, monkeypatch):
+    first, cached = _round_trip(COLUMNS, cache_dir, monkeypatch)
+    assert first.to_dict() == plan_columns(COLUMNS).to_dict()
+    assert set(cached.trip) == {"Montag"} and list(cached.ds_trip["Montag"]) == ["DS Fisch zu Mo"]
+    assert cached.bmap[("Montag", "Wiesenhof", "Dienstag")]["sort"] == "Mo Wiesenhof B_Di"
+    assert cached.unmatched == ["Bemerkung"]
+
+
+def test_nicht_text_ueberschriften(cache_dir, monkeypatch):
+    columns = COLUMNS + [datetime.datetime(2024, 1, 1), 2024, 1.5]
+    first, cached = _round_trip(columns, cache_dir, monkeypatch)
+    assert first.unmatched[1:] == [datetime.datetime(2024, 1, 1), 2024, 1.5]
+    assert cached.unmatched == ["Bemerkung", "2024-01-01 00:00:00", "2024", "1.5"]
+    assert cached.trip == first.trip and cached.bmap == first.bmap
+
+
+def test_doppelte_ueberschriften(cache_dir, monkeypatch):
+    # roh doppelt und so, wie pandas doppelte Überschriften umbenennt
+    columns = COLUMNS + ["Mo Fleisch Sort", "Mo Fleisch Zeit.1", "Bemerkung"]
+    assert header_fingerprint(columns) != header_fingerprint(COLUMNS)
+    first, cached = _round_trip(columns, cache_dir, monkeypatch)
+    assert first.trip == plan_columns(COLUMNS).trip
+    assert cached.unmatched == ["Bemerkung", "Mo Fleisch Zeit.1", "Bemerkung"]
+
+
+@pytest.mark.parametrize("content", ["", "{kaputt", json.dumps({"trip": {}})])
+def test_defekte_datei_neu_erkannt(cache_dir, content):
+    path = cache_dir / f"header_{header_fingerprint(COLUMNS)}.json"
+    path.write_text(content, encoding="utf-8")
+    plan = header_plan(COLUMNS)
+    assert plan.to_dict() == plan_columns(COLUMNS).to_dict()
+    assert json.loads(path.read_text(encoding="utf-8")) == json.loads(json.dumps(plan.to_dict()))
@@ -0,0 +1,32 @@
+# tests/test_manifest.py
+# -----------------------------------------------------------------------------
+# Tour-Manifeste ohne Touren bzw. ohne Positionen: feste Spalten statt Absturz.
+# -----------------------------------------------------------------------------
+
+import io
+
+from sendeplan_core import Kunde
+from sendeplan_manifest import LINE_COLUMNS, SUMMARY_COLUMNS, manifest_html, tour_manifest, write_manifest_csv
+
+
+def _kunde(tours, bestell=()):
+    return Kunde("1", "Markt 1", "Weg 1", "10001", "Ort", "Krause", tours, list(bestell))
+
+
+def test_leere_daten():
+    for data in ({}, {"mk": {}}, {"mk": {"1": _kunde(("",) * 6)}}):
+        summary, lines = tour_manifest(data)
+        assert list(summary.columns) == SUMMARY_COLUMNS and summary.empty
+        assert list(lines.columns) == LINE_COLUMNS and lines.empty
+        manifest_html(summary, lines)
+        buf = io.BytesIO()
+        write_manifest_csv(lines, buf)
+        assert buf.getvalue().decode("utf-8-sig").strip() == ";".join(LINE_COLUMNS)
+
+
+def test_touren_ohne_positionen():
+    summary, lines = tour_manifest({"mk": {"1": _kunde(("101", "", "7", "", "", ""))}})
+    assert lines["liefertag"].tolist() == ["Montag", "Mittwoch"]
+    assert lines["positionen"].tolist() == [0, 0]
+    assert summary["kunden"].tolist() == [1, 1]
+    assert summary["sortimente"].tolist() == ["", ""]
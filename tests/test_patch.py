@@ -0,0 +1,70 @@
+# tests/test_patch.py
+# -----------------------------------------------------------------------------
+# Update-Dateien: base + Patch ergibt genau den Zielstand, einschließlich der
+# Reihenfolge von Kunden und Bereichen (gleicher DATA_HASH).
+# -----------------------------------------------------------------------------
+
+import io
+
+import pytest
+
+from sendeplan_core import BestellItem, Kunde, data_hash
+from sendeplan_patch import apply_patch, load_patch, make_patch, patch_counts, write_patch
+
+
+def _kunde(knr, name=None, schluss="10:00 Uhr"):
+    return Kunde(knr, name or f"Markt {knr}", "Weg 1", "10001", "Ort", "Krause", ("101", "", "", "", "", ""),
+                 [BestellItem("Montag", "Obst", "Freitag", schluss, 0)])
+
+
+def _data(**areas):
+    return {area_key: {knr: _kunde(knr, *args) for knr, *args in rows} for area_key, rows in areas.items()}
+
+
+OLD = _data(direkt=[("1",), ("2",), ("3",)], mk=[("10",), ("11",)], nms=[("20",)])
+
+NEUE_STAENDE = {
+    "unverändert": OLD,
+    "geändert": _data(direkt=[("1",), ("2", None, "11:00 Uhr"), ("3",)], mk=[("10",), ("11",)], nms=[("20",)]),
+    "neu vorne": _data(direkt=[("0",), ("1",), ("2",), ("3",)], mk=[("10",), ("11",)], nms=[("20",)]),
+    "nur Reihenfolge": _data(direkt=[("3",), ("1",), ("2",)], mk=[("10",), ("11",)], nms=[("20",)]),
+    "geändert und umsortiert": _data(direkt=[("2", "Neu"), ("1",)], mk=[("12",), ("10",), ("11",)],
+                                     nms=[("20",)]),
+    "Bereiche": _data(mk=[("10",), ("11",)], direkt=[("1",), ("2",), ("3",)]),
+    "neuer Bereich vorne": _data(sm=[("30",)], direkt=[("1",), ("2",), ("3",)], mk=[("10",), ("11",)],
+                                 nms=[("20",)]),
+}
+
+
+def _order(all_data):
+    return [(area_key, list(data)) for area_key, data in all_data.items()]
+
+
+@pytest.mark.parametrize("name", list(NEUE_STAENDE))
+def test_patch_ergibt_ziel(name):
+    new = NEUE_STAENDE[name]
+    patch = make_patch(OLD, new)
+    result = apply_patch(OLD, patch)
+    assert result == new
+    assert _order(result) == _order(new)
+    assert data_hash(result) == data_hash(new) == patch["target"]
+    assert _order(OLD) == _order(NEUE_STAENDE["unverändert"])  # Ausgangsstand unverändert
+
+    buf = io.BytesIO()
+    write_patch(buf, patch)
+    buf.seek(0)
+    assert data_hash(apply_patch(OLD, load_patch(buf))) == patch["target"]
+
+
+def test_reihenfolge_nur_wenn_noetig():
+    patch = make_patch(OLD, NEUE_STAENDE["geändert"])
+    assert "area_order" not in patch and all("order" not in d for d in patch["areas"].values())
+    patch = make_patch(OLD, NEUE_STAENDE["nur Reihenfolge"])
+    assert patch["areas"] == {"direkt": {"set": {}, "remove": [], "order": ["3", "1", "2"]}}
+    assert patch_counts(patch) == {"direkt": (0, 0)}
+
+
+def test_falscher_ausgangsstand():
+    patch = make_patch(OLD, NEUE_STAENDE["geändert"])
+    with pytest.raises(ValueError):
+        apply_patch(NEUE_STAENDE["neu vorne"], patch)
@@ -0,0 +1,63 @@
+# tests/test_variants.py
+# -----------------------------------------------------------------------------
+# Planvarianten: ein Overlay ändert Bestelltag und -schluss der getroffenen
+# Positionen, alles andere bleibt wie im Standardplan. Tage in Regel und
+# Daten in beliebiger Schreibweise.
+# -----------------------------------------------------------------------------
+
+import pytest
+
+from sendeplan_core import BestellItem, Kunde
+from sendeplan_variants import PlanVariant, VariantRule, apply_variant, variant_data
+
+
+def _kunde(knr, bestell, tours=("101", "", "", "", "105", "")):
+    return Kunde(knr, f"Markt {knr}", "Weg 1", "10001", "Ort", "Krause", tours,
+                 [BestellItem(*b) for b in bestell])
+
+
+ALL_DATA = {
+    "mk": {
+        "1": _kunde("1", [("Montag", "Obst", "Freitag", "10:00 Uhr", 0),
+                          ("Freitag", "Obst", "Mittwoch", "10:00 Uhr", 0),
+                          ("Freitag", "Fleisch", "Mi.", "12:00 Uhr", 1)]),
+        "2": _kunde("2", [("Freitag", "Obst", " mittwoch ", "09:00 Uhr", 0)]),
+        "3": _kunde("3", [("Freitag", "Obst", "Donnerstag", "10:00 Uhr", 0)]),  # anderer Bestelltag
+        "4": _kunde("4", [("Montag", "Obst", "Mittwoch", "10:00 Uhr", 0)]),  # anderer Liefertag
+    },
+    "direkt": {"9": _kunde("9", [("Freitag", "Obst", "Mitt", "11:00 Uhr", 0)])},
+}
+
+
+@pytest.mark.parametrize("tag", ["Mittwoch", "Mi", "mi.", "MITTWOCH", "Mitt"])
+def test_bestelltag_verschieben(tag):
+    rule = VariantRule({"liefertag": "fr", "bestelltag": tag, "area": "mk"},
+                       map={"bestelltag": {tag: "di"}}, set={"bestellschluss": "08:00"})
+    assert rule.match["bestelltag"] == ["Mittwoch"] and rule.map == {"bestelltag": {"Mittwoch": "Dienstag"}}
+    delta = apply_variant(ALL_DATA, PlanVariant("Ostern", [rule]))
+    assert list(delta) == ["mk"] and list(delta["mk"]) == ["1", "2"]
+
+    k1 = delta["mk"]["1"]
+    assert k1.bestell[0] == ALL_DATA["mk"]["1"].bestell[0]  # Montag unverändert
+    assert [(b.liefertag, b.sortiment, b.bestelltag, b.bestellschluss, b.prio) for b in k1.bestell[1:]] == [
+        ("Freitag", "Obst", "Dienstag", "08:00 Uhr", 0),
+        ("Freitag", "Fleisch", "Dienstag", "08:00 Uhr", 1),
+    ]
+    assert k1.tours == ALL_DATA["mk"]["1"].tours
+    assert delta["mk"]["2"].bestell[0].bestelltag == "Dienstag"
+
+    full = variant_data(ALL_DATA, delta)
+    for area_key, knr in (("mk", "3"), ("mk", "4"), ("direkt", "9")):
+        assert full[area_key][knr] is ALL_DATA[area_key][knr]
+
+
+def test_map_ohne_treffer_laesst_schreibweise():
+    # Mi. wird nur über match gefunden, die Abbildung gilt Donnerstag: nichts ändert sich
+    rule = VariantRule({"bestelltag": "Mi"}, map={"bestelltag": {"Do": "Mi"}})
+    assert apply_variant(ALL_DATA, PlanVariant("Test", [rule])) == {}
+
+
+@pytest.mark.parametrize("match", [{"bestelltag": "Feiertag"}, {"liefertag": "Sonntag"}])
+def test_ungueltiger_tag(match):
+    with pytest.raises(ValueError):
+        VariantRule(match, cancel=True)